@@ -0,0 +1,140 @@
+"""
+ECOS Gateway Start-up Benchmark
+Measures cold-start cost of the API gateway with an import-time report
+(the same data as `python -X importtime`) and time-to-first-/health.
+
+Usage:
+    cd apps/api-gateway
+    python benchmarks/startup_bench.py            # lazy (default) start-up
+    python benchmarks/startup_bench.py --eager    # also preload heavy deps first
+    python benchmarks/startup_bench.py --top 25 --json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+GATEWAY_DIR = Path(__file__).resolve().parents[1]
+BRAINS_DIR = GATEWAY_DIR.parents[1] / "packages" / "ecosystem-brains"
+HEAVY_MODULES = ("pandas", "prophet", "torch", "ortools", "pulp")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+_HEALTH_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{preload}
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app)
+status = client.get("/health").status_code
+done = time.perf_counter()
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"import_s": imported - start, "first_health_s": done - start, "status": status, "heavy_loaded": heavy}}))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(BRAINS_DIR), env.get("PYTHONPATH")]))
+    env.setdefault("BRAIN_POOL_WORKERS", "0")
+    env.setdefault("BRAINS_PRELOAD", "false")
+    return env
+
+
+def importtime_report(target: str = "main", eager: bool = False) -> Dict[str, Any]:
+    """Run `python -X importtime -c "import <target>"` and parse its report."""
+    code = ("from lazy_imports import preload; preload(); " if eager else "") + f"import {target}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=GATEWAY_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows: List[Dict[str, Any]] = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        rows.append({
+            "module": name,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(indent) - 1) // 2,
+        })
+    top_level = [row for row in rows if row["depth"] == 0]
+    loaded = {row["module"].split(".")[0] for row in rows}
+    return {
+        "target": target,
+        "eager": eager,
+        "total_ms": round(sum(row["cumulative_ms"] for row in top_level), 1),
+        "modules_imported": len(rows),
+        "heavy_loaded": [m for m in HEAVY_MODULES if m in loaded],
+        # Direct imports of the target (and other top-level imports), slowest first
+        "top": sorted(
+            (row for row in rows if row["depth"] <= 1 and row["module"] != target),
+            key=lambda row: row["cumulative_ms"],
+            reverse=True,
+        ),
+    }
+
+
+def time_to_health(eager: bool = False) -> Dict[str, Any]:
+    """Wall-clock seconds from interpreter start to the first /health response."""
+    probe = _HEALTH_PROBE.format(
+        preload="from lazy_imports import preload; preload()" if eager else "",
+        heavy=HEAVY_MODULES,
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=GATEWAY_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--eager", action="store_true", help="also measure with heavy deps preloaded")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest top-level imports to show")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = parser.parse_args()
+
+    modes = [False, True] if args.eager else [False]
+    results = []
+    for eager in modes:
+        report = importtime_report(eager=eager)
+        report["top"] = report["top"][: args.top]
+        report["health"] = time_to_health(eager=eager)
+        results.append(report)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for report in results:
+        mode = "eager (preloaded)" if report["eager"] else "lazy"
+        health = report["health"]
+        print(f"\n=== Gateway start-up: {mode} ===")
+        print(f"import main:        {report['total_ms']:.1f} ms ({report['modules_imported']} modules)")
+        print(f"first /health:      {health['first_health_s'] * 1000:.1f} ms (status {health['status']})")
+        print(f"heavy deps loaded:  {', '.join(report['heavy_loaded']) or 'none'}")
+        print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+        for row in report["top"]:
+            print(f"{row['cumulative_ms']:>14.1f} {row['self_ms']:>9.1f}  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
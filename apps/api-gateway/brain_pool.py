@@ -0,0 +1,255 @@
+"""
+ECOS Brain Pool - Process-pool execution layer for CPU-bound brain calls
+Runs Prophet / OR-Tools / PuLP work in pre-warmed worker processes so a
+single forecast or solve never stalls the gateway event loop.
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BRAINS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../packages/ecosystem-brains'))
+
+# Imported by every worker at start-up so the first real call does not pay for them
+PREWARM_MODULES: Tuple[str, ...] = (
+    "pandas",
+    "prophet",
+    "ortools.linear_solver.pywraplp",
+    "pulp",
+    "forecasting",
+    "solvers",
+)
+
+# Number of recent samples kept for wait/run time percentiles
+_SAMPLE_WINDOW = 1024
+
+
+class BrainPoolSaturated(RuntimeError):
+    """Raised when the pool queue is full; callers should answer 503."""
+
+
+class BrainCallTimeout(TimeoutError):
+    """Raised when a brain call misses its deadline; callers should answer 504."""
+
+
+def _init_worker(brains_path: str, modules: Iterable[str]) -> None:
+    if brains_path not in sys.path:
+        sys.path.insert(0, brains_path)
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.warning("Brain worker could not pre-import %s", name, exc_info=True)
+
+
+def _invoke(module: str, func: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], submitted_at: float) -> Tuple[Any, float, float]:
+    """Worker entry point: resolve module.func by name and call it."""
+    started_at = time.time()
+    target = getattr(importlib.import_module(module), func)
+    result = target(*args, **kwargs)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "p50_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[p95_index] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+class BrainPool:
+    """
+    Bounded process pool for brain calls.
+
+    Calls are addressed by (module, function) name so arguments stay small
+    and picklable. At most ``workers + max_queue`` calls are in flight; any
+    further call is rejected with BrainPoolSaturated instead of queueing
+    without bound. With ``workers == 0`` calls run on a thread pool in the
+    gateway process instead (dev / test mode).
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 32,
+        default_deadline_s: float = 30.0,
+        prewarm_modules: Iterable[str] = PREWARM_MODULES,
+        start_method: str = "spawn",
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.default_deadline_s = default_deadline_s
+        self.prewarm_modules = tuple(prewarm_modules)
+        self.start_method = start_method
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._wait_samples: Deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._run_samples: Deque[float] = deque(maxlen=_SAMPLE_WINDOW)
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "pool_restarts": 0,
+        }
+
+    @classmethod
+    def from_env(cls) -> "BrainPool":
+        return cls(
+            workers=int(os.getenv("BRAIN_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))),
+            max_queue=int(os.getenv("BRAIN_POOL_MAX_QUEUE", "32")),
+            default_deadline_s=float(os.getenv("BRAIN_POOL_DEADLINE_SECONDS", "30")),
+            start_method=os.getenv("BRAIN_POOL_START_METHOD", "spawn"),
+        )
+
+    @property
+    def capacity(self) -> int:
+        return max(1, self.workers) + self.max_queue
+
+    def start(self) -> None:
+        """Create the executor and pre-warm every worker (non-blocking)."""
+        with self._lock:
+            if self._executor is not None:
+                return
+            if self.workers <= 0:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="brain")
+                return
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(BRAINS_PATH, self.prewarm_modules),
+            )
+            executor = self._executor
+        for _ in range(self.workers):
+            executor.submit(_ping)
+        logger.info("Brain pool started with %d workers (queue=%d)", self.workers, self.max_queue)
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def run(self, module: str, func: str, *args: Any, deadline_s: Optional[float] = None, **kwargs: Any) -> Any:
+        """
+        Execute module.func(*args, **kwargs) off the event loop.
+
+        Raises:
+            BrainPoolSaturated: queue is full
+            BrainCallTimeout: the call did not finish within its deadline
+        """
+        deadline = self.default_deadline_s if deadline_s is None else deadline_s
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._counters["rejected"] += 1
+                raise BrainPoolSaturated(f"Brain pool saturated ({self._in_flight} calls in flight)")
+            self._in_flight += 1
+            self._counters["submitted"] += 1
+
+        try:
+            executor, future = self._submit(module, func, args, kwargs)
+        except BaseException:
+            self._finish(None)
+            raise
+        future.add_done_callback(self._finish)
+
+        try:
+            result, wait_s, run_s = await asyncio.wait_for(asyncio.wrap_future(future), timeout=deadline)
+        except asyncio.TimeoutError:
+            # A queued call is dropped; a running one finishes in the background
+            # and keeps its slot until then, so backpressure stays honest.
+            future.cancel()
+            with self._lock:
+                self._counters["timed_out"] += 1
+            raise BrainCallTimeout(f"{module}.{func} exceeded deadline of {deadline:.1f}s")
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise
+
+        with self._lock:
+            self._wait_samples.append(wait_s)
+            self._run_samples.append(run_s)
+        return result
+
+    def _submit(
+        self, module: str, func: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Tuple[Executor, Future]:
+        """Submit to the current executor; returns it with the future so a crash restarts only that one."""
+        submitted_at = time.time()
+        self.start()
+        executor = self._executor
+        try:
+            return executor, executor.submit(_invoke, module, func, args, kwargs, submitted_at)
+        except BrokenProcessPool:
+            self._restart(executor)
+            executor = self._executor
+            return executor, executor.submit(_invoke, module, func, args, kwargs, submitted_at)
+
+    def _finish(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future is None or future.cancelled():
+                return
+            if future.exception() is None:
+                self._counters["completed"] += 1
+            else:
+                self._counters["failed"] += 1
+
+    def _restart(self, broken: Executor) -> None:
+        """
+        Replace `broken` if it is still the current executor. Every call failed
+        by the same crash lands here; only the first swaps the pool, so later
+        ones cannot shut down (and cancel the queue of) its replacement.
+        """
+        with self._lock:
+            replace = self._executor is broken
+            if replace:
+                self._executor = None
+                self._counters["pool_restarts"] += 1
+        if replace:
+            logger.error("Brain pool broken; restarting workers")
+            broken.shutdown(wait=False, cancel_futures=True)
+        self.start()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, in-flight calls, counters and wait/run time percentiles"""
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "mode": "process" if self.workers > 0 else "thread",
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - max(1, self.workers)),
+                "default_deadline_s": self.default_deadline_s,
+                **self._counters,
+                "wait_time": _percentiles(self._wait_samples),
+                "run_time": _percentiles(self._run_samples),
+            }
+
+
+__all__ = ["BrainPool", "BrainPoolSaturated", "BrainCallTimeout", "PREWARM_MODULES"]
@@ -0,0 +1,295 @@
+"""
+ECOS Forecast Scheduler - Background precomputation of device forecasts
+Registered devices have their forecasts recomputed on a jittered interval
+(and early, once enough new telemetry has been ingested) through the brain
+pool, so the gateway can serve the latest result from memory with its age.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+# kind -> (brain function, value column, project code)
+FORECAST_KINDS: Dict[str, Tuple[str, str, str]] = {
+    "hydro": ("forecast_stream_flow", "flow", "P13_HYDRO"),
+    "solar": ("forecast_solar_irradiance", "irradiance", "P12_SOLAR"),
+    "awg": ("forecast_humidity", "humidity", "P09_AWG"),
+}
+
+# Retry delay after a failed or rejected recompute
+_RETRY_SECONDS = 5.0
+
+RunBrain = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class PrecomputedForecast:
+    """A stored forecast; `body` is the JSON-encoded brain result, encoded once."""
+    body: bytes
+    computed_at: float
+    rows: int
+
+    def age_s(self, now: Optional[float] = None) -> float:
+        return (time.time() if now is None else now) - self.computed_at
+
+
+@dataclass
+class ScheduledDevice:
+    kind: str
+    device_id: str
+    hours_ahead: Tuple[int, ...]
+    max_rows: int
+    timestamps: Deque[float] = field(init=False)
+    values: Deque[float] = field(init=False)
+    new_rows: int = 0
+    next_due: float = 0.0
+    running: bool = False
+    last_error: Optional[str] = None
+    results: Dict[int, PrecomputedForecast] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.timestamps = deque(maxlen=self.max_rows)
+        self.values = deque(maxlen=self.max_rows)
+
+    @property
+    def value_column(self) -> str:
+        return FORECAST_KINDS[self.kind][1]
+
+
+class ForecastScheduler:
+    """
+    Periodic forecast recomputation for registered devices.
+
+    Every device is recomputed about every ``interval_s`` seconds, offset by a
+    random jitter of up to ``jitter_s`` so devices registered together do not
+    refit in lockstep. At most ``max_concurrency`` recomputes run at once,
+    leaving the rest of the brain pool to request traffic. A device that
+    receives ``recompute_rows`` new readings is recomputed right away.
+    """
+
+    def __init__(
+        self,
+        run_brain: RunBrain,
+        interval_s: float = 900.0,
+        jitter_s: float = 60.0,
+        max_concurrency: int = 2,
+        recompute_rows: int = 12,
+        min_rows: int = 24,
+        max_rows: int = 24 * 90,
+    ):
+        self.run_brain = run_brain
+        self.interval_s = interval_s
+        self.jitter_s = jitter_s
+        self.max_concurrency = max(1, max_concurrency)
+        self.recompute_rows = recompute_rows
+        self.min_rows = max(2, min_rows)
+        self.max_rows = max_rows
+        self._devices: Dict[Tuple[str, str], ScheduledDevice] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._counters = {"recomputes": 0, "early_recomputes": 0, "failures": 0}
+
+    @classmethod
+    def from_env(cls, run_brain: RunBrain) -> "ForecastScheduler":
+        return cls(
+            run_brain,
+            interval_s=float(os.getenv("ECOS_FORECAST_SCHEDULE_INTERVAL_SECONDS", "900")),
+            jitter_s=float(os.getenv("ECOS_FORECAST_SCHEDULE_JITTER_SECONDS", "60")),
+            max_concurrency=int(os.getenv("ECOS_FORECAST_SCHEDULE_CONCURRENCY", "2")),
+            recompute_rows=int(os.getenv("ECOS_FORECAST_RECOMPUTE_ROWS", "12")),
+            min_rows=int(os.getenv("ECOS_FORECAST_SCHEDULE_MIN_ROWS", "24")),
+            max_rows=int(os.getenv("ECOS_FORECAST_SCHEDULE_MAX_ROWS", str(24 * 90))),
+        )
+
+    # ---------------------------------------------------------------- lifecycle
+
+    def start(self) -> None:
+        """Start the scheduling loop on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wake = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        logger.info("Forecast scheduler started (interval=%.0fs, concurrency=%d)", self.interval_s, self.max_concurrency)
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    # ----------------------------------------------------------- registrations
+
+    def register(
+        self,
+        kind: str,
+        device_id: str,
+        hours_ahead: Iterable[int] = (24,),
+        historical_data: Optional[Dict[str, List[float]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Schedule a device (re-registering replaces its horizons, keeps its history).
+
+        Args:
+            kind: One of FORECAST_KINDS
+            device_id: Device whose ingested telemetry feeds the forecast
+            hours_ahead: Horizons to precompute
+            historical_data: Optional backfill with 'timestamp' (epoch ns) and the kind's value column
+        """
+        if kind not in FORECAST_KINDS:
+            raise ValueError(f"Unknown forecast kind {kind!r}; expected one of {sorted(FORECAST_KINDS)}")
+        horizons = tuple(sorted({int(h) for h in hours_ahead}))
+        if not horizons or horizons[0] < 1:
+            raise ValueError("hours_ahead must list at least one positive horizon")
+        key = (kind, device_id)
+        device = self._devices.get(key)
+        if device is None:
+            device = ScheduledDevice(kind, device_id, horizons, self.max_rows)
+            # Stagger first runs of devices registered together
+            device.next_due = time.monotonic() + random.uniform(0.0, self.jitter_s)
+            self._devices[key] = device
+        else:
+            device.hours_ahead = horizons
+            device.results = {h: r for h, r in device.results.items() if h in horizons}
+        if historical_data:
+            stamps = historical_data.get("timestamp", [])
+            values = historical_data.get(device.value_column)
+            if values is None or len(values) != len(stamps):
+                raise ValueError(f"historical_data needs equal-length 'timestamp' and '{device.value_column}' lists")
+            for stamp, value in sorted(zip(stamps, values)):
+                self._append(device, float(stamp), float(value))
+        self._wake_loop()
+        return self._device_status(device, time.time(), time.monotonic())
+
+    def unregister(self, kind: str, device_id: str) -> bool:
+        return self._devices.pop((kind, device_id), None) is not None
+
+    def record(self, device_id: str, measurement_type: str, value: float, timestamp_ns: float) -> int:
+        """
+        Feed one ingested reading to every scheduled forecast of the device
+        that uses this measurement; returns how many forecasts it fed.
+        """
+        fed = 0
+        for kind, (_, column, _) in FORECAST_KINDS.items():
+            device = self._devices.get((kind, device_id))
+            if device is None or column != measurement_type:
+                continue
+            self._append(device, timestamp_ns, value)
+            fed += 1
+            if device.new_rows >= self.recompute_rows and device.next_due > time.monotonic():
+                device.next_due = 0.0
+                self._counters["early_recomputes"] += 1
+                self._wake_loop()
+        return fed
+
+    def _append(self, device: ScheduledDevice, timestamp_ns: float, value: float) -> None:
+        if device.timestamps and timestamp_ns <= device.timestamps[-1]:
+            # Late or duplicate reading: the buffer stays time-ordered
+            return
+        device.timestamps.append(timestamp_ns)
+        device.values.append(value)
+        device.new_rows += 1
+
+    # ------------------------------------------------------------------ reads
+
+    def get(self, kind: str, device_id: str, hours_ahead: int) -> Optional[PrecomputedForecast]:
+        device = self._devices.get((kind, device_id))
+        return None if device is None else device.results.get(hours_ahead)
+
+    def status(self) -> Dict[str, Any]:
+        now, mono = time.time(), time.monotonic()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_s": self.interval_s,
+            "jitter_s": self.jitter_s,
+            "max_concurrency": self.max_concurrency,
+            "recompute_rows": self.recompute_rows,
+            **self._counters,
+            "devices": [self._device_status(d, now, mono) for d in self._devices.values()],
+        }
+
+    def _device_status(self, device: ScheduledDevice, now: float, mono: float) -> Dict[str, Any]:
+        return {
+            "kind": device.kind,
+            "device_id": device.device_id,
+            "hours_ahead": list(device.hours_ahead),
+            "rows": len(device.values),
+            "new_rows": device.new_rows,
+            "next_run_in_s": round(max(0.0, device.next_due - mono), 3),
+            "running": device.running,
+            "last_error": device.last_error,
+            "age_s": {str(h): round(r.age_s(now), 3) for h, r in device.results.items()},
+        }
+
+    # --------------------------------------------------------------- schedule
+
+    def _wake_loop(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _loop(self) -> None:
+        while True:
+            self._wake.clear()
+            now = time.monotonic()
+            next_due = now + self.interval_s
+            for device in list(self._devices.values()):
+                if device.running:
+                    continue
+                if len(device.values) < self.min_rows:
+                    continue
+                if device.next_due <= now:
+                    device.running = True
+                    asyncio.get_running_loop().create_task(self._recompute(device))
+                else:
+                    next_due = min(next_due, device.next_due)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, next_due - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _recompute(self, device: ScheduledDevice) -> None:
+        func, column, _ = FORECAST_KINDS[device.kind]
+        try:
+            async with self._semaphore:
+                # Snapshot the history; readings ingested during the fit count towards the next run
+                history = {"timestamp": list(device.timestamps), column: list(device.values)}
+                rows, device.new_rows = len(device.values), 0
+                for hours in device.hours_ahead:
+                    result = await self.run_brain(
+                        "forecasting",
+                        func,
+                        history,
+                        hours,
+                        series_id=device.device_id,
+                        warm_start=True,
+                    )
+                    body = json.dumps(jsonable_encoder(result), separators=(",", ":")).encode()
+                    device.results[hours] = PrecomputedForecast(body=body, computed_at=time.time(), rows=rows)
+            device.last_error = None
+            device.next_due = time.monotonic() + self.interval_s + random.uniform(-self.jitter_s, self.jitter_s)
+            self._counters["recomputes"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Keep serving the previous result; retry soon
+            device.last_error = f"{type(exc).__name__}: {exc}"
+            device.next_due = time.monotonic() + _RETRY_SECONDS
+            self._counters["failures"] += 1
+            logger.warning("Scheduled %s forecast for %s failed: %s", device.kind, device.device_id, device.last_error)
+        finally:
+            device.running = False
+            self._wake_loop()
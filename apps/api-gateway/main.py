@@ -4,10 +4,12 @@ Exposes all 13 project brains as REST APIs
 Completes Level 1 requirement: API Exposed
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, EmailStr, Field
-from typing import Dict, List, Any, Literal, Iterable
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, EmailStr, Field, ValidationError
+from typing import Dict, List, Any, Literal, Iterable, Optional, Type, TypeVar, Union
 from datetime import datetime, timedelta, timezone
+import asyncio
 import hashlib
 import hmac
 import json
@@ -24,20 +26,23 @@ from pathlib import Path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../packages/ecosystem-brains'))
 
 from forecasting import (
-    forecast_stream_flow,
-    forecast_solar_irradiance,
-    forecast_humidity,
+    ARROW_STREAM_CONTENT_TYPE,
+    BINARY_CONTENT_TYPES,
+    COLUMNAR_CONTENT_TYPE,
+    decode_history,
     predict_bulb_failure,
+    predict_bulb_failure_batch,
 )
-from solvers import (
-    optimize_nutrient_cycle,
-    optimize_awg_schedule,
-    optimize_geothermal_flow,
-    optimize_fungal_match,
-)
+from solvers import optimize_fungal_match
+from solvers.fungal import FEATURES as FUNGAL_FEATURES
+from caching import LRUTTLCache
 from dispatcher import dispatch
 from checklist import execute_all_initiatives
+from lazy_imports import preload_in_background
+from model_registry import ModelNotFound, default_registry
 from mqtt_service import EcosMqttService
+from brain_pool import BrainPool, BrainPoolSaturated, BrainCallTimeout
+from forecast_scheduler import FORECAST_KINDS, ForecastScheduler
 
 app = FastAPI(
     title="ECOS API Gateway",
@@ -78,6 +83,35 @@ def _validate_manifest(raw: Dict[str, Any]) -> Dict[str, Any]:
 HARDWARE_MANIFEST = _validate_manifest(_load_hardware_manifest())
 _mqtt_lock = threading.Lock()
 
+# CPU-bound forecasts and solves run in a bounded worker pool, off the event loop
+brain_pool = BrainPool.from_env()
+# Last AWG plan per device, kept here because a device's replans land on any brain worker
+awg_plans = LRUTTLCache(
+    max_entries=int(os.environ.get("ECOS_AWG_PLAN_ENTRIES", "10000")),
+    ttl_seconds=float(os.environ.get("ECOS_AWG_PLAN_TTL_SECONDS", "604800")),
+)
+
+# Registered device forecasts are recomputed in the background and served from memory
+forecast_scheduler = ForecastScheduler.from_env(brain_pool.run)
+FORECAST_SCHEDULER_ENABLED = os.getenv("ECOS_FORECAST_SCHEDULER", "true").lower() == "true"
+
+
+@app.on_event("startup")
+async def start_brain_pool():
+    brain_pool.start()
+    if brain_pool.workers <= 0 and os.getenv("BRAINS_PRELOAD", "true").lower() == "true":
+        # Thread mode runs brains in this process: warm pandas/prophet/torch
+        # after start-up instead of blocking /health on them.
+        preload_in_background()
+    if FORECAST_SCHEDULER_ENABLED:
+        forecast_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def stop_brain_pool():
+    await forecast_scheduler.stop()
+    brain_pool.shutdown()
+
 
 # ============================================
 # REQUEST/RESPONSE MODELS
@@ -89,19 +123,102 @@ class HealthResponse(BaseModel):
     version: str
 
 
+ForecastMethod = Literal["prophet", "online", "lstm"]
+FallbackModel = Literal["seasonal_naive", "exp_smoothing"]
+
+# Per-request latency budget for forecasts; a cheap fallback model answers if the fit runs over
+DEADLINE_HEADER = "X-Forecast-Deadline-Ms"
+
+
+class ModelRefRequest(BaseModel):
+    """A stored model in the brains model registry; version=None selects the latest."""
+    project: str = Field(min_length=1)
+    device: str = Field(min_length=1)
+    model_type: ForecastMethod
+    version: Optional[int] = Field(default=None, ge=1)
+
+
+class ResampleRequest(BaseModel):
+    """Pre-fit resampling of long or irregular histories (see forecasting.resample_history)."""
+    bucket: Optional[str] = Field(default=None, examples=["15min", "1h"])
+    agg: Literal["mean", "max", "last"] = "mean"
+    fill: Literal["linear", "ffill", "none"] = "linear"
+    max_points: Optional[int] = Field(default=None, ge=3)
+
+
 class StreamFlowRequest(BaseModel):
     historical_data: Dict[str, List[float]]
     hours_ahead: int = 24
+    include_trajectory: bool = False
+    method: ForecastMethod = "prophet"
+    fallback: FallbackModel = "seasonal_naive"
+    warm_start: bool = False
+    series_id: Optional[str] = None
+    model: Optional[ModelRefRequest] = None
+    resample: Optional[ResampleRequest] = None
 
 
 class SolarIrradianceRequest(BaseModel):
     historical_data: Dict[str, List[float]]
     hours_ahead: int = 24
+    include_trajectory: bool = False
+    method: ForecastMethod = "prophet"
+    fallback: FallbackModel = "seasonal_naive"
+    warm_start: bool = False
+    series_id: Optional[str] = None
+    model: Optional[ModelRefRequest] = None
+    resample: Optional[ResampleRequest] = None
 
 
 class HumidityRequest(BaseModel):
     historical_data: Dict[str, List[float]]
     hours_ahead: int = 6
+    include_trajectory: bool = False
+    method: ForecastMethod = "prophet"
+    fallback: FallbackModel = "seasonal_naive"
+    warm_start: bool = False
+    series_id: Optional[str] = None
+    model: Optional[ModelRefRequest] = None
+    resample: Optional[ResampleRequest] = None
+    threshold: float = 70.0
+    min_window_hours: int = Field(default=1, ge=1)
+    # With target_liters, also return a schedule restricted to the forecast's run windows
+    energy_prices: Optional[List[float]] = None
+    target_liters: Optional[float] = None
+
+
+class ForecastBatchRequest(BaseModel):
+    series: Dict[str, Dict[str, List[float]]] = Field(min_length=1)
+    hours_ahead: int = 24
+    include_trajectory: bool = False
+    method: ForecastMethod = "prophet"
+    fallback: FallbackModel = "seasonal_naive"
+    warm_start: bool = False
+    resample: Optional[ResampleRequest] = None
+
+
+class HumidityBatchRequest(ForecastBatchRequest):
+    hours_ahead: int = 6
+    threshold: float = 70.0
+    min_window_hours: int = Field(default=1, ge=1)
+
+
+class ModelRegisterRequest(BaseModel):
+    project: str = Field(min_length=1)
+    device: str = Field(min_length=1)
+    value_column: Literal["flow", "irradiance", "humidity"]
+    historical_data: Dict[str, List[float]]
+    method: ForecastMethod = "prophet"
+    warm_start: bool = False
+    resample: Optional[ResampleRequest] = None
+
+
+class ForecastScheduleRequest(BaseModel):
+    """Precompute forecasts for a device from its ingested telemetry (optionally backfilled)."""
+    kind: Literal["hydro", "solar", "awg"]
+    device_id: str = Field(min_length=1)
+    hours_ahead: List[int] = Field(default_factory=lambda: [24], min_length=1)
+    historical_data: Optional[Dict[str, List[float]]] = None
 
 
 class BulbTelemetryRequest(BaseModel):
@@ -110,27 +227,161 @@ class BulbTelemetryRequest(BaseModel):
     uptime: float
 
 
-class NutrientCycleRequest(BaseModel):
+class BulbFleetRequest(BaseModel):
+    """Columnar telemetry: element i of every list describes bulb i."""
+    voltage: List[float] = Field(min_length=1)
+    thermal_cycles: List[float] = Field(min_length=1)
+    uptime: List[float] = Field(min_length=1)
+    bulb_ids: Optional[List[str]] = None
+    top_k: Optional[int] = Field(default=None, ge=1)
+    include_all: bool = True
+
+
+class SolverRequest(BaseModel):
+    # Identical inputs reuse the worker's memoized result; false forces a fresh solve
+    use_cache: bool = True
+    # Solve wall-clock limit (default ECOS_SOLVER_TIME_LIMIT_S); when it runs out the best
+    # solution found is returned with status "feasible", or status "time_limit" if none
+    time_limit_s: Optional[float] = Field(default=None, gt=0, le=120)
+
+
+class NutrientCycleRequest(SolverRequest):
     waste_inputs: Dict[str, float]
     crop_demands: Dict[str, float]
 
 
-class AWGScheduleRequest(BaseModel):
+class NutrientCycleBatchRequest(SolverRequest):
+    """
+    Nutrient arrays for many plots. Without transport_costs, waste_inputs has one
+    value per plot (each plot uses its own waste); with it, one value per shared
+    source, and transport_costs[source][plot] is the cost per kg (null = no route).
+    """
+    waste_inputs: Dict[str, List[float]]
+    crop_demands: Dict[str, List[float]]
+    plot_ids: Optional[List[str]] = None
+    transport_costs: Optional[List[List[Optional[float]]]] = None
+
+
+class NutrientSource(BaseModel):
+    """A compost / digestate pile: tonnes on hand and nutrient content per tonne."""
+    id: str = Field(min_length=1)
+    supply_t: float = Field(ge=0)
+    composition: Dict[str, float]
+    cost_per_t: float = Field(default=0.0, ge=0)
+    lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    lon: Optional[float] = Field(default=None, ge=-180, le=180)
+
+
+class NutrientField(BaseModel):
+    id: str = Field(min_length=1)
+    demand: Dict[str, float]
+    max_application_t: Optional[float] = Field(default=None, ge=0)
+    lat: Optional[float] = Field(default=None, ge=-90, le=90)
+    lon: Optional[float] = Field(default=None, ge=-180, le=180)
+
+
+class NutrientTransportRequest(SolverRequest):
+    """Sites need lat/lon unless distance_km[source][field] is given (null = no route)."""
+    sources: List[NutrientSource] = Field(min_length=1)
+    fields: List[NutrientField] = Field(min_length=1)
+    nutrients: List[str] = Field(default_factory=lambda: ["N", "P", "K"], min_length=1)
+    distance_km: Optional[List[List[Optional[float]]]] = None
+    haul_cost_per_t_km: float = Field(default=0.15, ge=0)
+    max_haul_km: Optional[float] = Field(default=None, gt=0)
+    nearest_sources: Optional[int] = Field(default=10, ge=1)
+    route_capacity_t: Optional[float] = Field(default=None, gt=0)
+    gap_tolerance: float = Field(default=1e-3, ge=0)
+    max_pricing_rounds: Optional[int] = Field(default=None, ge=1)
+
+
+class AWGRunWindow(BaseModel):
+    """A run window from /api/awg/forecast; indices are hours into the forecast, end exclusive."""
+    start_index: int = Field(ge=0)
+    end_index: int = Field(ge=0)
+
+
+class AWGScheduleRequest(SolverRequest):
     humidity_forecast: List[float]
     energy_prices: List[float]
     target_liters: float
-
-
-class GeothermalFlowRequest(BaseModel):
-    building_loads: Dict[str, float]
+    run_windows: Optional[List[AWGRunWindow]] = None
+    # "exact" solves in-process; "pulp" runs the CBC MILP (same result shape)
+    solver: Literal["exact", "pulp"] = "exact"
+    # Rolling-horizon replans: the device's previous plan seeds the solve and hours
+    # before current_hour (absolute hour indices, like start_hour) stay as executed
+    device_id: Optional[str] = Field(default=None, min_length=1)
+    start_hour: Optional[int] = None
+    current_hour: Optional[int] = None
+    # Relative optimality gap at which the search stops (default ECOS_SOLVER_GAP_LIMIT; 0 = exact)
+    gap_limit: Optional[float] = Field(default=None, ge=0, lt=1)
+
+
+class AWGUnitRequest(BaseModel):
+    unit_id: str = Field(min_length=1)
+    humidity_forecast: List[float] = Field(min_length=1)
+    target_liters: float = Field(ge=0)
+    power_kw: float = Field(default=2.0, gt=0)
+    # [humidity %, liters/hour] points; default is 0.1 L/h per % humidity
+    efficiency_curve: Optional[List[List[float]]] = None
+
+
+class AWGFleetScheduleRequest(SolverRequest):
+    """AWG units sharing one grid connection (and optional solar array); hourly lists share one horizon."""
+    units: List[AWGUnitRequest] = Field(min_length=1)
+    energy_prices: List[float] = Field(min_length=1)
+    power_cap_kw: Union[float, List[float]]
+    solar_kw: Optional[Union[float, List[float]]] = None
+    gap_limit: Optional[float] = Field(default=None, ge=0, lt=1)
+
+
+class GeothermalBorehole(BaseModel):
+    id: str = Field(min_length=1)
+    capacity_kw: float = Field(ge=0)
+    cost_per_kw: float = Field(default=0.0, ge=0)
+    nominal_temp: float = 10.0
+
+
+class GeothermalPipe(BaseModel):
+    from_node: str = Field(alias="from", min_length=1)
+    to: str = Field(min_length=1)
+    capacity_kw: float = Field(ge=0)
+    # Fraction of the heat entering the pipe that is lost before the far end
+    loss: float = Field(default=0.0, ge=0, lt=1)
+    bidirectional: bool = False
+
+
+class GeothermalBuilding(BaseModel):
+    id: str = Field(min_length=1)
+    demand_kw: float = Field(ge=0)
+    priority: int = Field(default=1, ge=1)
+
+
+class GeothermalNetwork(BaseModel):
+    """Borehole -> pipe -> building graph; pipe endpoints that are neither are junctions."""
+    boreholes: List[GeothermalBorehole] = Field(min_length=1)
+    pipes: List[GeothermalPipe] = Field(default_factory=list)
+    buildings: List[GeothermalBuilding] = Field(min_length=1)
+
+
+class GeothermalFlowRequest(SolverRequest):
+    """Flat mode (building_loads + available_capacity) or network mode (network)."""
+    building_loads: Dict[str, float] = Field(default_factory=dict)
     ground_temp: float
-    available_capacity: float
+    available_capacity: Optional[float] = None
+    network: Optional[GeothermalNetwork] = None
 
 
 class FungalMatchRequest(BaseModel):
     soil_data: Dict[str, float]
 
 
+class FungalMatchBatchRequest(BaseModel):
+    """Columnar soil survey: {pH, moisture, N, P, K, temp} arrays with one value per sample (null = not measured)."""
+    soil: Dict[str, List[Optional[float]]] = Field(min_length=1)
+    sample_ids: Optional[List[str]] = None
+    top_k: int = Field(default=3, ge=1)
+
+
 class DispatchRequest(BaseModel):
     action: str
     params: Dict[str, Any] = Field(default_factory=dict)
@@ -217,6 +468,136 @@ def _get_mqtt_service() -> EcosMqttService:
     return _mqtt_service
 
 
+async def _run_brain(module: str, func: str, *args: Any, **kwargs: Any) -> Any:
+    """Run a brain function in the worker pool, mapping pool errors to HTTP status codes."""
+    try:
+        return await brain_pool.run(module, func, *args, **kwargs)
+    except BrainPoolSaturated as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+    except BrainCallTimeout as exc:
+        raise HTTPException(status_code=504, detail=str(exc))
+    except ModelNotFound as exc:
+        raise HTTPException(status_code=404, detail=exc.args[0])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _solver_deadline(request: SolverRequest) -> float:
+    """Pool deadline for a solve that stops itself at its time limit; leaves room for model building."""
+    if request.time_limit_s is None:
+        return brain_pool.default_deadline_s
+    return max(brain_pool.default_deadline_s, request.time_limit_s + 15.0)
+
+
+ForecastRequestT = TypeVar("ForecastRequestT", bound=BaseModel)
+
+
+async def _parse_forecast_request(http_request: Request, model: Type[ForecastRequestT]) -> ForecastRequestT:
+    """
+    Parse a forecast request from JSON, or from a binary columnar body
+    (ECOS columnar / Arrow IPC) whose other fields come from the query string.
+    Binary columns stay NumPy views over the body; no per-value validation.
+    """
+    content_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    binary = content_type in BINARY_CONTENT_TYPES
+    body = await http_request.body()
+    try:
+        if binary:
+            options: Dict[str, Any] = dict(http_request.query_params)
+            for field in ("model", "resample"):
+                if field in options:
+                    options[field] = json.loads(options[field])
+            parsed = model.model_validate({**options, "historical_data": {}})
+            parsed.historical_data = decode_history(body, content_type)
+            return parsed
+        return model.model_validate_json(body)
+    except ValidationError as exc:
+        source = "query" if binary else "body"
+        raise RequestValidationError(
+            [{**error, "loc": (source, *error["loc"])} for error in exc.errors(include_url=False)]
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+def _inline_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema of a model with its $defs references inlined (for openapi_extra)."""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return resolve(defs[ref.rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
+
+
+def _forecast_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Request-body docs for forecast endpoints that accept JSON or binary columns."""
+    binary = {"schema": {"type": "string", "format": "binary"}}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": _inline_schema(model)},
+                COLUMNAR_CONTENT_TYPE: binary,
+                ARROW_STREAM_CONTENT_TYPE: binary,
+            },
+        }
+    }
+
+
+async def _run_brain_batch(func: str, request: ForecastBatchRequest, **options: Any) -> Dict[str, Any]:
+    """
+    Fan a multi-series forecast out across the worker pool in one chunk per worker.
+    A chunk that fails at the pool level (503/504) marks only its own series as errors.
+    """
+    items = list(request.series.items())
+    n_chunks = max(1, min(brain_pool.workers, len(items)))
+    chunks = [dict(items[i::n_chunks]) for i in range(n_chunks)]
+    outcomes = await asyncio.gather(
+        *(
+            _run_brain(
+                "forecasting",
+                func,
+                chunk,
+                request.hours_ahead,
+                max_workers=1,
+                include_trajectory=request.include_trajectory,
+                method=request.method,
+                resample=request.resample.model_dump() if request.resample else None,
+                fallback=request.fallback,
+                warm_start=request.warm_start,
+                **options,
+            )
+            for chunk in chunks
+        ),
+        return_exceptions=True,
+    )
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for chunk, outcome in zip(chunks, outcomes):
+        if isinstance(outcome, HTTPException):
+            errors.update({series_id: outcome.detail for series_id in chunk})
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results.update(outcome["results"])
+            errors.update(outcome["errors"])
+    return {
+        "results": {sid: results[sid] for sid, _ in items if sid in results},
+        "errors": {sid: errors[sid] for sid, _ in items if sid in errors},
+        "series_count": len(items),
+        "failed_count": len(errors),
+    }
+
+
 def _validate_tier(tier: str, allowed: Iterable[str]) -> str:
     tier_key = tier.lower()
     allowed_values = list(allowed)
@@ -357,50 +738,166 @@ async def hardware_control(project_code: str, command: ControlCommandRequest):
 # ============================================
 
 # Project #13: Micro-Hydro
-@app.post("/api/hydro/forecast")
-async def hydro_forecast(request: StreamFlowRequest):
+@app.post("/api/hydro/forecast", openapi_extra=_forecast_openapi(StreamFlowRequest))
+async def hydro_forecast(
+    http_request: Request,
+    deadline_ms: Optional[float] = Header(default=None, alias=DEADLINE_HEADER, gt=0),
+):
     """Forecast stream flow for Micro-Hydro power generation"""
-    try:
-        result = forecast_stream_flow(request.historical_data, request.hours_ahead)
-        return {"project": "P13_HYDRO", "result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    request = await _parse_forecast_request(http_request, StreamFlowRequest)
+    result = await _run_brain(
+        "forecasting",
+        "forecast_stream_flow",
+        request.historical_data,
+        request.hours_ahead,
+        include_trajectory=request.include_trajectory,
+        method=request.method,
+        series_id=request.series_id,
+        model=request.model.model_dump() if request.model else None,
+        resample=request.resample.model_dump() if request.resample else None,
+        deadline_ms=deadline_ms,
+        fallback=request.fallback,
+        warm_start=request.warm_start,
+    )
+    return {"project": "P13_HYDRO", "result": result}
+
+
+@app.post("/api/hydro/forecast/batch")
+async def hydro_forecast_batch(
+    request: ForecastBatchRequest,
+    deadline_ms: Optional[float] = Header(default=None, alias=DEADLINE_HEADER, gt=0),
+):
+    """Forecast stream flow for many turbines in one call"""
+    result = await _run_brain_batch("forecast_stream_flow_batch", request, deadline_ms=deadline_ms)
+    return {"project": "P13_HYDRO", "result": result}
 
 
 # Project #12: Solar Gardens
-@app.post("/api/solar/forecast")
-async def solar_forecast(request: SolarIrradianceRequest):
+@app.post("/api/solar/forecast", openapi_extra=_forecast_openapi(SolarIrradianceRequest))
+async def solar_forecast(
+    http_request: Request,
+    deadline_ms: Optional[float] = Header(default=None, alias=DEADLINE_HEADER, gt=0),
+):
     """Forecast solar irradiance for photovoltaic generation"""
-    try:
-        result = forecast_solar_irradiance(request.historical_data, request.hours_ahead)
-        return {"project": "P12_SOLAR", "result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    request = await _parse_forecast_request(http_request, SolarIrradianceRequest)
+    result = await _run_brain(
+        "forecasting",
+        "forecast_solar_irradiance",
+        request.historical_data,
+        request.hours_ahead,
+        include_trajectory=request.include_trajectory,
+        method=request.method,
+        series_id=request.series_id,
+        model=request.model.model_dump() if request.model else None,
+        resample=request.resample.model_dump() if request.resample else None,
+        deadline_ms=deadline_ms,
+        fallback=request.fallback,
+        warm_start=request.warm_start,
+    )
+    return {"project": "P12_SOLAR", "result": result}
+
+
+@app.post("/api/solar/forecast/batch")
+async def solar_forecast_batch(
+    request: ForecastBatchRequest,
+    deadline_ms: Optional[float] = Header(default=None, alias=DEADLINE_HEADER, gt=0),
+):
+    """Forecast solar irradiance for many arrays in one call"""
+    result = await _run_brain_batch("forecast_solar_irradiance_batch", request, deadline_ms=deadline_ms)
+    return {"project": "P12_SOLAR", "result": result}
 
 
 # Project #9: AWG (Atmospheric Water Generator)
-@app.post("/api/awg/forecast")
-async def awg_forecast(request: HumidityRequest):
+@app.post("/api/awg/forecast", openapi_extra=_forecast_openapi(HumidityRequest))
+async def awg_forecast(
+    http_request: Request,
+    deadline_ms: Optional[float] = Header(default=None, alias=DEADLINE_HEADER, gt=0),
+):
     """Forecast optimal humidity windows for water generation"""
-    try:
-        result = forecast_humidity(request.historical_data, request.hours_ahead)
-        return {"project": "P09_AWG", "result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    request = await _parse_forecast_request(http_request, HumidityRequest)
+    result = await _run_brain(
+        "forecasting",
+        "forecast_humidity",
+        request.historical_data,
+        request.hours_ahead,
+        include_trajectory=request.include_trajectory,
+        method=request.method,
+        series_id=request.series_id,
+        model=request.model.model_dump() if request.model else None,
+        resample=request.resample.model_dump() if request.resample else None,
+        deadline_ms=deadline_ms,
+        fallback=request.fallback,
+        warm_start=request.warm_start,
+        threshold=request.threshold,
+        min_window_hours=request.min_window_hours,
+        energy_prices=request.energy_prices,
+        target_liters=request.target_liters,
+    )
+    return {"project": "P09_AWG", "result": result}
+
+
+@app.post("/api/awg/forecast/batch")
+async def awg_forecast_batch(
+    request: HumidityBatchRequest,
+    deadline_ms: Optional[float] = Header(default=None, alias=DEADLINE_HEADER, gt=0),
+):
+    """Forecast humidity windows for many AWG units in one call"""
+    result = await _run_brain_batch(
+        "forecast_humidity_batch",
+        request,
+        threshold=request.threshold,
+        min_window_hours=request.min_window_hours,
+        deadline_ms=deadline_ms,
+    )
+    return {"project": "P09_AWG", "result": result}
 
 
 @app.post("/api/awg/optimize")
 async def awg_optimize(request: AWGScheduleRequest):
     """Optimize AWG run schedule to minimize energy costs"""
-    try:
-        result = optimize_awg_schedule(
-            request.humidity_forecast,
-            request.energy_prices,
-            request.target_liters
-        )
-        return {"project": "P09_AWG", "result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if request.device_id is not None and request.start_hour is None:
+        raise HTTPException(status_code=422, detail="start_hour is required with device_id")
+    result = await _run_brain(
+        "solvers",
+        "optimize_awg_schedule",
+        request.humidity_forecast,
+        request.energy_prices,
+        request.target_liters,
+        run_windows=[w.model_dump() for w in request.run_windows] if request.run_windows is not None else None,
+        solver=request.solver,
+        device_id=request.device_id,
+        start_hour=request.start_hour,
+        current_hour=request.current_hour,
+        time_limit_s=request.time_limit_s,
+        gap_limit=request.gap_limit,
+        previous_plan=awg_plans.get(request.device_id) if request.device_id is not None else None,
+        use_cache=request.use_cache,
+        deadline_s=_solver_deadline(request),
+    )
+    if request.device_id is not None:
+        if result.get("status") == "error":
+            raise HTTPException(status_code=409, detail=result["message"])
+        if "schedule" in result:
+            awg_plans.put(request.device_id, {"start_hour": request.start_hour, "schedule": result["schedule"]})
+    return {"project": "P09_AWG", "result": result}
+
+
+@app.post("/api/awg/fleet/optimize")
+async def awg_fleet_optimize(request: AWGFleetScheduleRequest):
+    """Co-optimize many AWG units under a shared power cap and per-unit water targets"""
+    result = await _run_brain(
+        "solvers",
+        "optimize_awg_fleet_schedule",
+        [unit.model_dump() for unit in request.units],
+        request.energy_prices,
+        request.power_cap_kw,
+        solar_kw=request.solar_kw,
+        time_limit_s=request.time_limit_s,
+        gap_limit=request.gap_limit,
+        use_cache=request.use_cache,
+        deadline_s=_solver_deadline(request),
+    )
+    return {"project": "P09_AWG", "result": result}
 
 
 # Project #8: Centennial Bulb
@@ -419,30 +916,139 @@ async def bulb_predict(request: BulbTelemetryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/bulb/predict/batch")
+async def bulb_predict_batch(request: BulbFleetRequest):
+    """Score a whole bulb fleet in one vectorized pass, optionally returning the top-k most at risk"""
+    if request.bulb_ids is not None and len(request.bulb_ids) != len(request.voltage):
+        raise HTTPException(status_code=422, detail="bulb_ids must have one entry per bulb")
+    try:
+        scores = predict_bulb_failure_batch(
+            request.voltage, request.thermal_cycles, request.uptime, top_k=request.top_k
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    result: Dict[str, Any] = {"bulb_count": len(request.voltage)}
+    if request.include_all:
+        result.update({
+            "failure_probability": scores["failure_probability"].tolist(),
+            "expected_remaining_hours": scores["expected_remaining_hours"].tolist(),
+            "expected_remaining_years": scores["expected_remaining_years"].tolist(),
+            "stress_score": scores["stress_score"].tolist(),
+        })
+    if "most_at_risk" in scores:
+        result["most_at_risk"] = [
+            {
+                "index": int(i),
+                "bulb_id": request.bulb_ids[i] if request.bulb_ids is not None else None,
+                "failure_probability": float(scores["failure_probability"][i]),
+                "expected_remaining_hours": float(scores["expected_remaining_hours"][i]),
+                "stress_score": float(scores["stress_score"][i]),
+            }
+            for i in scores["most_at_risk"]
+        ]
+    return {"project": "P08_BULB", "result": result}
+
+
 # Project #3: Closed-Loop Farm
 @app.post("/api/farm/optimize")
 async def farm_optimize(request: NutrientCycleRequest):
     """Optimize nutrient cycle allocation"""
-    try:
-        result = optimize_nutrient_cycle(request.waste_inputs, request.crop_demands)
-        return {"project": "P03_FARM", "result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    result = await _run_brain(
+        "solvers",
+        "optimize_nutrient_cycle",
+        request.waste_inputs,
+        request.crop_demands,
+        time_limit_s=request.time_limit_s,
+        use_cache=request.use_cache,
+        deadline_s=_solver_deadline(request),
+    )
+    return {"project": "P03_FARM", "result": result}
+
+
+@app.post("/api/farm/optimize/batch")
+async def farm_optimize_batch(request: NutrientCycleBatchRequest):
+    """Optimize nutrient allocation for many plots in one call"""
+    missing = sorted(set(request.crop_demands) - set(request.waste_inputs))
+    if missing:
+        raise HTTPException(status_code=422, detail=f"waste_inputs missing nutrients: {missing}")
+    n_plots = {len(values) for values in request.crop_demands.values()}
+    n_sources = {len(request.waste_inputs[n]) for n in request.crop_demands}
+    if len(n_plots) > 1 or len(n_sources) > 1:
+        raise HTTPException(status_code=422, detail="Every nutrient needs the same number of plots and sources")
+    if request.transport_costs is None and n_plots != n_sources:
+        raise HTTPException(status_code=422, detail="waste_inputs needs one value per plot without transport_costs")
+    if request.transport_costs is not None and (
+        {len(request.transport_costs)} != n_sources or any({len(row)} != n_plots for row in request.transport_costs)
+    ):
+        raise HTTPException(status_code=422, detail="transport_costs must be (sources x plots)")
+    result = await _run_brain(
+        "solvers",
+        "optimize_nutrient_cycle_batch",
+        request.waste_inputs,
+        request.crop_demands,
+        plot_ids=request.plot_ids,
+        transport_costs=request.transport_costs,
+        time_limit_s=request.time_limit_s,
+        use_cache=request.use_cache,
+        deadline_s=_solver_deadline(request),
+    )
+    return {"project": "P03_FARM", "result": result}
+
+
+@app.post("/api/farm/transport")
+async def farm_transport(request: NutrientTransportRequest):
+    """Plan compost / digestate hauling from several sources to many fields"""
+    sites = [*request.sources, *request.fields]
+    if request.distance_km is None and any(site.lat is None or site.lon is None for site in sites):
+        raise HTTPException(status_code=422, detail="Give every site lat/lon, or provide distance_km")
+    if request.distance_km is not None and (
+        len(request.distance_km) != len(request.sources)
+        or any(len(row) != len(request.fields) for row in request.distance_km)
+    ):
+        raise HTTPException(status_code=422, detail="distance_km must be (sources x fields)")
+    result = await _run_brain(
+        "solvers",
+        "optimize_nutrient_transport",
+        [source.model_dump(exclude_none=True) for source in request.sources],
+        [field.model_dump(exclude_none=True) for field in request.fields],
+        nutrients=request.nutrients,
+        distance_km=request.distance_km,
+        haul_cost_per_t_km=request.haul_cost_per_t_km,
+        max_haul_km=request.max_haul_km,
+        nearest_sources=request.nearest_sources,
+        route_capacity_t=request.route_capacity_t,
+        gap_tolerance=request.gap_tolerance,
+        max_pricing_rounds=request.max_pricing_rounds,
+        time_limit_s=request.time_limit_s,
+        use_cache=request.use_cache,
+        deadline_s=_solver_deadline(request),
+    )
+    return {"project": "P03_FARM", "result": result}
 
 
 # Project #10: Geothermal Network
 @app.post("/api/geothermal/optimize")
 async def geothermal_optimize(request: GeothermalFlowRequest):
     """Optimize geothermal heat flow distribution"""
-    try:
-        result = optimize_geothermal_flow(
-            request.building_loads,
-            request.ground_temp,
-            request.available_capacity
-        )
-        return {"project": "P10_GEOTHERMAL", "result": result}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    if request.network is None and not request.building_loads:
+        raise HTTPException(status_code=422, detail="Provide building_loads or a network")
+    if request.network is None and (request.available_capacity is None or request.available_capacity <= 0):
+        raise HTTPException(status_code=422, detail="available_capacity must be positive without a network")
+    result = await _run_brain(
+        "solvers",
+        "optimize_geothermal_flow",
+        request.building_loads,
+        request.ground_temp,
+        request.available_capacity if request.available_capacity is not None else 0.0,
+        network=request.network.model_dump(by_alias=True) if request.network else None,
+        time_limit_s=request.time_limit_s,
+        use_cache=request.use_cache,
+        deadline_s=_solver_deadline(request),
+    )
+    return {"project": "P10_GEOTHERMAL", "result": result}
 
 
 # Project #2: Symbiosis (Fungal Matching)
@@ -456,6 +1062,122 @@ async def symbiosis_recommend(request: FungalMatchRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/symbiosis/recommend/batch")
+async def symbiosis_recommend_batch(request: FungalMatchBatchRequest):
+    """Score every strain profile against a grid of soil samples in one vectorized pass, top-k per sample"""
+    lengths = {len(values) for feature, values in request.soil.items() if feature in FUNGAL_FEATURES}
+    if not lengths:
+        raise HTTPException(status_code=422, detail=f"soil needs at least one of the columns {list(FUNGAL_FEATURES)}")
+    if len(lengths) > 1:
+        raise HTTPException(status_code=422, detail="Every soil column needs one value per sample")
+    if request.sample_ids is not None and len(request.sample_ids) != lengths.pop():
+        raise HTTPException(status_code=422, detail="sample_ids must have one entry per sample")
+    soil = {
+        feature: [float("nan") if value is None else value for value in values]
+        for feature, values in request.soil.items()
+    }
+    result = await _run_brain(
+        "solvers",
+        "optimize_fungal_match_batch",
+        soil,
+        top_k=request.top_k,
+        sample_ids=request.sample_ids,
+    )
+    result["sample_count"] = len(result["sample_ids"])
+    return {"project": "P02_SYMBIOSIS", "result": result}
+
+
+# Shared solver brains
+@app.get("/api/solvers/cache/stats")
+async def solver_cache_stats():
+    """Memoized solver result counters (overall and per solver) of one brain worker"""
+    return await _run_brain("solvers", "get_solver_cache_stats")
+
+
+@app.get("/api/solvers/timing/stats")
+async def solver_timing_stats():
+    """Solve-time histograms per solver function and solver instance reuse of one brain worker"""
+    return await _run_brain("solvers", "get_solver_timing_stats")
+
+
+# Shared forecasting brains
+@app.get("/api/forecast/cache/stats")
+async def forecast_cache_stats():
+    """Fitted-model cache counters (hits, misses, evictions) of one brain worker"""
+    return await _run_brain("forecasting", "get_forecast_cache_stats")
+
+
+@app.post("/api/forecast/schedule")
+async def schedule_forecast(request: ForecastScheduleRequest):
+    """Register a device for background forecast precomputation"""
+    try:
+        device = forecast_scheduler.register(
+            request.kind, request.device_id, request.hours_ahead, request.historical_data
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"scheduled": device}
+
+
+@app.delete("/api/forecast/schedule/{kind}/{device_id}")
+async def unschedule_forecast(kind: str, device_id: str):
+    """Stop precomputing forecasts for a device"""
+    if not forecast_scheduler.unregister(kind, device_id):
+        raise HTTPException(status_code=404, detail=f"No scheduled {kind} forecast for {device_id}")
+    return {"unscheduled": True}
+
+
+@app.get("/api/forecast/schedule")
+async def forecast_schedule_status():
+    """Scheduled devices, their pending telemetry and result ages"""
+    return forecast_scheduler.status()
+
+
+@app.get("/api/forecast/precomputed/{kind}/{device_id}")
+async def precomputed_forecast(kind: str, device_id: str, hours_ahead: int = Query(default=24, ge=1)):
+    """Latest background forecast for a device, with its age in seconds"""
+    forecast = forecast_scheduler.get(kind, device_id, hours_ahead)
+    if forecast is None:
+        raise HTTPException(status_code=404, detail=f"No precomputed {hours_ahead}h {kind} forecast for {device_id}")
+    # The result was JSON-encoded when it was computed; only the envelope is built here
+    project = json.dumps(FORECAST_KINDS[kind][2])
+    head = f'{{"project":{project},"age_s":{forecast.age_s():.3f},"rows":{forecast.rows},"result":'
+    return Response(content=head.encode() + forecast.body + b"}", media_type="application/json")
+
+
+@app.post("/api/models/register")
+async def register_model(request: ModelRegisterRequest):
+    """Fit a forecaster and store it as a new version in the model registry"""
+    result = await _run_brain(
+        "forecasting",
+        "register_forecaster",
+        request.project,
+        request.device,
+        request.historical_data,
+        request.value_column,
+        method=request.method,
+        resample=request.resample.model_dump() if request.resample else None,
+        warm_start=request.warm_start,
+    )
+    return {"result": result}
+
+
+@app.get("/api/models")
+async def list_models(project: Optional[str] = None):
+    """Latest stored version of every registered model"""
+    try:
+        refs = default_registry().list_models(project)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"models": [ref.to_dict() for ref in refs]}
+
+
+@app.get("/api/brains/pool/metrics")
+async def brain_pool_metrics():
+    """Worker pool queue depth, wait/run times and rejection counters"""
+    return brain_pool.metrics()
+
+
 # ============================================
 # DISPATCHER ENDPOINTS (Cross-Project Coordination)
 # ============================================
@@ -494,9 +1216,18 @@ async def ingest_telemetry(request: TelemetryIngestRequest):
     if request.timestamp < now_utc - timedelta(days=30):
         raise HTTPException(status_code=400, detail="Timestamp too old for ingestion window")
     topic = f"ecos/{request.project_code}/{request.device_id}/telemetry"
+    scheduled = 0
+    if request.quality_flag != "invalid":
+        scheduled = forecast_scheduler.record(
+            request.device_id,
+            request.measurement_type,
+            request.measurement_value,
+            request.timestamp.timestamp() * 1e9,
+        )
     return {
         "topic": topic,
         "ingested": True,
+        "scheduled_forecasts": scheduled,
         "quality_flag": request.quality_flag,
         "echo": {
             "sensor_id": request.sensor_id,
@@ -0,0 +1,99 @@
+"""
+ECOS AWG Solver Benchmark
+Compares optimize_awg_schedule's in-process exact solver (covering-knapsack
+branch-and-bound) with the PuLP/CBC MILP path across horizons, reporting
+median solve times and the cost difference between the two schedules.
+
+Usage:
+    cd packages/ecosystem-brains
+    python benchmarks/awg_solver_bench.py
+    python benchmarks/awg_solver_bench.py --hours 24 168 720 2160 8760 --target-fraction 0.4 --repeats 5 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from solvers import optimize_awg_schedule  # noqa: E402
+
+
+def synthetic_inputs(hours: int, seed: int = 0) -> Dict[str, List[float]]:
+    """Daily humidity and time-of-use price cycles with noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(hours)
+    humidity = np.clip(70.0 + 15.0 * np.sin(2 * np.pi * t / 24) + rng.normal(0.0, 5.0, hours), 20.0, 100.0)
+    prices = 0.12 + 0.05 * np.sin(2 * np.pi * (t - 6) / 24) + rng.uniform(0.0, 0.02, hours)
+    return {"humidity_forecast": humidity.tolist(), "energy_prices": prices.tolist()}
+
+
+@contextmanager
+def _quiet_stdout():
+    """CBC writes its log straight to file descriptor 1."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            yield
+        finally:
+            os.dup2(saved, 1)
+            os.close(saved)
+
+
+def _timed_solve(inputs: Dict[str, List[float]], target: float, solver: str) -> Dict[str, Any]:
+    with _quiet_stdout():
+        start = time.perf_counter()
+        result = optimize_awg_schedule(
+            inputs["humidity_forecast"], inputs["energy_prices"], target, solver=solver, use_cache=False
+        )
+        seconds = time.perf_counter() - start
+    return {"seconds": seconds, "result": result}
+
+
+def bench_horizon(hours: int, target_fraction: float, repeats: int) -> Dict[str, Any]:
+    """Median solve time per solver for one horizon."""
+    inputs = synthetic_inputs(hours)
+    target = target_fraction * 0.1 * sum(inputs["humidity_forecast"])
+    row: Dict[str, Any] = {"hours": hours, "target_liters": target}
+    for solver in ("exact", "pulp"):
+        runs = [_timed_solve(inputs, target, solver) for _ in range(repeats)]
+        row[f"{solver}_s"] = statistics.median(run["seconds"] for run in runs)
+        row[f"{solver}_cost"] = runs[-1]["result"].get("total_cost_usd")
+    row["speedup"] = row["pulp_s"] / row["exact_s"] if row["exact_s"] > 0 else None
+    return row
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=int, nargs="+", default=[24, 168, 720, 2160, 8760], help="horizons in hours")
+    parser.add_argument("--target-fraction", type=float, default=0.4, help="target as a fraction of max production")
+    parser.add_argument("--repeats", type=int, default=3, help="timed solves per solver (median reported)")
+    parser.add_argument("--json", action="store_true", help="print raw JSON")
+    args = parser.parse_args()
+
+    rows = [bench_horizon(hours, args.target_fraction, args.repeats) for hours in args.hours]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    print(f"{'hours':>6}  {'exact':>9}  {'pulp/cbc':>9}  {'speedup':>8}  {'cost exact':>11}  {'cost pulp':>11}")
+    for row in rows:
+        print(
+            f"{row['hours']:>6}  {row['exact_s'] * 1000:>7.2f}ms  {row['pulp_s'] * 1000:>7.1f}ms  "
+            f"{row['speedup']:>7.1f}x  {row['exact_cost']:>11.4f}  {row['pulp_cost']:>11.4f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+ECOS Nutrient Transport Benchmark
+Times optimize_nutrient_transport (sources x fields x N/P/K hauling LP) across
+district sizes in three modes: every route modelled up front, each field's k
+nearest sources only, and the nearest-source model grown by reduced-cost
+pricing until the plan is certified within the gap tolerance. Reports
+routes modelled, LP solves, wall time, plan cost against the all-routes
+optimum, and the certified gap. Solves run under --time-limit (generous by
+default, so the all-routes model is timed to completion).
+
+Usage:
+    cd packages/ecosystem-brains
+    python benchmarks/nutrient_transport_bench.py
+    python benchmarks/nutrient_transport_bench.py --sizes 10x100 50x500 200x2000 --nearest 20 --no-dense --json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from solvers import optimize_nutrient_transport  # noqa: E402
+
+
+def synthetic_district(n_sources: int, n_fields: int, seed: int = 0) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Compost / digestate sources and fields scattered over a ~50 km square, ~30% surplus supply."""
+    rng = np.random.default_rng(seed)
+    mean_supply_t = 1.3 * 25.0 * n_fields / n_sources
+    sources = [
+        {
+            "id": f"src{i}",
+            "supply_t": float(rng.uniform(0.5, 1.5) * mean_supply_t),
+            "cost_per_t": float(rng.uniform(0.0, 5.0)),
+            "composition": {"N": float(rng.uniform(5, 25)), "P": float(rng.uniform(2, 10)), "K": float(rng.uniform(4, 15))},
+            "lat": 40.0 + float(rng.uniform(0.0, 0.45)),
+            "lon": -80.0 + float(rng.uniform(0.0, 0.6)),
+        }
+        for i in range(n_sources)
+    ]
+    fields = [
+        {
+            "id": f"field{j}",
+            "demand": {"N": float(rng.uniform(150, 350)), "P": float(rng.uniform(50, 130)), "K": float(rng.uniform(80, 220))},
+            "max_application_t": 100.0,
+            "lat": 40.0 + float(rng.uniform(0.0, 0.45)),
+            "lon": -80.0 + float(rng.uniform(0.0, 0.6)),
+        }
+        for j in range(n_fields)
+    ]
+    return sources, fields
+
+
+def _timed(sources: List[Dict[str, Any]], fields: List[Dict[str, Any]], repeats: int, **options: Any) -> Dict[str, Any]:
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = optimize_nutrient_transport(sources, fields, use_cache=False, **options)
+        runs.append((time.perf_counter() - start, result))
+    result = runs[-1][1]
+    return {
+        "routes": result["routes_modelled"],
+        "rounds": result["pricing_rounds"],
+        "seconds": statistics.median(seconds for seconds, _ in runs),
+        "cost": result["haul_cost_usd"] + result["material_cost_usd"],
+        "certified_gap": result["optimality_gap"],
+        "unmet_kg": sum(sum(nutrients.values()) for nutrients in result["unmet"].values()),
+    }
+
+
+def bench_size(
+    n_sources: int, n_fields: int, nearest: int, repeats: int, dense: bool, time_limit_s: float
+) -> List[Dict[str, Any]]:
+    """All routes, nearest-source routes only, and nearest-source routes grown by pricing."""
+    sources, fields = synthetic_district(n_sources, n_fields)
+    modes = [("nearest", {"nearest_sources": nearest, "max_pricing_rounds": 1}), ("priced", {"nearest_sources": nearest})]
+    if dense:
+        modes.insert(0, ("all", {"nearest_sources": None}))
+    for _, options in modes:
+        options["time_limit_s"] = time_limit_s
+    rows = []
+    for mode, options in modes:
+        row = {"sources": n_sources, "fields": n_fields, "mode": mode}
+        row.update(_timed(sources, fields, repeats, **options))
+        rows.append(row)
+    if dense:
+        for row in rows:
+            row["cost_vs_all"] = row["cost"] / rows[0]["cost"] - 1.0
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--sizes", nargs="+", default=["10x100", "50x500", "100x1000", "200x2000"], help="SOURCESxFIELDS instances"
+    )
+    parser.add_argument("--nearest", type=int, default=10, help="routes per field in the first LP")
+    parser.add_argument("--no-dense", action="store_true", help="skip the all-routes model (slow at 200x2000)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed solves per configuration (median reported)")
+    parser.add_argument("--time-limit", type=float, default=600.0, help="per-solve time limit in seconds")
+    parser.add_argument("--json", action="store_true", help="print raw JSON")
+    args = parser.parse_args()
+
+    rows = []
+    for size in args.sizes:
+        n_sources, n_fields = (int(part) for part in size.lower().split("x"))
+        rows.extend(bench_size(n_sources, n_fields, args.nearest, args.repeats, not args.no_dense, args.time_limit))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    print(
+        f"{'size':>10}  {'mode':>7}  {'routes':>8}  {'rounds':>6}  {'time':>8}  {'cost':>11}  "
+        f"{'vs all':>8}  {'cert gap':>8}  {'unmet kg':>9}"
+    )
+    for row in rows:
+        vs_all = f"{row['cost_vs_all'] * 100:>7.3f}%" if "cost_vs_all" in row else f"{'-':>8}"
+        print(
+            f"{row['sources']:>4}x{row['fields']:<5}  {row['mode']:>7}  {row['routes']:>8}  {row['rounds']:>6}  "
+            f"{row['seconds']:>7.2f}s  {row['cost']:>11.2f}  {vs_all}  {row['certified_gap'] * 100:>7.3f}%  "
+            f"{row['unmet_kg']:>9.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
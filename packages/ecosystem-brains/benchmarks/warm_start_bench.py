@@ -0,0 +1,109 @@
+"""
+ECOS Prophet Warm-Start Benchmark
+Measures Prophet refit time when a series' history grows by a few hours:
+a cold fit versus a fit warm-started from the previous fit's parameters,
+across history lengths, plus how far the two forecasts drift apart.
+
+Usage:
+    cd packages/ecosystem-brains
+    python benchmarks/warm_start_bench.py
+    python benchmarks/warm_start_bench.py --days 7 30 90 365 --new-hours 6 --repeats 5 --json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from forecasting import ProphetForecaster  # noqa: E402
+
+
+def synthetic_history(hours: int, seed: int = 0) -> pd.DataFrame:
+    """Hourly series with trend, daily and weekly seasonality and noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(hours)
+    y = (
+        50.0
+        + 0.01 * t
+        + 10.0 * np.sin(2 * np.pi * t / 24)
+        + 4.0 * np.sin(2 * np.pi * t / (24 * 7))
+        + rng.normal(0.0, 1.5, hours)
+    )
+    ds = pd.Timestamp("2024-01-01") + pd.Timedelta(hours=1) * t
+    return pd.DataFrame({"ds": ds, "y": y})
+
+
+def _timed_fit(df: pd.DataFrame, previous: ProphetForecaster = None) -> Dict[str, Any]:
+    start = time.perf_counter()
+    forecaster = previous.refit(df) if previous is not None else ProphetForecaster()
+    if previous is None:
+        forecaster.fit(df)
+    return {"seconds": time.perf_counter() - start, "forecaster": forecaster}
+
+
+def bench_length(days: int, new_hours: int, repeats: int) -> Dict[str, Any]:
+    """Cold vs warm refit after `new_hours` new rows on a `days`-long history."""
+    full = synthetic_history(days * 24 + new_hours)
+    base, grown = full.iloc[:-new_hours], full
+    previous = ProphetForecaster()
+    previous.fit(base)
+
+    cold_times: List[float] = []
+    warm_times: List[float] = []
+    for _ in range(repeats):
+        cold = _timed_fit(grown)
+        warm = _timed_fit(grown, previous)
+        cold_times.append(cold["seconds"])
+        warm_times.append(warm["seconds"])
+
+    cold_yhat = cold["forecaster"].predict_horizon(24, include_uncertainty=False).yhat
+    warm_yhat = warm["forecaster"].predict_horizon(24, include_uncertainty=False).yhat
+    cold_s, warm_s = statistics.median(cold_times), statistics.median(warm_times)
+    return {
+        "history_hours": len(grown),
+        "cold_fit_s": cold_s,
+        "warm_fit_s": warm_s,
+        "speedup": cold_s / warm_s if warm_s > 0 else None,
+        "max_abs_yhat_diff": float(np.max(np.abs(cold_yhat - warm_yhat))),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[7, 30, 90, 365], help="history lengths in days")
+    parser.add_argument("--new-hours", type=int, default=6, help="rows appended before the refit")
+    parser.add_argument("--repeats", type=int, default=3, help="timed fits per mode (median reported)")
+    parser.add_argument("--json", action="store_true", help="print raw JSON")
+    args = parser.parse_args()
+
+    # cmdstanpy logs every fit at INFO
+    from cmdstanpy import disable_logging
+
+    disable_logging()
+    logging.getLogger("prophet").setLevel(logging.WARNING)
+
+    rows = [bench_length(days, args.new_hours, args.repeats) for days in args.days]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    print(f"{'history':>9}  {'cold fit':>9}  {'warm fit':>9}  {'speedup':>7}  {'max |Δyhat|':>11}")
+    for row in rows:
+        print(
+            f"{row['history_hours']:>8}h  {row['cold_fit_s']:>8.3f}s  {row['warm_fit_s']:>8.3f}s  "
+            f"{row['speedup']:>6.2f}x  {row['max_abs_yhat_diff']:>11.4f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
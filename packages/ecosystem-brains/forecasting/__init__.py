@@ -1,37 +1,59 @@
 """
 Forecasting Module - Shared time-series prediction for ECOS projects
-Supports: Prophet, LSTM, and general time-series forecasting
+Supports: Prophet, LSTM, online Holt-Winters, and general time-series forecasting
+
+pandas, prophet and torch are imported on first use so that importing this
+module stays cheap for services that never forecast.
 """
 
-from typing import Dict, List, Optional, Union
+from __future__ import annotations
+
+import copy
+import os
+from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
-import pandas as pd
-from prophet import Prophet
-import torch
-import torch.nn as nn
 
+from lazy_imports import lazy_import
+from .cache import (
+    series_fingerprint,
+    forecast_model_cache,
+    online_state_cache,
+    warm_start_cache,
+    get_forecast_cache_stats,
+    clear_forecast_cache,
+)
+from .batch import forecast_batch
+from .horizon import HorizonForecast
+from .columnar import (
+    COLUMNAR_CONTENT_TYPE,
+    ARROW_STREAM_CONTENT_TYPE,
+    BINARY_CONTENT_TYPES,
+    encode_columns,
+    decode_history,
+)
+from .online import HoltWintersState, OnlineForecaster
+from .resample import ResampleSpec, lttb, prepare_history, resample_history
+from .windows import extract_run_windows, extract_run_windows_batch
+from .fallback import FALLBACK_MODELS, fallback_forecast, forecast_with_deadline
+from .backtest import BACKTEST_BACKENDS, backtest, summarize_backtest, write_backtest
+from model_registry import ModelNotFound, ModelRef, default_registry
 
-class LSTMForecaster(nn.Module):
-    """
-    LSTM model template for time-series forecasting.
-    Used by: Solar (#12), Hydro (#13), AWG (#9)
-    """
-    
-    def __init__(self, input_size: int = 1, hidden_size: int = 50, num_layers: int = 2, output_size: int = 1):
-        super(LSTMForecaster, self).__init__()
-        self.hidden_size = hidden_size
-        self.num_layers = num_layers
-        
-        self.lstm = nn.LSTM(input_size, hidden_size, num_layers, batch_first=True)
-        self.fc = nn.Linear(hidden_size, output_size)
-    
-    def forward(self, x):
-        h0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size).to(x.device)
-        c0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size).to(x.device)
-        
-        out, _ = self.lstm(x, (h0, c0))
-        out = self.fc(out[:, -1, :])
-        return out
+pd = lazy_import('pandas')
+
+# Backends selectable through the forecast_* helpers' `method=` argument
+FORECAST_METHODS = ('prophet', 'online', 'lstm')
+
+
+def __getattr__(name: str) -> Any:
+    # The LSTM backend lives in .lstm so torch is only imported when it is requested
+    if name in ('LSTMForecaster', 'LSTMPipeline'):
+        from . import lstm
+        return getattr(lstm, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Stan parameters carried from one Prophet fit to the next with warm starts
+_WARM_START_PARAMS = ('k', 'm', 'delta', 'beta', 'sigma_obs')
 
 
 class ProphetForecaster:
@@ -41,15 +63,20 @@ class ProphetForecaster:
     """
     
     def __init__(self, seasonality_mode: str = 'multiplicative'):
+        from prophet import Prophet
+
         self.model = Prophet(seasonality_mode=seasonality_mode)
         self.fitted = False
+        self._origin = None
     
-    def fit(self, df: pd.DataFrame):
+    def fit(self, df: pd.DataFrame, init: Optional[Dict[str, Any]] = None):
         """
         Fit Prophet model on historical data.
         
         Args:
             df: DataFrame with 'ds' (timestamp) and 'y' (value) columns
+            init: Previous fit's warm_start_params() to start the Stan
+                optimizer from instead of Prophet's default initialization
         """
         # Basic validation to provide clearer error messages than raw Prophet exceptions
         if not isinstance(df, pd.DataFrame):
@@ -69,13 +96,43 @@ class ProphetForecaster:
                 f"received {len(df)}."
             )
 
+        kwargs = {}
+        if init is not None:
+            # Prophet keeps its default for any parameter whose shape no longer matches
+            kwargs['init'] = {
+                name: np.asarray(init[name], dtype=np.float64) if name in ('delta', 'beta') else float(init[name])
+                for name in _WARM_START_PARAMS
+            }
         try:
-            self.model.fit(df)
+            self.model.fit(df, **kwargs)
         except Exception as exc:
             raise ValueError(f"Failed to fit Prophet model: {exc}") from exc
         
         self.fitted = True
     
+    def warm_start_params(self) -> Dict[str, Any]:
+        """
+        Fitted Stan parameters (k, m, delta, beta, sigma_obs) in the form
+        fit(init=...) accepts.
+        """
+        if not self.fitted:
+            raise ValueError("Model must be fitted before its parameters can be read")
+        params = self.model.params
+        return {
+            name: np.array(params[name][0], dtype=np.float64) if name in ('delta', 'beta')
+            else float(params[name][0][0])
+            for name in _WARM_START_PARAMS
+        }
+    
+    def refit(self, df: pd.DataFrame) -> 'ProphetForecaster':
+        """
+        Fit a new forecaster on df (typically this history plus new rows),
+        warm-started from this fit's parameters.
+        """
+        forecaster = ProphetForecaster(seasonality_mode=self.model.seasonality_mode)
+        forecaster.fit(df, init=self.warm_start_params())
+        return forecaster
+    
     def predict(self, periods: int = 24) -> pd.DataFrame:
         """
         Generate forecast for future periods.
@@ -93,85 +150,592 @@ class ProphetForecaster:
         forecast = self.model.predict(future)
         return forecast
 
+    def predict_horizon(
+        self,
+        periods: int = 24,
+        include_uncertainty: bool = True,
+        step: Optional[pd.Timedelta] = None,
+    ) -> HorizonForecast:
+        """
+        Forecast only the future rows after the last training timestamp.
+        
+        Unlike predict(), cost does not grow with history length, and
+        uncertainty sampling (the dominant predict cost) can be skipped.
+        
+        Args:
+            periods: Number of future steps to forecast
+            include_uncertainty: Compute yhat_lower/yhat_upper intervals
+            step: Spacing between future timestamps (default: 1 hour)
+            
+        Returns:
+            HorizonForecast with one entry per future step
+        """
+        if not self.fitted:
+            raise ValueError("Model must be fitted before prediction")
+        if periods < 1:
+            raise ValueError(f"periods must be at least 1; received {periods}.")
+        
+        step = pd.Timedelta(hours=1) if step is None else step
+        last = self._origin if self._origin is not None else self.model.history['ds'].iloc[-1]
+        future = pd.DataFrame({'ds': last + step * np.arange(1, periods + 1)})
+        
+        if include_uncertainty:
+            forecast = self.model.predict(future)
+            return HorizonForecast(
+                ds=forecast['ds'].to_numpy(),
+                yhat=forecast['yhat'].to_numpy(dtype=np.float64),
+                yhat_lower=forecast['yhat_lower'].to_numpy(dtype=np.float64),
+                yhat_upper=forecast['yhat_upper'].to_numpy(dtype=np.float64),
+            )
+        
+        # Point forecast only: trend + seasonal terms, without the sampling pass
+        df = self.model.setup_dataframe(future)
+        trend = self.model.predict_trend(df)
+        seasonal = self.model.predict_seasonal_components(df)
+        yhat = trend * (1 + seasonal['multiplicative_terms']) + seasonal['additive_terms']
+        return HorizonForecast(
+            ds=future['ds'].to_numpy(),
+            yhat=np.asarray(yhat, dtype=np.float64),
+        )
 
-def forecast_stream_flow(historical_data: Dict[str, List[float]], hours_ahead: int = 24) -> Dict[str, float]:
+    def with_history(self, df: pd.DataFrame) -> 'ProphetForecaster':
+        """
+        Shallow copy that forecasts from the end of `df` with the fitted
+        parameters; the new rows shift the forecast origin but are not fitted.
+        """
+        bound = copy.copy(self)
+        bound._origin = pd.Timestamp(df['ds'].iloc[-1])
+        return bound
+
+
+def _history_frame(historical_data: Dict[str, Any], value_column: str) -> pd.DataFrame:
+    """
+    Build the Prophet ds/y frame from a column dict.
+    
+    Columns may be lists (JSON bodies) or NumPy arrays (binary columnar
+    bodies); arrays are wrapped without copying. Only the timestamp and
+    value columns are read.
+    """
+    ds = historical_data['timestamp']
+    if isinstance(ds, np.ndarray) and ds.dtype.kind == 'i':
+        # Integer timestamps are epoch nanoseconds, as pd.to_datetime reads them
+        ds = ds.view('datetime64[ns]')
+    y = np.asarray(historical_data[value_column], dtype=np.float64)
+    return pd.DataFrame({'ds': pd.to_datetime(ds), 'y': y}, copy=False)
+
+
+def _fit_forecaster(
+    df: pd.DataFrame,
+    seasonality_mode: str = 'multiplicative',
+    use_cache: bool = True,
+    method: str = 'prophet',
+    state_key: Optional[str] = None,
+    model: Optional[Union[ModelRef, Dict[str, Any]]] = None,
+    warm_start: bool = False,
+) -> Union[ProphetForecaster, OnlineForecaster, 'LSTMPipeline']:
+    """
+    Fit a forecaster for the requested backend.
+
+    Prophet fits are reused from the fitted-model cache for an identical series.
+    Online forecasters with a state_key resume the stored per-series state and
+    only fold in rows newer than the last observation seen. LSTM forecasts use
+    the ECOS_LSTM_CHECKPOINT model when set, otherwise a model trained on df.
+    A stored `model` ref is loaded from the model registry and never refitted.
+    Prophet fits with a state_key keep their parameters, and warm_start
+    initializes the next fit of that series from them.
+
+    Args:
+        df: DataFrame with 'ds' and 'y' columns
+        seasonality_mode: Prophet seasonality mode
+        use_cache: Look up / store the fitted model (or online state)
+        method: 'prophet', 'online' or 'lstm'
+        state_key: Per-series key for online state / Prophet warm-start parameters
+        model: Registry ref of a stored model to forecast with (overrides method)
+        warm_start: Start a Prophet fit from the series' previous parameters
+    """
+    if model is not None:
+        ref = ModelRef(**model) if isinstance(model, dict) else model
+        return default_registry().load(ref).with_history(df)
+    if method == 'online':
+        return _resume_online(df, state_key if use_cache else None)
+    if method == 'lstm':
+        return _lstm_pipeline([df], use_cache).with_history(df)
+    if method != 'prophet':
+        raise ValueError(f"Unknown forecast method {method!r}; expected one of {list(FORECAST_METHODS)}.")
+
+    key = series_fingerprint(df['ds'], df['y'], seasonality_mode) if use_cache else None
+    if key is not None:
+        forecaster = forecast_model_cache.get(key)
+        if forecaster is not None:
+            return forecaster
+
+    init = warm_start_cache.get(state_key) if warm_start and state_key is not None else None
+    forecaster = ProphetForecaster(seasonality_mode=seasonality_mode)
+    forecaster.fit(df, init=init)
+    if key is not None:
+        forecast_model_cache.put(key, forecaster)
+    if state_key is not None:
+        warm_start_cache.put(state_key, forecaster.warm_start_params())
+    return forecaster
+
+
+def _resume_online(df: pd.DataFrame, state_key: Optional[str]) -> OnlineForecaster:
+    """Update stored online state with new rows, or fit it from scratch"""
+    state = online_state_cache.get(state_key) if state_key is not None else None
+    if state is None:
+        forecaster = OnlineForecaster()
+        forecaster.fit(df)
+    else:
+        forecaster = OnlineForecaster.from_state(state)
+        stamps = pd.to_datetime(df['ds']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        order = np.argsort(stamps, kind='stable')
+        forecaster.update_many(df['y'].to_numpy(dtype=np.float64)[order], stamps[order])
+    if state_key is not None:
+        online_state_cache.put(state_key, forecaster.state)
+    return forecaster
+
+
+def _lstm_pipeline(frames: List[pd.DataFrame], use_cache: bool = True) -> 'LSTMPipeline':
+    """
+    Compiled LSTM pipeline for scoring `frames`.
+
+    Loads ECOS_LSTM_CHECKPOINT once per process when it is set; otherwise
+    trains one shared model on the frames (cached by their fingerprints).
+    """
+    from .lstm import LSTMPipeline, load_compiled
+
+    quantize = os.environ.get('ECOS_LSTM_QUANTIZE', 'false').lower() in ('1', 'true', 'yes')
+    checkpoint = os.environ.get('ECOS_LSTM_CHECKPOINT')
+    if checkpoint:
+        return load_compiled(checkpoint, quantize=quantize)
+
+    key = ('lstm', *(series_fingerprint(f['ds'], f['y'], 'lstm') for f in frames)) if use_cache else None
+    if key is not None:
+        pipeline = forecast_model_cache.get(key)
+        if pipeline is not None:
+            return pipeline
+
+    threads = os.environ.get('ECOS_LSTM_THREADS')
+    pipeline = LSTMPipeline(num_threads=int(threads) if threads else None)
+    pipeline.fit_many([f['y'].to_numpy(dtype=np.float64) for f in frames])
+    pipeline.compile(quantize=quantize)
+    if key is not None:
+        forecast_model_cache.put(key, pipeline)
+    return pipeline
+
+
+def _forecast_horizon(
+    df: pd.DataFrame,
+    hours_ahead: int,
+    include_uncertainty: bool = True,
+    deadline_ms: Optional[float] = None,
+    fallback: str = 'seasonal_naive',
+    **fit_options: Any,
+) -> Tuple[HorizonForecast, str]:
+    """
+    Fit (per _fit_forecaster) and forecast, within deadline_ms if given.
+
+    Returns:
+        The forecast and the name of the model that produced it
+    """
+    model = fit_options.get('model')
+    if model is not None:
+        name = model['model_type'] if isinstance(model, dict) else model.model_type
+    else:
+        name = fit_options.get('method', 'prophet')
+
+    def primary() -> HorizonForecast:
+        forecaster = _fit_forecaster(df, **fit_options)
+        return forecaster.predict_horizon(periods=hours_ahead, include_uncertainty=include_uncertainty)
+
+    if deadline_ms is None:
+        return primary(), name
+    if fallback not in FALLBACK_MODELS:
+        raise ValueError(f"Unknown fallback model {fallback!r}; expected one of {list(FALLBACK_MODELS)}.")
+    forecast, on_time = forecast_with_deadline(
+        primary,
+        lambda: fallback_forecast(df, hours_ahead, include_uncertainty, fallback),
+        deadline_ms,
+    )
+    return forecast, name if on_time else fallback
+
+
+def forecast_stream_flow(
+    historical_data: Dict[str, List[float]],
+    hours_ahead: int = 24,
+    use_cache: bool = True,
+    include_trajectory: bool = False,
+    method: str = 'prophet',
+    series_id: Optional[str] = None,
+    model: Optional[Union[ModelRef, Dict[str, Any]]] = None,
+    resample: Optional[ResampleSpec] = None,
+    deadline_ms: Optional[float] = None,
+    fallback: str = 'seasonal_naive',
+    warm_start: bool = False,
+) -> Dict[str, Any]:
     """
     Forecast stream flow for Micro-Hydro (#13)
     
     Args:
         historical_data: Dict with 'timestamp', 'flow', 'precipitation', 'temperature'
         hours_ahead: Forecast horizon
+        use_cache: Reuse a cached fit when the same history is posted again
+        include_trajectory: Also return the full hourly horizon trajectory
+        method: 'prophet' (batch fit), 'online' (incremental Holt-Winters) or 'lstm'
+        series_id: Device/series id; with method='online' its state is kept
+            between calls and only new rows are folded in
+        model: Registry ref of a stored model; forecasts from the end of
+            historical_data without refitting
+        resample: Bucket width (e.g. '1h') or resample_history options
+            (bucket/agg/fill/max_points) applied before fitting
+        deadline_ms: Latency budget; if the model cannot fit and forecast in
+            time, a `fallback` forecast computed alongside it is returned
+        fallback: 'seasonal_naive' or 'exp_smoothing'
+        warm_start: With method='prophet' and a series_id, start the fit from
+            that series' previous parameters (faster refits as history grows)
         
     Returns:
         Forecast predictions
     """
-    df = pd.DataFrame(historical_data)
-    df['ds'] = pd.to_datetime(df['timestamp'])
-    df['y'] = df['flow']
-    
-    forecaster = ProphetForecaster()
-    forecaster.fit(df[['ds', 'y']])
-    forecast = forecaster.predict(periods=hours_ahead)
-    
-    return {
-        'predicted_flow': float(forecast['yhat'].iloc[-1]),
-        'confidence_lower': float(forecast['yhat_lower'].iloc[-1]),
-        'confidence_upper': float(forecast['yhat_upper'].iloc[-1]),
+    df = _history_frame(historical_data, 'flow')
+    df = prepare_history(df, resample, method if model is None else None)
+    state_key = f'flow:{series_id}' if series_id is not None else None
+    forecast, model_used = _forecast_horizon(
+        df, hours_ahead, True, deadline_ms, fallback,
+        use_cache=use_cache, method=method, state_key=state_key, model=model, warm_start=warm_start,
+    )
+    result = _stream_flow_result(forecast, len(df), include_trajectory)
+    result['model'] = model_used
+    return result
+
+
+def _stream_flow_result(
+    forecast: HorizonForecast,
+    rows_fitted: int,
+    include_trajectory: bool = False,
+) -> Dict[str, Any]:
+    result = {
+        'predicted_flow': float(forecast.yhat[-1]),
+        'confidence_lower': float(forecast.yhat_lower[-1]),
+        'confidence_upper': float(forecast.yhat_upper[-1]),
+        'rows_fitted': rows_fitted,
     }
+    if include_trajectory:
+        result['trajectory'] = forecast.to_dict()
+    return result
 
 
-def forecast_solar_irradiance(historical_data: Dict[str, List[float]], hours_ahead: int = 24) -> Dict[str, float]:
+def forecast_solar_irradiance(
+    historical_data: Dict[str, List[float]],
+    hours_ahead: int = 24,
+    use_cache: bool = True,
+    include_trajectory: bool = False,
+    method: str = 'prophet',
+    series_id: Optional[str] = None,
+    model: Optional[Union[ModelRef, Dict[str, Any]]] = None,
+    resample: Optional[ResampleSpec] = None,
+    deadline_ms: Optional[float] = None,
+    fallback: str = 'seasonal_naive',
+    warm_start: bool = False,
+) -> Dict[str, Any]:
     """
     Forecast solar irradiance for Solar Gardens (#12)
     
     Args:
         historical_data: Dict with 'timestamp', 'irradiance', 'cloud_cover', 'temperature'
         hours_ahead: Forecast horizon
+        use_cache: Reuse a cached fit when the same history is posted again
+        include_trajectory: Also return the full hourly horizon trajectory
+        method: 'prophet' (batch fit), 'online' (incremental Holt-Winters) or 'lstm'
+        series_id: Device/series id; with method='online' its state is kept
+            between calls and only new rows are folded in
+        model: Registry ref of a stored model; forecasts from the end of
+            historical_data without refitting
+        resample: Bucket width (e.g. '1h') or resample_history options
+            (bucket/agg/fill/max_points) applied before fitting
+        deadline_ms: Latency budget; if the model cannot fit and forecast in
+            time, a `fallback` forecast computed alongside it is returned
+        fallback: 'seasonal_naive' or 'exp_smoothing'
+        warm_start: With method='prophet' and a series_id, start the fit from
+            that series' previous parameters (faster refits as history grows)
         
     Returns:
         Forecast predictions
     """
-    df = pd.DataFrame(historical_data)
-    df['ds'] = pd.to_datetime(df['timestamp'])
-    df['y'] = df['irradiance']
-    
-    forecaster = ProphetForecaster()
-    forecaster.fit(df[['ds', 'y']])
-    forecast = forecaster.predict(periods=hours_ahead)
-    
-    return {
-        'predicted_irradiance': float(forecast['yhat'].iloc[-1]),
-        'confidence_lower': float(forecast['yhat_lower'].iloc[-1]),
-        'confidence_upper': float(forecast['yhat_upper'].iloc[-1]),
+    df = _history_frame(historical_data, 'irradiance')
+    df = prepare_history(df, resample, method if model is None else None)
+    state_key = f'irradiance:{series_id}' if series_id is not None else None
+    forecast, model_used = _forecast_horizon(
+        df, hours_ahead, True, deadline_ms, fallback,
+        use_cache=use_cache, method=method, state_key=state_key, model=model, warm_start=warm_start,
+    )
+    result = _solar_irradiance_result(forecast, len(df), include_trajectory)
+    result['model'] = model_used
+    return result
+
+
+def _solar_irradiance_result(
+    forecast: HorizonForecast,
+    rows_fitted: int,
+    include_trajectory: bool = False,
+) -> Dict[str, Any]:
+    result = {
+        'predicted_irradiance': float(forecast.yhat[-1]),
+        'confidence_lower': float(forecast.yhat_lower[-1]),
+        'confidence_upper': float(forecast.yhat_upper[-1]),
+        'rows_fitted': rows_fitted,
     }
+    if include_trajectory:
+        result['trajectory'] = forecast.to_dict()
+    return result
 
 
-def forecast_humidity(historical_data: Dict[str, List[float]], hours_ahead: int = 6) -> Dict[str, float]:
+def forecast_humidity(
+    historical_data: Dict[str, List[float]],
+    hours_ahead: int = 6,
+    use_cache: bool = True,
+    include_trajectory: bool = False,
+    method: str = 'prophet',
+    series_id: Optional[str] = None,
+    model: Optional[Union[ModelRef, Dict[str, Any]]] = None,
+    resample: Optional[ResampleSpec] = None,
+    deadline_ms: Optional[float] = None,
+    fallback: str = 'seasonal_naive',
+    warm_start: bool = False,
+    threshold: float = 70.0,
+    min_window_hours: int = 1,
+    energy_prices: Optional[List[float]] = None,
+    target_liters: Optional[float] = None,
+) -> Dict[str, Any]:
     """
     Forecast humidity windows for AWG (#9) optimization
     
     Args:
         historical_data: Dict with 'timestamp', 'humidity', 'temperature'
         hours_ahead: Forecast horizon
+        use_cache: Reuse a cached fit when the same history is posted again
+        include_trajectory: Also return the full hourly horizon trajectory
+        method: 'prophet' (batch fit), 'online' (incremental Holt-Winters) or 'lstm'
+        series_id: Device/series id; with method='online' its state is kept
+            between calls and only new rows are folded in
+        model: Registry ref of a stored model; forecasts from the end of
+            historical_data without refitting
+        resample: Bucket width (e.g. '1h') or resample_history options
+            (bucket/agg/fill/max_points) applied before fitting
+        deadline_ms: Latency budget; if the model cannot fit and forecast in
+            time, a `fallback` forecast computed alongside it is returned
+        fallback: 'seasonal_naive' or 'exp_smoothing'
+        warm_start: With method='prophet' and a series_id, start the fit from
+            that series' previous parameters (faster refits as history grows)
+        threshold: Humidity % above which the unit should run
+        min_window_hours: Drop windows shorter than this many forecast steps
+        energy_prices: Hourly $/kWh over the horizon; with target_liters, also
+            returns an optimize_awg_schedule plan restricted to the windows
+        target_liters: Water production target for the schedule
         
     Returns:
         Optimal run windows
     """
-    df = pd.DataFrame(historical_data)
-    df['ds'] = pd.to_datetime(df['timestamp'])
-    df['y'] = df['humidity']
+    df = _history_frame(historical_data, 'humidity')
+    df = prepare_history(df, resample, method if model is None else None)
+    state_key = f'humidity:{series_id}' if series_id is not None else None
+    forecast, model_used = _forecast_horizon(
+        df, hours_ahead, False, deadline_ms, fallback,
+        use_cache=use_cache, method=method, state_key=state_key, model=model, warm_start=warm_start,
+    )
+    result = _humidity_result(
+        forecast,
+        len(df),
+        include_trajectory,
+        threshold=threshold,
+        min_window_hours=min_window_hours,
+        energy_prices=energy_prices,
+        target_liters=target_liters,
+    )
+    result['model'] = model_used
+    return result
+
+
+def _humidity_result(
+    forecast: HorizonForecast,
+    rows_fitted: int,
+    include_trajectory: bool = False,
+    threshold: float = 70.0,
+    min_window_hours: int = 1,
+    energy_prices: Optional[List[float]] = None,
+    target_liters: Optional[float] = None,
+) -> Dict[str, Any]:
+    # Identify optimal hours (humidity > threshold) and the contiguous windows they form
+    optimal = np.flatnonzero(forecast.yhat > threshold)
+    windows = extract_run_windows(forecast.ds, forecast.yhat, threshold, min_window_hours)
     
-    forecaster = ProphetForecaster()
-    forecaster.fit(df[['ds', 'y']])
-    forecast = forecaster.predict(periods=hours_ahead)
+    result = {
+        'predicted_humidity': float(forecast.yhat[-1]),
+        'optimal_windows_count': int(optimal.size),
+        'next_optimal_window': pd.Timestamp(forecast.ds[optimal[0]]).isoformat() if optimal.size > 0 else None,
+        'windows': windows,
+        'rows_fitted': rows_fitted,
+    }
+    if energy_prices is not None and target_liters is not None:
+        from solvers import optimize_awg_schedule
+        result['schedule'] = optimize_awg_schedule(
+            forecast.yhat.tolist(), energy_prices[:len(forecast)], target_liters, run_windows=windows
+        )
+    if include_trajectory:
+        result['trajectory'] = forecast.to_dict()
+    return result
+
+
+# helper name -> (value column, needs intervals, result builder, builder options), for batched LSTM scoring
+_FORECAST_TARGETS = {
+    'forecast_stream_flow': ('flow', True, _stream_flow_result, ()),
+    'forecast_solar_irradiance': ('irradiance', True, _solar_irradiance_result, ()),
+    'forecast_humidity': (
+        'humidity', False, _humidity_result, ('threshold', 'min_window_hours', 'energy_prices', 'target_liters'),
+    ),
+}
+
+
+def _forecast_lstm_chunk(
+    func_name: str,
+    chunk: List[Any],
+    hours_ahead: int,
+    options: Dict[str, Any],
+) -> Any:
+    """Score a chunk of series with one LSTM model and one batched forward pass"""
+    column, include_uncertainty, build_result, result_options = _FORECAST_TARGETS[func_name]
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+    for series_id, historical_data in chunk:
+        try:
+            frames[series_id] = prepare_history(_history_frame(historical_data, column), options.get('resample'), 'lstm')
+        except Exception as exc:
+            errors[series_id] = f"{type(exc).__name__}: {exc}"
+    if not frames:
+        return {}, errors
+
+    try:
+        pipeline = _lstm_pipeline(list(frames.values()), options.get('use_cache', True))
+        forecasts = pipeline.predict_horizon_many(list(frames.values()), hours_ahead, include_uncertainty)
+    except Exception as exc:
+        errors.update({series_id: f"{type(exc).__name__}: {exc}" for series_id in frames})
+        return {}, errors
+    include_trajectory = options.get('include_trajectory', False)
+    extra = {name: options[name] for name in result_options if name in options}
+    results = {
+        series_id: {**build_result(forecast, len(frame), include_trajectory, **extra), 'model': 'lstm'}
+        for (series_id, frame), forecast in zip(frames.items(), forecasts)
+    }
+    return results, errors
+
+
+def forecast_stream_flow_batch(
+    series: Dict[str, Dict[str, List[float]]],
+    hours_ahead: int = 24,
+    max_workers: Optional[int] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Forecast stream flow for a fleet of Micro-Hydro (#13) turbines
+    
+    Args:
+        series: {device_id: historical_data} in the forecast_stream_flow format
+        hours_ahead: Forecast horizon
+        max_workers: Worker processes used to fit series in parallel
+        **options: Passed through to forecast_stream_flow
+        
+    Returns:
+        Per-device results and per-device errors
+    """
+    return forecast_batch('forecast_stream_flow', series, hours_ahead, max_workers, **options)
+
+
+def forecast_solar_irradiance_batch(
+    series: Dict[str, Dict[str, List[float]]],
+    hours_ahead: int = 24,
+    max_workers: Optional[int] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Forecast irradiance for a fleet of Solar Gardens (#12) arrays
+    
+    Args:
+        series: {array_id: historical_data} in the forecast_solar_irradiance format
+        hours_ahead: Forecast horizon
+        max_workers: Worker processes used to fit series in parallel
+        **options: Passed through to forecast_solar_irradiance
+        
+    Returns:
+        Per-array results and per-array errors
+    """
+    return forecast_batch('forecast_solar_irradiance', series, hours_ahead, max_workers, **options)
+
+
+def forecast_humidity_batch(
+    series: Dict[str, Dict[str, List[float]]],
+    hours_ahead: int = 6,
+    max_workers: Optional[int] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Forecast humidity windows for a fleet of AWG (#9) units
     
-    # Identify optimal windows (humidity > 70%)
-    optimal_windows = forecast[forecast['yhat'] > 70.0]
+    Args:
+        series: {unit_id: historical_data} in the forecast_humidity format
+        hours_ahead: Forecast horizon
+        max_workers: Worker processes used to fit series in parallel
+        **options: Passed through to forecast_humidity
+        
+    Returns:
+        Per-unit results and per-unit errors
+    """
+    return forecast_batch('forecast_humidity', series, hours_ahead, max_workers, **options)
+
+
+def register_forecaster(
+    project: str,
+    device: str,
+    historical_data: Dict[str, List[float]],
+    value_column: str,
+    method: str = 'prophet',
+    metadata: Optional[Dict[str, Any]] = None,
+    resample: Optional[ResampleSpec] = None,
+    warm_start: bool = False,
+) -> Dict[str, Any]:
+    """
+    Fit a forecaster on historical data and store it in the model registry
     
+    Args:
+        project: Project code, e.g. 'P13'
+        device: Device/series id
+        historical_data: Dict with 'timestamp' and the value column
+        value_column: Column to model, e.g. 'flow', 'irradiance', 'humidity'
+        method: 'prophet', 'online' or 'lstm'
+        metadata: Extra JSON-safe fields recorded in the manifest
+        resample: Bucket width or resample_history options applied before fitting
+        warm_start: With method='prophet', refit from the latest stored
+            version's parameters (cold fit if none is stored)
+        
+    Returns:
+        The stored model's ref and manifest summary
+    """
+    df = prepare_history(_history_frame(historical_data, value_column), resample, method)
+    registry = default_registry()
+    previous = None
+    if warm_start and method == 'prophet':
+        try:
+            previous = registry.load(ModelRef(project, device, 'prophet'))
+        except ModelNotFound:
+            pass
+    forecaster = previous.refit(df) if previous is not None else _fit_forecaster(df, method=method)
+    ref = registry.save(project, device, forecaster, metadata={'value_column': value_column, **(metadata or {})})
+    manifest = registry.manifest(ref)
     return {
-        'predicted_humidity': float(forecast['yhat'].iloc[-1]),
-        'optimal_windows_count': len(optimal_windows),
-        'next_optimal_window': optimal_windows.iloc[0]['ds'].isoformat() if len(optimal_windows) > 0 else None,
+        'model': ref.to_dict(),
+        'object_key': registry.object_key(ref),
+        'created_at': manifest['created_at'],
+        'history_end': manifest['history_end'],
+        'rows_fitted': len(df),
     }
 
 
@@ -208,12 +772,103 @@ def predict_bulb_failure(telemetry_data: Dict[str, float]) -> Dict[str, float]:
     }
 
 
+def predict_bulb_failure_batch(
+    voltage: Any,
+    thermal_cycles: Any,
+    uptime: Any,
+    top_k: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized predict_bulb_failure for a Centennial Bulb (#8) fleet
+    
+    Args:
+        voltage: Per-bulb supply voltage (array-like)
+        thermal_cycles: Per-bulb thermal cycle counts (array-like)
+        uptime: Per-bulb uptime in hours (array-like)
+        top_k: Also return indices of the k most at-risk bulbs
+        
+    Returns:
+        Arrays aligned with the inputs, plus 'most_at_risk' indices
+        (highest stress first) when top_k is given
+    """
+    voltage = np.asarray(voltage, dtype=np.float64)
+    thermal_cycles = np.asarray(thermal_cycles, dtype=np.float64)
+    uptime = np.asarray(uptime, dtype=np.float64)
+    if not (voltage.shape == thermal_cycles.shape == uptime.shape) or voltage.ndim != 1:
+        raise ValueError(
+            "voltage, thermal_cycles and uptime must be 1-D arrays of the same length; "
+            f"got shapes {voltage.shape}, {thermal_cycles.shape}, {uptime.shape}."
+        )
+    
+    # Same model as predict_bulb_failure, one column at a time
+    voltage_stress = np.maximum(0.0, (voltage - 12.0) / 12.0)
+    thermal_stress = thermal_cycles / 10000.0
+    age_factor = uptime / 87600.0
+    stress_score = voltage_stress * 0.3 + thermal_stress * 0.4 + age_factor * 0.3
+    failure_probability = np.minimum(1.0, stress_score)
+    expected_remaining = 87600 * (1 - failure_probability)
+    
+    result = {
+        'failure_probability': failure_probability,
+        'expected_remaining_hours': expected_remaining,
+        'expected_remaining_years': expected_remaining / 8760,
+        'stress_score': stress_score,
+    }
+    if top_k is not None:
+        # Rank on the unclipped stress score so saturated bulbs (probability 1.0) still order
+        result['most_at_risk'] = top_k_indices(stress_score, top_k)
+    return result
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest scores, largest first, in O(n + k log k).
+    
+    Uses argpartition so only the selected k are sorted, not the whole fleet.
+    """
+    if k < 1:
+        raise ValueError(f"k must be at least 1; received {k}.")
+    scores = np.asarray(scores)
+    if k >= scores.size:
+        return np.argsort(-scores, kind='stable')
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+
 # Export main forecasting functions
 __all__ = [
     'LSTMForecaster',
+    'LSTMPipeline',
     'ProphetForecaster',
+    'OnlineForecaster',
+    'HoltWintersState',
+    'HorizonForecast',
+    'FORECAST_METHODS',
+    'FALLBACK_MODELS',
+    'BACKTEST_BACKENDS',
+    'COLUMNAR_CONTENT_TYPE',
+    'ARROW_STREAM_CONTENT_TYPE',
+    'BINARY_CONTENT_TYPES',
+    'encode_columns',
+    'decode_history',
+    'lttb',
+    'resample_history',
+    'extract_run_windows',
+    'extract_run_windows_batch',
     'forecast_stream_flow',
     'forecast_solar_irradiance',
     'forecast_humidity',
+    'forecast_stream_flow_batch',
+    'forecast_solar_irradiance_batch',
+    'forecast_humidity_batch',
+    'register_forecaster',
+    'backtest',
+    'summarize_backtest',
+    'write_backtest',
+    'ModelRef',
     'predict_bulb_failure',
+    'predict_bulb_failure_batch',
+    'top_k_indices',
+    'get_forecast_cache_stats',
+    'clear_forecast_cache',
 ]
@@ -0,0 +1,238 @@
+"""
+Rolling-origin backtesting of forecast backends
+Every (series, backend) pair is cross-validated over expanding-window folds
+in a process pool; the result is one row per fold with MAE/MAPE and fit /
+predict timings, written as CSV (or Parquet when a Parquet engine is installed).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+BACKTEST_BACKENDS = ('prophet', 'online', 'lstm', 'seasonal_naive', 'exp_smoothing')
+
+RESULT_COLUMNS = [
+    'series_id', 'backend', 'fold', 'cutoff', 'train_rows', 'horizon',
+    'mae', 'mape', 'fit_s', 'predict_s', 'error',
+]
+
+SeriesInput = Union[Dict[str, Any], 'pd.DataFrame']
+
+
+def rolling_origins(
+    n_rows: int,
+    horizon: int,
+    n_folds: int = 3,
+    step: Optional[int] = None,
+    initial: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Cutoff row indices of expanding-window folds, oldest first.
+    Fold k trains on rows[:cutoff] and is scored on rows[cutoff:cutoff + horizon].
+
+    Args:
+        n_rows: Series length
+        horizon: Test rows per fold
+        n_folds: Maximum number of folds (the most recent ones are kept)
+        step: Rows between consecutive cutoffs (default: horizon)
+        initial: Minimum training rows (default: 2 * horizon)
+    """
+    if horizon < 1 or n_folds < 1:
+        raise ValueError(f"horizon and n_folds must be at least 1; received {horizon} and {n_folds}.")
+    step = horizon if step is None else step
+    initial = 2 * horizon if initial is None else initial
+    cutoffs = (n_rows - horizon) - step * np.arange(n_folds)[::-1]
+    cutoffs = cutoffs[cutoffs >= max(initial, 2)]
+    if not len(cutoffs):
+        raise ValueError(
+            f"Series of {n_rows} rows is too short for a {horizon}-step fold after {initial} training rows."
+        )
+    return cutoffs
+
+
+def _as_frame(data: SeriesInput, value_column: str) -> pd.DataFrame:
+    if isinstance(data, pd.DataFrame):
+        frame = data[['ds', 'y']]
+    else:
+        from forecasting import _history_frame
+        frame = _history_frame(data, value_column)
+    return frame.sort_values('ds', kind='stable').reset_index(drop=True)
+
+
+def _errors(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
+    error = np.abs(predicted - actual)
+    nonzero = actual != 0
+    mape = float(np.mean(error[nonzero] / np.abs(actual[nonzero])) * 100.0) if nonzero.any() else float('nan')
+    return {'mae': float(np.mean(error)), 'mape': mape}
+
+
+def backtest_series(
+    df: pd.DataFrame,
+    backend: str,
+    horizon: int = 24,
+    n_folds: int = 3,
+    step: Optional[int] = None,
+    initial: Optional[int] = None,
+    lstm_options: Optional[Dict[str, Any]] = None,
+    series_id: str = '',
+) -> List[Dict[str, Any]]:
+    """
+    Rolling-origin backtest of one backend on one ds/y series.
+
+    The test targets of all folds are read from one sliding-window view of
+    the series, and Prophet folds warm-start from the previous fold's fit
+    (each fold's history is the previous one plus `step` rows).
+
+    Returns:
+        One result row per fold (see RESULT_COLUMNS)
+    """
+    from forecasting import OnlineForecaster, ProphetForecaster
+    from .fallback import FALLBACK_MODELS, fallback_forecast
+
+    if backend not in BACKTEST_BACKENDS:
+        raise ValueError(f"Unknown backtest backend {backend!r}; expected one of {list(BACKTEST_BACKENDS)}.")
+    values = df['y'].to_numpy(dtype=np.float64)
+    cutoffs = rolling_origins(len(values), horizon, n_folds, step, initial)
+    actuals = sliding_window_view(values, horizon)[cutoffs]
+    stamps = pd.to_datetime(df['ds']).to_numpy(dtype='datetime64[ns]')
+    spacing = pd.Timedelta(np.median(np.diff(stamps.view(np.int64)))) if len(stamps) > 1 else pd.Timedelta(hours=1)
+
+    rows = []
+    previous = None
+    for fold, (cutoff, actual) in enumerate(zip(cutoffs, actuals)):
+        train = df.iloc[:cutoff]
+        row = {
+            'series_id': series_id, 'backend': backend, 'fold': fold,
+            'cutoff': pd.Timestamp(stamps[cutoff]).isoformat(), 'train_rows': int(cutoff), 'horizon': horizon,
+            'mae': float('nan'), 'mape': float('nan'), 'fit_s': 0.0, 'predict_s': 0.0, 'error': '',
+        }
+        try:
+            started = time.perf_counter()
+            if backend in FALLBACK_MODELS:
+                model = None
+            elif backend == 'prophet':
+                model = previous.refit(train) if previous is not None else ProphetForecaster()
+                if previous is None:
+                    model.fit(train)
+                previous = model
+            elif backend == 'online':
+                model = OnlineForecaster()
+                model.fit(train)
+            else:
+                from .lstm import LSTMPipeline
+                model = LSTMPipeline(**(lstm_options or {}))
+                model.fit(train)
+            fitted = time.perf_counter()
+            if model is None:
+                forecast = fallback_forecast(train, horizon, False, backend, step=spacing)
+            else:
+                forecast = model.predict_horizon(periods=horizon, include_uncertainty=False, step=spacing)
+            row['fit_s'], row['predict_s'] = fitted - started, time.perf_counter() - fitted
+            row.update(_errors(actual, np.asarray(forecast.yhat, dtype=np.float64)))
+        except Exception as exc:
+            row['error'] = f"{type(exc).__name__}: {exc}"
+        rows.append(row)
+    return rows
+
+
+def _backtest_task(series_id: str, frame: pd.DataFrame, backend: str, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    try:
+        return backtest_series(frame, backend, series_id=series_id, **options)
+    except Exception as exc:
+        # Series too short for any fold (or similar): one error row for the pair
+        row = dict.fromkeys(RESULT_COLUMNS, float('nan'))
+        row.update(series_id=series_id, backend=backend, error=f"{type(exc).__name__}: {exc}")
+        return [row]
+
+
+def backtest(
+    series: Dict[str, SeriesInput],
+    value_column: str = 'y',
+    backends: Sequence[str] = ('prophet', 'seasonal_naive'),
+    horizon: int = 24,
+    n_folds: int = 3,
+    step: Optional[int] = None,
+    initial: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    lstm_options: Optional[Dict[str, Any]] = None,
+    output_path: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Rolling-origin cross-validation of several backends across many series.
+
+    Args:
+        series: {series_id: historical_data dict (with 'timestamp' and
+            value_column) or ds/y DataFrame}
+        value_column: Value column of the historical_data dicts
+        backends: Any of BACKTEST_BACKENDS
+        horizon: Forecast steps scored per fold
+        n_folds: Folds per series (most recent cutoffs)
+        step: Rows between fold cutoffs (default: horizon)
+        initial: Minimum training rows (default: 2 * horizon)
+        max_workers: Worker processes (default: one per core; 1 runs inline)
+        lstm_options: LSTMPipeline keyword arguments (e.g. fewer epochs)
+        output_path: Also write the table here (.csv or .parquet)
+
+    Returns:
+        One row per (series, backend, fold); see RESULT_COLUMNS
+    """
+    unknown = [b for b in backends if b not in BACKTEST_BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown backtest backends {unknown}; expected any of {list(BACKTEST_BACKENDS)}.")
+    options = {'horizon': horizon, 'n_folds': n_folds, 'step': step, 'initial': initial, 'lstm_options': lstm_options}
+    tasks = [(sid, _as_frame(data, value_column), backend) for sid, data in series.items() for backend in backends]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(tasks)))
+    if max_workers == 1:
+        chunks = [_backtest_task(sid, frame, backend, options) for sid, frame, backend in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_backtest_task, sid, frame, backend, options) for sid, frame, backend in tasks]
+            chunks = [future.result() for future in futures]
+
+    results = pd.DataFrame([row for rows in chunks for row in rows], columns=RESULT_COLUMNS)
+    if output_path is not None:
+        write_backtest(results, output_path)
+    return results
+
+
+def summarize_backtest(results: pd.DataFrame, by: Sequence[str] = ('series_id', 'backend')) -> pd.DataFrame:
+    """Mean MAE/MAPE/timings per group over successful folds, best MAE first within each series"""
+    ok = results[results['error'].fillna('') == '']
+    summary = ok.groupby(list(by), sort=False)[['mae', 'mape', 'fit_s', 'predict_s']].mean()
+    summary['folds'] = ok.groupby(list(by), sort=False).size()
+    return summary.reset_index().sort_values([*by[:-1], 'mae'], kind='stable').reset_index(drop=True)
+
+
+def write_backtest(results: pd.DataFrame, path: str):
+    """Write a result table as Parquet (needs pyarrow or fastparquet) or CSV, by file extension"""
+    if path.endswith('.parquet'):
+        try:
+            results.to_parquet(path, index=False)
+        except ImportError as exc:
+            raise ValueError("Writing Parquet needs pyarrow or fastparquet installed; use a .csv path instead") from exc
+    else:
+        results.to_csv(path, index=False, float_format='%.6g')
+
+
+__all__ = [
+    'BACKTEST_BACKENDS',
+    'RESULT_COLUMNS',
+    'rolling_origins',
+    'backtest_series',
+    'backtest',
+    'summarize_backtest',
+    'write_backtest',
+]
@@ -0,0 +1,140 @@
+"""
+Batch multi-series forecasting
+Fits many independent series in parallel across cores; one bad series is
+reported in `errors` instead of failing the whole batch. The worker
+processes are shared by every batch call, so their per-process model and
+forecast caches carry over from one batch to the next.
+"""
+
+import importlib
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _forecast_chunk(
+    func_name: str,
+    chunk: List[Tuple[str, Dict[str, List[float]]]],
+    hours_ahead: int,
+    options: Dict[str, Any],
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Run one forecast helper over a chunk of series, capturing per-series errors"""
+    forecasting = importlib.import_module('forecasting')
+    if options.get('method') == 'lstm':
+        # One shared model and one batched forward pass for the whole chunk
+        return forecasting._forecast_lstm_chunk(func_name, chunk, hours_ahead, options)
+    forecast_fn = getattr(forecasting, func_name)
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for series_id, historical_data in chunk:
+        kwargs = options
+        if options.get('method') == 'online' or options.get('warm_start'):
+            # Key the per-series online state / warm-start parameters by the caller's series id
+            kwargs = {'series_id': series_id, **options}
+        try:
+            results[series_id] = forecast_fn(historical_data, hours_ahead, **kwargs)
+        except Exception as exc:
+            errors[series_id] = f"{type(exc).__name__}: {exc}"
+    return results, errors
+
+
+def _batch_pool(max_workers: int) -> ProcessPoolExecutor:
+    """The shared worker processes, replaced by a larger pool when a call needs more"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < max_workers:
+            if _pool is not None:
+                # Calls still running on the old pool finish there
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=max_workers)
+            _pool_workers = max_workers
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next call starts fresh workers"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _submit(max_workers: int, *args: Any) -> Tuple[ProcessPoolExecutor, Future]:
+    """Submit one chunk, replacing the shared pool once if it is already broken"""
+    pool = _batch_pool(max_workers)
+    try:
+        return pool, pool.submit(_forecast_chunk, *args)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        pool = _batch_pool(max_workers)
+        return pool, pool.submit(_forecast_chunk, *args)
+
+
+def _chunks(items: List[Any], n: int) -> List[List[Any]]:
+    """Split items into n round-robin chunks of near-equal size"""
+    return [chunk for chunk in (items[i::n] for i in range(n)) if chunk]
+
+
+def forecast_batch(
+    func_name: str,
+    series: Dict[str, Dict[str, List[float]]],
+    hours_ahead: int,
+    max_workers: Optional[int] = None,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Apply a forecast helper to many series.
+
+    Args:
+        func_name: Name of a forecasting helper, e.g. 'forecast_stream_flow'
+        series: {series_id: historical_data} for each device
+        hours_ahead: Forecast horizon
+        max_workers: Worker processes (default: one per core; 1 runs inline).
+            A chunk whose worker fails (e.g. the process dies) reports each
+            of its series as an error
+        **options: Extra keyword arguments for the helper
+
+    Returns:
+        Per-series results and per-series error messages
+    """
+    items = list(series.items())
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(items)))
+
+    results: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    if max_workers == 1:
+        results, errors = _forecast_chunk(func_name, items, hours_ahead, options)
+    else:
+        chunks = _chunks(items, max_workers)
+        submitted = [_submit(max_workers, func_name, chunk, hours_ahead, options) for chunk in chunks]
+        for chunk, (pool, future) in zip(chunks, submitted):
+            try:
+                chunk_results, chunk_errors = future.result()
+            except Exception as exc:
+                # Only this chunk's series fail; a dead worker also retires its pool
+                if isinstance(exc, BrokenProcessPool):
+                    _discard_pool(pool)
+                errors.update({series_id: f"{type(exc).__name__}: {exc}" for series_id, _ in chunk})
+                continue
+            results.update(chunk_results)
+            errors.update(chunk_errors)
+
+    # Preserve the caller's series order
+    return {
+        'results': {sid: results[sid] for sid, _ in items if sid in results},
+        'errors': {sid: errors[sid] for sid, _ in items if sid in errors},
+        'series_count': len(items),
+        'failed_count': len(errors),
+    }
+
+
+__all__ = ['forecast_batch']
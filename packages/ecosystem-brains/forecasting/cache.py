@@ -0,0 +1,106 @@
+"""
+Fitted-model cache for forecasting brains
+Repeat forecasts over an unchanged history reuse the fitted model instead of refitting
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, Dict
+
+import numpy as np
+
+from caching import LRUTTLCache
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Fixed per-model overhead (Stan backend handles, Python objects) in bytes
+_MODEL_OVERHEAD_BYTES = 64 * 1024
+
+
+def series_fingerprint(ds: pd.Series, y: pd.Series, seasonality_mode: str) -> str:
+    """
+    Stable hash of a (timestamps, values, seasonality_mode) input.
+
+    Args:
+        ds: Timestamps (anything pandas can convert to datetime64[ns])
+        y: Observed values
+        seasonality_mode: Prophet seasonality mode
+
+    Returns:
+        Hex digest identifying the series
+    """
+    stamps = np.ascontiguousarray(pd.to_datetime(ds).to_numpy(dtype='datetime64[ns]')).view(np.int64)
+    values = np.ascontiguousarray(np.asarray(y, dtype=np.float64))
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(seasonality_mode.encode())
+    digest.update(len(stamps).to_bytes(8, 'little'))
+    digest.update(stamps.tobytes())
+    digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+def estimate_model_nbytes(forecaster: Any) -> int:
+    """Approximate resident size of a fitted forecaster (history frame + parameter arrays / weights)"""
+    model = getattr(forecaster, 'model', forecaster)
+    nbytes = _MODEL_OVERHEAD_BYTES
+    history = getattr(model, 'history', None)
+    if isinstance(history, pd.DataFrame):
+        nbytes += int(history.memory_usage(index=True, deep=True).sum())
+    params = getattr(model, 'params', None) or {}
+    for value in params.values():
+        nbytes += int(getattr(value, 'nbytes', 0))
+    # torch modules (LSTM backend): weights counted once for the eager copy
+    if hasattr(model, 'parameters') and callable(model.parameters):
+        nbytes += sum(p.numel() * p.element_size() for p in model.parameters())
+    return nbytes
+
+
+forecast_model_cache = LRUTTLCache(
+    max_entries=int(os.environ.get('ECOS_FORECAST_CACHE_ENTRIES', '256')),
+    ttl_seconds=float(os.environ.get('ECOS_FORECAST_CACHE_TTL_SECONDS', '3600')),
+    max_bytes=int(float(os.environ.get('ECOS_FORECAST_CACHE_MAX_MB', '512')) * 1024 * 1024),
+    sizeof=estimate_model_nbytes,
+)
+
+# Per-series online (Holt-Winters) state, keyed by '<value_column>:<series_id>'.
+# A state is a few hundred bytes, so the entry count is the only real bound.
+online_state_cache = LRUTTLCache(
+    max_entries=int(os.environ.get('ECOS_ONLINE_STATE_ENTRIES', '100000')),
+    ttl_seconds=float(os.environ.get('ECOS_ONLINE_STATE_TTL_SECONDS', '604800')),
+)
+
+# Last Prophet parameters per series (same keys), used to warm-start refits
+warm_start_cache = LRUTTLCache(
+    max_entries=int(os.environ.get('ECOS_WARM_START_ENTRIES', '100000')),
+    ttl_seconds=float(os.environ.get('ECOS_WARM_START_TTL_SECONDS', '604800')),
+)
+
+
+def get_forecast_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters of this process's fitted-model, online-state and warm-start caches"""
+    return {
+        'pid': os.getpid(),
+        **forecast_model_cache.stats(),
+        'online_state': online_state_cache.stats(),
+        'warm_start': warm_start_cache.stats(),
+    }
+
+
+def clear_forecast_cache():
+    forecast_model_cache.clear()
+    online_state_cache.clear()
+    warm_start_cache.clear()
+
+
+__all__ = [
+    'series_fingerprint',
+    'estimate_model_nbytes',
+    'forecast_model_cache',
+    'online_state_cache',
+    'warm_start_cache',
+    'get_forecast_cache_stats',
+    'clear_forecast_cache',
+]
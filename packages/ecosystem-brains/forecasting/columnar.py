@@ -0,0 +1,149 @@
+"""
+Binary columnar encoding of forecast history
+Long histories skip JSON parsing: columns are little-endian 8-byte arrays
+decoded with np.frombuffer, i.e. NumPy views over the request body.
+
+ECOS columnar layout (all integers little-endian):
+
+    0   4s   magic b'ECOL'
+    4   u8   version (1)
+    5   u8   reserved (0)
+    6   u16  column count
+    8   u64  row count
+    16       column directory, per column:
+                 u8  dtype code: 'f' float64, 'i' int64, 't' datetime64[ns] (epoch ns)
+                 u8  reserved (0)
+                 u16 name length, then UTF-8 name bytes
+             zero padding to an 8-byte boundary
+             column data in directory order, row count x 8 bytes each
+
+Arrow IPC streams are accepted too when pyarrow is installed.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Dict, Mapping, Union
+
+import numpy as np
+
+COLUMNAR_CONTENT_TYPE = 'application/vnd.ecos.columnar'
+ARROW_STREAM_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+BINARY_CONTENT_TYPES = (COLUMNAR_CONTENT_TYPE, ARROW_STREAM_CONTENT_TYPE)
+
+_MAGIC = b'ECOL'
+_HEADER = struct.Struct('<4sBBHQ')
+_COLUMN = struct.Struct('<BBH')
+_DTYPES = {ord('f'): np.dtype('<f8'), ord('i'): np.dtype('<i8'), ord('t'): np.dtype('<M8[ns]')}
+_CODES = {'f': ord('f'), 'i': ord('i'), 'M': ord('t')}
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def encode_columns(columns: Mapping[str, np.ndarray]) -> bytes:
+    """
+    Encode equal-length 1-D columns in the ECOS columnar layout.
+
+    Args:
+        columns: {name: array}; floats become float64, integers int64,
+            datetimes datetime64[ns]
+
+    Returns:
+        Encoded payload
+    """
+    arrays = {}
+    for name, values in columns.items():
+        array = np.asarray(values)
+        if array.dtype.kind == 'M':
+            array = array.astype('<M8[ns]')
+        elif array.dtype.kind in 'iub':
+            array = array.astype('<i8')
+        else:
+            array = array.astype('<f8')
+        if array.ndim != 1:
+            raise ValueError(f"Column {name!r} must be 1-D; got shape {array.shape}.")
+        arrays[name] = array
+    lengths = {len(a) for a in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"All columns must have the same length; got {sorted(lengths)}.")
+    nrows = lengths.pop() if lengths else 0
+
+    parts = [_HEADER.pack(_MAGIC, 1, 0, len(arrays), nrows)]
+    for name, array in arrays.items():
+        encoded = name.encode('utf-8')
+        parts.append(_COLUMN.pack(_CODES[array.dtype.kind], 0, len(encoded)) + encoded)
+    header = b''.join(parts)
+    header += b'\0' * (-len(header) % 8)
+    return header + b''.join(array.tobytes() for array in arrays.values())
+
+
+def decode_columns(payload: Buffer) -> Dict[str, np.ndarray]:
+    """
+    Decode an ECOS columnar payload into read-only NumPy views (no copies).
+
+    Raises:
+        ValueError: malformed or truncated payload
+    """
+    view = memoryview(payload)
+    if len(view) < _HEADER.size:
+        raise ValueError("Columnar payload is shorter than its header")
+    magic, version, _, ncols, nrows = _HEADER.unpack_from(view)
+    if magic != _MAGIC or version != 1:
+        raise ValueError("Not an ECOS columnar (ECOL v1) payload")
+
+    offset = _HEADER.size
+    directory = []
+    for _ in range(ncols):
+        if offset + _COLUMN.size > len(view):
+            raise ValueError("Columnar payload truncated in column directory")
+        code, _, name_length = _COLUMN.unpack_from(view, offset)
+        offset += _COLUMN.size
+        if code not in _DTYPES:
+            raise ValueError(f"Unknown column dtype code {code!r}")
+        name = bytes(view[offset:offset + name_length]).decode('utf-8')
+        offset += name_length
+        directory.append((name, _DTYPES[code]))
+    offset += -offset % 8
+
+    expected = offset + ncols * nrows * 8
+    if len(view) != expected:
+        raise ValueError(f"Columnar payload is {len(view)} bytes; header describes {expected}")
+    columns = {}
+    for name, dtype in directory:
+        columns[name] = np.frombuffer(view, dtype=dtype, count=nrows, offset=offset)
+        offset += nrows * 8
+    return columns
+
+
+def decode_arrow_stream(payload: Buffer) -> Dict[str, np.ndarray]:
+    """Decode an Arrow IPC stream; numeric columns without nulls are zero-copy"""
+    try:
+        import pyarrow as pa
+    except ImportError as exc:
+        raise ValueError("Arrow payloads need pyarrow installed; send application/vnd.ecos.columnar instead") from exc
+
+    table = pa.ipc.open_stream(pa.py_buffer(payload)).read_all().combine_chunks()
+    return {
+        name: table.column(name).chunk(0).to_numpy(zero_copy_only=False) if table.num_rows else np.empty(0)
+        for name in table.column_names
+    }
+
+
+def decode_history(payload: Buffer, content_type: str) -> Dict[str, np.ndarray]:
+    """Decode a binary history body by content type"""
+    if content_type == COLUMNAR_CONTENT_TYPE:
+        return decode_columns(payload)
+    if content_type == ARROW_STREAM_CONTENT_TYPE:
+        return decode_arrow_stream(payload)
+    raise ValueError(f"Unsupported content type {content_type!r}; expected one of {list(BINARY_CONTENT_TYPES)}")
+
+
+__all__ = [
+    'COLUMNAR_CONTENT_TYPE',
+    'ARROW_STREAM_CONTENT_TYPE',
+    'BINARY_CONTENT_TYPES',
+    'encode_columns',
+    'decode_columns',
+    'decode_arrow_stream',
+    'decode_history',
+]
@@ -0,0 +1,215 @@
+"""
+Deadline-bounded forecasting with cheap fallback models
+The primary model (Prophet/online/LSTM) runs on a worker thread while a
+vectorised seasonal-naive or exponential-smoothing forecast is computed in
+the caller; if the primary misses the deadline, the fallback is returned.
+Primaries in flight are bounded, so missed deadlines cannot pile fits up
+behind the worker threads.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from .horizon import HorizonForecast
+
+pd = lazy_import('pandas')
+
+FALLBACK_MODELS = ('seasonal_naive', 'exp_smoothing')
+
+_Z_95 = 1.96
+_DAY_NS = 24 * 3600 * 10**9
+_HOUR_NS = 3600 * 10**9
+
+_executor: Optional[ThreadPoolExecutor] = None
+_pending: Optional[threading.BoundedSemaphore] = None
+_executor_lock = threading.Lock()
+
+
+def _deadline_executor() -> Tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """
+    Shared threads for primary fits (ECOS_FORECAST_DEADLINE_THREADS, default 4)
+    and the slots for primaries running or queued on them
+    (ECOS_FORECAST_DEADLINE_PENDING, default twice the threads)
+    """
+    global _executor, _pending
+    with _executor_lock:
+        if _executor is None:
+            workers = max(1, int(os.environ.get('ECOS_FORECAST_DEADLINE_THREADS', '4')))
+            pending = int(os.environ.get('ECOS_FORECAST_DEADLINE_PENDING', str(2 * workers)))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ecos-forecast')
+            _pending = threading.BoundedSemaphore(max(1, pending))
+        return _executor, _pending
+
+
+def _sorted_history(df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    stamps = pd.to_datetime(df['ds']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+    values = df['y'].to_numpy(dtype=np.float64)
+    keep = ~np.isnan(values)
+    stamps, values = stamps[keep], values[keep]
+    if not len(values):
+        raise ValueError("Fallback forecast requires at least 1 non-missing observation.")
+    order = np.argsort(stamps, kind='stable')
+    return stamps[order], values[order]
+
+
+def _future(stamps: np.ndarray, periods: int, step_ns: int) -> np.ndarray:
+    if periods < 1:
+        raise ValueError(f"periods must be at least 1; received {periods}.")
+    return stamps[-1] + step_ns * np.arange(1, periods + 1, dtype=np.int64)
+
+
+def seasonal_naive_forecast(
+    df: pd.DataFrame,
+    periods: int = 24,
+    include_uncertainty: bool = True,
+    step: Optional[pd.Timedelta] = None,
+    season: Optional[pd.Timedelta] = None,
+) -> HorizonForecast:
+    """
+    Repeat the value observed one season (default: one day) earlier.
+
+    Works on irregular history: lagged values are read by interpolation.
+    Intervals use the spread of season-over-season differences, widening
+    with the number of seasons projected.
+
+    Args:
+        df: DataFrame with 'ds' and 'y' columns
+        periods: Number of future steps
+        include_uncertainty: Compute yhat_lower/yhat_upper
+        step: Spacing of future timestamps (default: 1 hour, as Prophet)
+        season: Season length (default: 1 day)
+    """
+    stamps, values = _sorted_history(df)
+    step_ns = _HOUR_NS if step is None else int(pd.Timedelta(step).value)
+    season_ns = _DAY_NS if season is None else int(pd.Timedelta(season).value)
+    future = _future(stamps, periods, step_ns)
+
+    if stamps[-1] - stamps[0] < season_ns:
+        # Less than one season of history: carry the last value forward
+        seasons = np.ones(periods)
+        yhat = np.full(periods, values[-1])
+        residuals = np.diff(values)
+    else:
+        seasons = np.ceil((future - stamps[-1]) / season_ns)
+        yhat = np.interp(future - seasons * season_ns, stamps, values)
+        lagged = stamps >= stamps[0] + season_ns
+        residuals = values[lagged] - np.interp(stamps[lagged] - season_ns, stamps, values)
+
+    forecast = HorizonForecast(ds=future.view('datetime64[ns]'), yhat=yhat)
+    if include_uncertainty:
+        sigma = float(np.std(residuals)) if residuals.size else 0.0
+        width = _Z_95 * sigma * np.sqrt(seasons)
+        forecast.yhat_lower, forecast.yhat_upper = yhat - width, yhat + width
+    return forecast
+
+
+def exponential_smoothing_forecast(
+    df: pd.DataFrame,
+    periods: int = 24,
+    include_uncertainty: bool = True,
+    step: Optional[pd.Timedelta] = None,
+    alpha: float = 0.3,
+) -> HorizonForecast:
+    """
+    Flat simple-exponential-smoothing forecast.
+
+    The level is the closed-form weighted sum alpha * (1 - alpha)^j over the
+    recent observations (one dot product, no recursion); weights below 1e-6
+    are folded into the oldest observation used.
+
+    Args:
+        df: DataFrame with 'ds' and 'y' columns
+        periods: Number of future steps
+        include_uncertainty: Compute yhat_lower/yhat_upper
+        step: Spacing of future timestamps (default: 1 hour, as Prophet)
+        alpha: Smoothing factor in (0, 1]
+    """
+    if not 0.0 < alpha <= 1.0:
+        raise ValueError(f"alpha must be in (0, 1]; received {alpha}.")
+    stamps, values = _sorted_history(df)
+    step_ns = _HOUR_NS if step is None else int(pd.Timedelta(step).value)
+    future = _future(stamps, periods, step_ns)
+
+    window = len(values) if alpha == 1.0 else min(len(values), math.ceil(math.log(1e-6) / math.log(1.0 - alpha)))
+    weights = alpha * (1.0 - alpha) ** np.arange(window)
+    weights[-1] += 1.0 - weights.sum()
+    level = float(np.dot(weights, values[::-1][:window]))
+
+    yhat = np.full(periods, level)
+    forecast = HorizonForecast(ds=future.view('datetime64[ns]'), yhat=yhat)
+    if include_uncertainty:
+        sigma = float(np.std(np.diff(values))) if len(values) > 1 else 0.0
+        width = _Z_95 * sigma * np.sqrt(1.0 + alpha ** 2 * np.arange(periods))
+        forecast.yhat_lower, forecast.yhat_upper = yhat - width, yhat + width
+    return forecast
+
+
+def fallback_forecast(
+    df: pd.DataFrame,
+    periods: int,
+    include_uncertainty: bool = True,
+    model: str = 'seasonal_naive',
+    step: Optional[pd.Timedelta] = None,
+) -> HorizonForecast:
+    """Forecast with one of FALLBACK_MODELS"""
+    if model == 'seasonal_naive':
+        return seasonal_naive_forecast(df, periods, include_uncertainty, step)
+    if model == 'exp_smoothing':
+        return exponential_smoothing_forecast(df, periods, include_uncertainty, step)
+    raise ValueError(f"Unknown fallback model {model!r}; expected one of {list(FALLBACK_MODELS)}.")
+
+
+def forecast_with_deadline(
+    primary: Callable[[], HorizonForecast],
+    fallback: Callable[[], HorizonForecast],
+    deadline_ms: float,
+) -> Tuple[HorizonForecast, bool]:
+    """
+    Run `primary` on a worker thread and `fallback` here, concurrently.
+
+    A primary that misses the deadline keeps running in the background if
+    it has started, so its fitted model still lands in the forecast caches
+    for the next call; one still queued is cancelled. When every pending
+    slot is taken the primary is not submitted at all. A primary that
+    fails is reported as an error rather than masked.
+
+    Returns:
+        (forecast, True if the primary produced it)
+    """
+    started = time.perf_counter()
+    executor, pending = _deadline_executor()
+    if not pending.acquire(blocking=False):
+        # Saturated: another queued fit would only finish after its deadline
+        return fallback(), False
+    try:
+        future = executor.submit(primary)
+    except BaseException:
+        pending.release()
+        raise
+    # Runs on completion, failure and cancellation alike
+    future.add_done_callback(lambda _: pending.release())
+    backup = fallback()
+    remaining = deadline_ms / 1000.0 - (time.perf_counter() - started)
+    try:
+        return future.result(timeout=max(remaining, 0.0)), True
+    except FutureTimeoutError:
+        future.cancel()
+        return backup, False
+
+
+__all__ = [
+    'FALLBACK_MODELS',
+    'seasonal_naive_forecast',
+    'exponential_smoothing_forecast',
+    'fallback_forecast',
+    'forecast_with_deadline',
+]
@@ -0,0 +1,43 @@
+"""
+Forecast result containers shared by all forecasting backends
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+@dataclass
+class HorizonForecast:
+    """
+    Future-only forecast trajectory as compact arrays.
+    Interval arrays are None when uncertainty sampling was skipped.
+    """
+    ds: np.ndarray
+    yhat: np.ndarray
+    yhat_lower: Optional[np.ndarray] = None
+    yhat_upper: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.yhat)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly trajectory (ISO timestamps, float lists)"""
+        trajectory = {
+            'ds': [pd.Timestamp(t).isoformat() for t in self.ds],
+            'yhat': self.yhat.tolist(),
+        }
+        if self.yhat_lower is not None:
+            trajectory['yhat_lower'] = self.yhat_lower.tolist()
+            trajectory['yhat_upper'] = self.yhat_upper.tolist()
+        return trajectory
+
+
+__all__ = ['HorizonForecast']
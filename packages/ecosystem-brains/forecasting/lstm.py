@@ -0,0 +1,418 @@
+"""
+LSTM forecasting backend
+Kept in its own module so torch is only imported when the LSTM backend is used.
+
+LSTMPipeline wraps LSTMForecaster with a strided window dataset, mini-batch
+CPU training, checkpoints and a TorchScript (optionally int8-quantized)
+inference path that scores many series in one batched forward pass.
+"""
+
+from __future__ import annotations
+
+import copy
+import functools
+import os
+import warnings
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+from numpy.lib.stride_tricks import sliding_window_view
+
+from lazy_imports import lazy_import
+from .horizon import HorizonForecast
+
+pd = lazy_import('pandas')
+
+# Two-sided 80% interval, matching Prophet's default interval_width
+_Z_80 = 1.2815515655446004
+_CHECKPOINT_FORMAT = 1
+
+
+class LSTMForecaster(nn.Module):
+    """
+    LSTM model template for time-series forecasting.
+    Used by: Solar (#12), Hydro (#13), AWG (#9)
+    """
+
+    def __init__(self, input_size: int = 1, hidden_size: int = 50, num_layers: int = 2, output_size: int = 1):
+        super(LSTMForecaster, self).__init__()
+        self.hidden_size = hidden_size
+        self.num_layers = num_layers
+
+        self.lstm = nn.LSTM(input_size, hidden_size, num_layers, batch_first=True)
+        self.fc = nn.Linear(hidden_size, output_size)
+
+    def forward(self, x):
+        h0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size).to(x.device)
+        c0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size).to(x.device)
+
+        out, _ = self.lstm(x, (h0, c0))
+        out = self.fc(out[:, -1, :])
+        return out
+
+
+def make_windows(values: np.ndarray, window: int, horizon: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Supervised (input, target) windows over a 1-D series without copying.
+
+    Args:
+        values: 1-D series
+        window: Input steps per sample
+        horizon: Target steps per sample
+
+    Returns:
+        Read-only views of shape (n, window) and (n, horizon)
+    """
+    view = sliding_window_view(np.asarray(values), window + horizon)
+    return view[:, :window], view[:, window:]
+
+
+class WindowDataset:
+    """
+    Windows across many series, backed by one flat float32 buffer.
+    Samples are rows of a strided view; only the rows of a mini-batch are copied.
+    """
+
+    def __init__(self, series: Sequence[np.ndarray], window: int, horizon: int):
+        lengths = np.array([len(s) for s in series], dtype=np.int64)
+        span = window + horizon
+        self.buffer = np.concatenate([np.asarray(s, dtype=np.float32) for s in series]) if len(series) else np.empty(0, np.float32)
+        self.view = sliding_window_view(self.buffer, span) if len(self.buffer) >= span else np.empty((0, span), np.float32)
+        # Valid window starts never cross a series boundary
+        offsets = np.cumsum(lengths) - lengths
+        counts = np.maximum(lengths - span + 1, 0)
+        self.starts = np.concatenate([offset + np.arange(count) for offset, count in zip(offsets, counts)] or [np.empty(0, np.int64)])
+        self.window = window
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def batch(self, index: np.ndarray) -> Tuple[torch.Tensor, torch.Tensor]:
+        rows = self.view[self.starts[index]]
+        return torch.from_numpy(rows[:, :self.window, None].copy()), torch.from_numpy(rows[:, self.window:].copy())
+
+
+@contextmanager
+def torch_threads(num_threads: Optional[int]) -> Iterator[None]:
+    """Temporarily cap torch's intra-op CPU threads"""
+    if not num_threads:
+        yield
+        return
+    previous = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+
+
+def _normalize(values: np.ndarray) -> Tuple[np.ndarray, float, float]:
+    mean = float(np.mean(values))
+    scale = float(np.std(values)) or 1.0
+    return (values - mean) / scale, mean, scale
+
+
+class LSTMPipeline:
+    """
+    Train-and-serve wrapper around LSTMForecaster.
+    One model is shared across series; every series is z-normalised with its
+    own history so a single checkpoint scores devices of any scale.
+    Same fit/predict_horizon surface as ProphetForecaster.
+    """
+
+    def __init__(
+        self,
+        window: int = 48,
+        horizon: int = 24,
+        hidden_size: int = 32,
+        num_layers: int = 1,
+        epochs: int = 20,
+        batch_size: int = 128,
+        learning_rate: float = 5e-3,
+        num_threads: Optional[int] = None,
+        seed: int = 0,
+    ):
+        self.window = window
+        self.horizon = horizon
+        self.hidden_size = hidden_size
+        self.num_layers = num_layers
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.learning_rate = learning_rate
+        self.num_threads = num_threads
+        self.seed = seed
+        self.model: Optional[LSTMForecaster] = None
+        self.residual_std = np.ones(horizon)
+        self.loss_history: List[float] = []
+        self.fitted = False
+        self._inference: Optional[Any] = None
+        self._history: Optional[pd.DataFrame] = None
+
+    def config(self) -> Dict[str, Any]:
+        return {
+            'window': self.window,
+            'horizon': self.horizon,
+            'hidden_size': self.hidden_size,
+            'num_layers': self.num_layers,
+            'epochs': self.epochs,
+            'batch_size': self.batch_size,
+            'learning_rate': self.learning_rate,
+            'num_threads': self.num_threads,
+            'seed': self.seed,
+        }
+
+    def _build_model(self) -> LSTMForecaster:
+        torch.manual_seed(self.seed)
+        return LSTMForecaster(1, self.hidden_size, self.num_layers, self.horizon)
+
+    def fit(self, df: pd.DataFrame, checkpoint_path: Optional[str] = None):
+        """
+        Train on one series and keep it as the history for predict_horizon().
+
+        Args:
+            df: DataFrame with 'ds' (timestamp) and 'y' (value) columns
+            checkpoint_path: Save a checkpoint here after every epoch
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("LSTMPipeline.fit expected a pandas DataFrame as 'df'.")
+        missing = {'ds', 'y'}.difference(df.columns)
+        if missing:
+            raise ValueError(f"LSTMPipeline.fit requires DataFrame columns ['ds', 'y'], but missing {sorted(missing)}.")
+        if len(df) < 4:
+            raise ValueError(f"LSTMPipeline.fit requires at least 4 rows of historical data; received {len(df)}.")
+
+        self.fit_many([df['y'].to_numpy(dtype=np.float64)], checkpoint_path=checkpoint_path)
+        self._bind(df)
+
+    def fit_many(
+        self,
+        series: Sequence[np.ndarray],
+        checkpoint_path: Optional[str] = None,
+        resume: bool = False,
+    ):
+        """
+        Train one shared model on many series with mini-batch Adam on CPU.
+        Window and horizon shrink to fit when the longest series is short.
+
+        Args:
+            series: 1-D value arrays, one per device
+            checkpoint_path: Save a checkpoint here after every epoch
+            resume: Continue from checkpoint_path if it exists
+        """
+        normalized = [_normalize(np.asarray(s, dtype=np.float64))[0] for s in series]
+        longest = max((len(s) for s in normalized), default=0)
+        if not resume and longest >= 4:
+            self.window = min(self.window, longest // 2)
+            self.horizon = min(self.horizon, longest - self.window)
+        dataset = WindowDataset(normalized, self.window, self.horizon)
+        if len(dataset) == 0:
+            raise ValueError(
+                f"No training windows: every series is shorter than window + horizon ({self.window + self.horizon})."
+            )
+
+        start_epoch = 0
+        self.model = self._build_model()
+        optimizer = torch.optim.Adam(self.model.parameters(), lr=self.learning_rate)
+        if resume and checkpoint_path and os.path.exists(checkpoint_path):
+            checkpoint = torch.load(checkpoint_path, weights_only=True)
+            self.model.load_state_dict(checkpoint['state_dict'])
+            optimizer.load_state_dict(checkpoint['optimizer'])
+            self.loss_history = list(checkpoint['loss_history'])
+            start_epoch = checkpoint['epoch']
+
+        loss_fn = nn.MSELoss()
+        rng = np.random.default_rng(self.seed + start_epoch)
+        with torch_threads(self.num_threads):
+            self.model.train()
+            for epoch in range(start_epoch, self.epochs):
+                order = rng.permutation(len(dataset))
+                total = 0.0
+                for begin in range(0, len(order), self.batch_size):
+                    x, y = dataset.batch(order[begin:begin + self.batch_size])
+                    optimizer.zero_grad()
+                    loss = loss_fn(self.model(x), y)
+                    loss.backward()
+                    optimizer.step()
+                    total += loss.item() * len(y)
+                self.loss_history.append(total / len(dataset))
+                if checkpoint_path:
+                    self.save(checkpoint_path, optimizer=optimizer, epoch=epoch + 1)
+
+            self.model.eval()
+            self.residual_std = self._residual_std(dataset)
+
+        self._inference = None
+        self.fitted = True
+
+    def _residual_std(self, dataset: WindowDataset) -> np.ndarray:
+        """Per-step in-sample error spread (normalised units) for prediction intervals"""
+        squared = np.zeros(self.horizon)
+        with torch.inference_mode():
+            for begin in range(0, len(dataset), 4096):
+                x, y = dataset.batch(np.arange(begin, min(begin + 4096, len(dataset))))
+                squared += ((self.model(x) - y) ** 2).sum(dim=0).numpy()
+        return np.sqrt(squared / len(dataset))
+
+    def compile(self, quantize: bool = False) -> 'LSTMPipeline':
+        """
+        Build the inference module: TorchScript, optionally with dynamic int8
+        quantization of the LSTM/Linear weights. Quantization shrinks the model
+        ~4x but only speeds up larger hidden sizes; measure before enabling.
+        """
+        if not self.fitted:
+            raise ValueError("Model must be fitted before compile")
+        module = self.model.eval()
+        if quantize:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                module = torch.ao.quantization.quantize_dynamic(module, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self._inference = torch.jit.script(module)
+        return self
+
+    def _forward(self, x: torch.Tensor) -> torch.Tensor:
+        module = self._inference if self._inference is not None else self.model
+        return module(x)
+
+    def predict_many(self, histories: Sequence[np.ndarray], periods: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score many series in one batched forward pass per `horizon` steps.
+
+        Args:
+            histories: 1-D value arrays, one per series (any length >= 1)
+            periods: Future steps to forecast; beyond `horizon` the model is
+                fed its own predictions
+
+        Returns:
+            yhat of shape (n_series, periods) and per-series scale (n_series,)
+        """
+        if not self.fitted:
+            raise ValueError("Model must be fitted before prediction")
+        if periods < 1:
+            raise ValueError(f"periods must be at least 1; received {periods}.")
+
+        windows = np.empty((len(histories), self.window), dtype=np.float32)
+        means = np.empty(len(histories))
+        scales = np.empty(len(histories))
+        for i, history in enumerate(histories):
+            normalized, means[i], scales[i] = _normalize(np.asarray(history, dtype=np.float64))
+            tail = normalized[-self.window:]
+            # Left-pad short histories with their first value
+            windows[i, :self.window - len(tail)] = tail[0]
+            windows[i, self.window - len(tail):] = tail
+
+        steps = []
+        produced = 0
+        with torch_threads(self.num_threads), torch.inference_mode():
+            x = torch.from_numpy(windows)
+            while produced < periods:
+                out = self._forward(x[:, :, None])
+                steps.append(out.numpy())
+                produced += out.shape[1]
+                x = torch.cat([x, out], dim=1)[:, -self.window:]
+        yhat = np.concatenate(steps, axis=1)[:, :periods]
+        return yhat * scales[:, None] + means[:, None], scales
+
+    def predict_horizon_many(
+        self,
+        frames: Sequence[pd.DataFrame],
+        periods: int = 24,
+        include_uncertainty: bool = True,
+        step: Optional[pd.Timedelta] = None,
+    ) -> List[HorizonForecast]:
+        """Future-only forecasts for many ds/y frames from one batched pass"""
+        step = pd.Timedelta(hours=1) if step is None else step
+        yhat, scales = self.predict_many([f['y'].to_numpy(dtype=np.float64) for f in frames], periods)
+        offsets = pd.to_timedelta(np.arange(1, periods + 1) * pd.Timedelta(step).value, unit='ns')
+        spread = None
+        if include_uncertainty:
+            # Past the trained horizon the error keeps growing like a random walk
+            extra = np.arange(1, max(periods - self.horizon, 0) + 1)
+            spread = np.concatenate([self.residual_std, self.residual_std[-1] * np.sqrt(1.0 + extra)])[:periods]
+        forecasts = []
+        for i, frame in enumerate(frames):
+            ds = (pd.Timestamp(frame['ds'].iloc[-1]) + offsets).to_numpy()
+            if spread is None:
+                forecasts.append(HorizonForecast(ds=ds, yhat=yhat[i]))
+                continue
+            half_width = _Z_80 * spread * scales[i]
+            forecasts.append(HorizonForecast(ds=ds, yhat=yhat[i], yhat_lower=yhat[i] - half_width, yhat_upper=yhat[i] + half_width))
+        return forecasts
+
+    def _bind(self, df: pd.DataFrame):
+        self._history = df[['ds', 'y']].reset_index(drop=True)
+
+    def with_history(self, df: pd.DataFrame) -> 'LSTMPipeline':
+        """Shallow copy that shares the trained model but forecasts from `df`"""
+        bound = copy.copy(self)
+        bound._bind(df)
+        return bound
+
+    def predict_horizon(
+        self,
+        periods: int = 24,
+        include_uncertainty: bool = True,
+        step: Optional[pd.Timedelta] = None,
+    ) -> HorizonForecast:
+        """
+        Forecast the future rows after the bound history.
+
+        Args:
+            periods: Number of future steps to forecast
+            include_uncertainty: Compute 80% yhat_lower/yhat_upper intervals
+            step: Spacing between future timestamps (default: 1 hour)
+        """
+        if self._history is None:
+            raise ValueError("No history bound; call fit() or with_history() first")
+        return self.predict_horizon_many([self._history], periods, include_uncertainty, step)[0]
+
+    def save(self, path: str, optimizer: Optional[torch.optim.Optimizer] = None, epoch: Optional[int] = None):
+        """Write a checkpoint (weights, config, interval stats) atomically"""
+        checkpoint = {
+            'format': _CHECKPOINT_FORMAT,
+            'config': self.config(),
+            'state_dict': self.model.state_dict(),
+            'residual_std': self.residual_std.tolist(),
+            'loss_history': list(self.loss_history),
+            'epoch': self.epochs if epoch is None else epoch,
+        }
+        if optimizer is not None:
+            checkpoint['optimizer'] = optimizer.state_dict()
+        tmp_path = f'{path}.tmp'
+        torch.save(checkpoint, tmp_path)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'LSTMPipeline':
+        """Restore a fitted pipeline from a checkpoint written by save()"""
+        checkpoint = torch.load(path, weights_only=True)
+        if checkpoint.get('format') != _CHECKPOINT_FORMAT:
+            raise ValueError(f"Unsupported LSTM checkpoint format in {path}")
+        pipeline = cls(**checkpoint['config'])
+        pipeline.model = pipeline._build_model()
+        pipeline.model.load_state_dict(checkpoint['state_dict'])
+        pipeline.model.eval()
+        pipeline.residual_std = np.asarray(checkpoint['residual_std'])
+        pipeline.loss_history = list(checkpoint['loss_history'])
+        pipeline.fitted = True
+        return pipeline
+
+
+@functools.lru_cache(maxsize=4)
+def load_compiled(path: str, quantize: bool = False) -> LSTMPipeline:
+    """Load and compile a checkpoint once per process"""
+    return LSTMPipeline.load(path).compile(quantize=quantize)
+
+
+__all__ = [
+    'LSTMForecaster',
+    'LSTMPipeline',
+    'WindowDataset',
+    'make_windows',
+    'torch_threads',
+    'load_compiled',
+]
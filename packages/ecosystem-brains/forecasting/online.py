@@ -0,0 +1,269 @@
+"""
+Online forecasting backend - additive Holt-Winters with O(1) updates
+New observations update level/trend/season in place instead of refitting,
+and the whole per-series state serializes to a few hundred bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from .horizon import HorizonForecast
+
+pd = lazy_import('pandas')
+
+# Two-sided 80% interval, matching Prophet's default interval_width
+_Z_80 = 1.2815515655446004
+# Weight of the newest one-step error in the running residual variance
+_RESIDUAL_DECAY = 0.05
+_HOUR_NS = 3_600_000_000_000
+
+_STATE_HEADER = struct.Struct('<4sBHddddddqqqq')
+_STATE_MAGIC = b'HWS1'
+
+
+@dataclass
+class HoltWintersState:
+    """Complete, serializable state of one online series"""
+    alpha: float
+    beta: float
+    gamma: float
+    level: float
+    trend: float
+    seasonal: List[float]
+    position: int = 0
+    residual_var: float = 0.0
+    n_obs: int = 0
+    last_ds: Optional[int] = None  # epoch nanoseconds
+    step_ns: int = _HOUR_NS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'alpha': self.alpha,
+            'beta': self.beta,
+            'gamma': self.gamma,
+            'level': self.level,
+            'trend': self.trend,
+            'seasonal': list(self.seasonal),
+            'position': self.position,
+            'residual_var': self.residual_var,
+            'n_obs': self.n_obs,
+            'last_ds': self.last_ds,
+            'step_ns': self.step_ns,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'HoltWintersState':
+        return cls(**{**data, 'seasonal': [float(v) for v in data['seasonal']]})
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form: fixed header + float64 seasonal factors"""
+        header = _STATE_HEADER.pack(
+            _STATE_MAGIC, 1, len(self.seasonal),
+            self.alpha, self.beta, self.gamma, self.level, self.trend, self.residual_var,
+            self.position, self.n_obs, -1 if self.last_ds is None else self.last_ds, self.step_ns,
+        )
+        return header + np.asarray(self.seasonal, dtype='<f8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> 'HoltWintersState':
+        (magic, _version, season_length, alpha, beta, gamma, level, trend, residual_var,
+         position, n_obs, last_ds, step_ns) = _STATE_HEADER.unpack_from(payload)
+        if magic != _STATE_MAGIC:
+            raise ValueError("Not a Holt-Winters state payload")
+        seasonal = np.frombuffer(payload, dtype='<f8', count=season_length, offset=_STATE_HEADER.size)
+        return cls(
+            alpha=alpha, beta=beta, gamma=gamma, level=level, trend=trend,
+            seasonal=seasonal.tolist(), position=position, residual_var=residual_var,
+            n_obs=n_obs, last_ds=None if last_ds < 0 else last_ds, step_ns=step_ns,
+        )
+
+
+class OnlineForecaster:
+    """
+    Additive Holt-Winters forecaster with constant-time updates.
+    Same fit/predict surface as ProphetForecaster; used by the forecast_*
+    helpers with method='online'.
+    """
+
+    def __init__(
+        self,
+        season_length: int = 24,
+        alpha: float = 0.3,
+        beta: float = 0.02,
+        gamma: float = 0.15,
+    ):
+        if season_length < 1:
+            raise ValueError("season_length must be at least 1")
+        self.season_length = season_length
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.state: Optional[HoltWintersState] = None
+        self.fitted = False
+
+    @classmethod
+    def from_state(cls, state: HoltWintersState) -> 'OnlineForecaster':
+        forecaster = cls(len(state.seasonal), state.alpha, state.beta, state.gamma)
+        forecaster.state = state
+        forecaster.fitted = True
+        return forecaster
+
+    def fit(self, df: pd.DataFrame):
+        """
+        Initialise state from history, then replay it through update().
+
+        Args:
+            df: DataFrame with 'ds' (timestamp) and 'y' (value) columns
+        """
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError("OnlineForecaster.fit expected a pandas DataFrame as 'df'.")
+        missing = {'ds', 'y'}.difference(df.columns)
+        if missing:
+            raise ValueError(f"OnlineForecaster.fit requires DataFrame columns ['ds', 'y'], but missing {sorted(missing)}.")
+        if len(df) < 2:
+            raise ValueError(f"OnlineForecaster.fit requires at least 2 rows of historical data; received {len(df)}.")
+
+        stamps = pd.to_datetime(df['ds']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        values = df['y'].to_numpy(dtype=np.float64)
+        order = np.argsort(stamps, kind='stable')
+        stamps, values = stamps[order], values[order]
+
+        m = self.season_length
+        if len(values) >= 2 * m:
+            first, second = values[:m].mean(), values[m:2 * m].mean()
+            level, trend = float(first), float((second - first) / m)
+            seasonal = (values[:m] - first).tolist()
+        else:
+            # Too short for a seasonal estimate: start flat and let gamma learn it
+            level, trend = float(values[0]), float(values[1] - values[0])
+            seasonal = [0.0] * m
+
+        diffs = np.diff(stamps)
+        step_ns = int(np.median(diffs)) if diffs.size and np.median(diffs) > 0 else _HOUR_NS
+        self.state = HoltWintersState(
+            alpha=self.alpha, beta=self.beta, gamma=self.gamma,
+            level=level - trend, trend=trend, seasonal=seasonal, step_ns=step_ns,
+        )
+        self.fitted = True
+        self.update_many(values, stamps)
+
+    def update(self, y: float, ds: Optional[int] = None) -> float:
+        """
+        Fold one observation into the state in O(1).
+
+        Args:
+            y: Observed value
+            ds: Observation time in epoch nanoseconds (optional)
+
+        Returns:
+            One-step-ahead forecast error for this observation
+        """
+        if not self.fitted:
+            raise ValueError("Model must be fitted before update")
+        st = self.state
+        m = len(st.seasonal)
+        s = st.seasonal[st.position]
+        error = y - (st.level + st.trend + s)
+        level = st.alpha * (y - s) + (1.0 - st.alpha) * (st.level + st.trend)
+        st.trend = st.beta * (level - st.level) + (1.0 - st.beta) * st.trend
+        st.level = level
+        st.seasonal[st.position] = st.gamma * (y - level) + (1.0 - st.gamma) * s
+        st.position = (st.position + 1) % m
+        st.residual_var = error * error if st.n_obs == 0 else (
+            (1.0 - _RESIDUAL_DECAY) * st.residual_var + _RESIDUAL_DECAY * error * error
+        )
+        st.n_obs += 1
+        if ds is not None:
+            st.last_ds = int(ds)
+        return error
+
+    def update_many(self, values: Sequence[float], stamps: Optional[Sequence[int]] = None):
+        """Fold a sequence of observations; stamps older than the last seen are skipped"""
+        last = self.state.last_ds
+        if stamps is None:
+            for y in values:
+                self.update(float(y))
+            return
+        for y, ds in zip(values, stamps):
+            ds = int(ds)
+            if last is not None and ds <= last:
+                continue
+            self.update(float(y), ds)
+            last = ds
+
+    def with_history(self, df: pd.DataFrame) -> 'OnlineForecaster':
+        """Copy whose state has also folded in the rows of `df` newer than the last seen"""
+        bound = OnlineForecaster.from_state(HoltWintersState.from_dict(self.state.to_dict()))
+        stamps = pd.to_datetime(df['ds']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        order = np.argsort(stamps, kind='stable')
+        bound.update_many(df['y'].to_numpy(dtype=np.float64)[order], stamps[order])
+        return bound
+
+    def predict_horizon(
+        self,
+        periods: int = 24,
+        include_uncertainty: bool = True,
+        step: Optional[pd.Timedelta] = None,
+    ) -> HorizonForecast:
+        """
+        Vectorised h-step forecast from the current state.
+
+        Args:
+            periods: Number of future steps to forecast
+            include_uncertainty: Compute 80% yhat_lower/yhat_upper intervals
+            step: Spacing between future timestamps (default: observed spacing)
+        """
+        if not self.fitted:
+            raise ValueError("Model must be fitted before prediction")
+        if periods < 1:
+            raise ValueError(f"periods must be at least 1; received {periods}.")
+
+        st = self.state
+        h = np.arange(1, periods + 1)
+        seasonal = np.asarray(st.seasonal, dtype=np.float64)
+        yhat = st.level + h * st.trend + seasonal[(st.position + h - 1) % len(seasonal)]
+
+        step_ns = st.step_ns if step is None else int(pd.Timedelta(step).value)
+        origin = st.last_ds if st.last_ds is not None else 0
+        ds = (origin + h * step_ns).astype('datetime64[ns]')
+
+        if not include_uncertainty:
+            return HorizonForecast(ds=ds, yhat=yhat)
+        # Additive HW variance: sigma^2 * (1 + sum_{j<h} (alpha * (1 + j * beta))^2)
+        j = np.arange(periods, dtype=np.float64)
+        growth = np.cumsum(np.where(j == 0, 0.0, (st.alpha * (1.0 + j * st.beta)) ** 2))
+        half_width = _Z_80 * math.sqrt(st.residual_var) * np.sqrt(1.0 + growth)
+        return HorizonForecast(ds=ds, yhat=yhat, yhat_lower=yhat - half_width, yhat_upper=yhat + half_width)
+
+    def predict(self, periods: int = 24) -> pd.DataFrame:
+        """
+        Generate forecast for future periods.
+
+        Returns:
+            DataFrame with ds, yhat, yhat_lower, yhat_upper for the future rows
+        """
+        forecast = self.predict_horizon(periods)
+        return pd.DataFrame({
+            'ds': forecast.ds,
+            'yhat': forecast.yhat,
+            'yhat_lower': forecast.yhat_lower,
+            'yhat_upper': forecast.yhat_upper,
+        })
+
+    def to_json(self) -> str:
+        return json.dumps(self.state.to_dict())
+
+    @classmethod
+    def from_json(cls, payload: str) -> 'OnlineForecaster':
+        return cls.from_state(HoltWintersState.from_dict(json.loads(payload)))
+
+
+__all__ = ['HoltWintersState', 'OnlineForecaster']
@@ -0,0 +1,173 @@
+"""
+History resampling before fitting
+Minute-level or irregular sensor histories are bucketed (mean/max/last with
+gap filling) and/or thinned with a shape-preserving LTTB downsampler, so fit
+cost is bounded by the bucket count instead of the sensor's reporting rate.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+AGGREGATIONS = ('mean', 'max', 'last')
+FILL_METHODS = ('linear', 'ffill', 'none')
+
+# Guard against a bucket width far below the history span (e.g. '1s' over years)
+_MAX_BUCKETS = 10_000_000
+
+ResampleSpec = Union[str, Dict[str, Any]]
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection, vectorised.
+
+    Classic LTTB anchors each bucket's triangle on the point picked in the
+    previous bucket, which forces a sequential loop. Here the anchor is the
+    previous bucket's mean, so every bucket is scored in one pass; the first
+    and last points are always kept.
+
+    Args:
+        x: Monotonic x values (e.g. epoch seconds)
+        y: Values
+        n_out: Number of points to keep (>= 3)
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError(f"lttb needs n_out >= 3; got {n_out}.")
+
+    # n_out - 2 buckets over the interior points 1 .. n-2
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], starts) / sizes
+    mean_y = np.add.reduceat(y[:n - 1], starts) / sizes
+
+    # Triangle anchors: previous bucket mean (first point) and next bucket mean (last point)
+    ax = np.concatenate(([x[0]], mean_x[:-1]))
+    ay = np.concatenate(([y[0]], mean_y[:-1]))
+    cx = np.concatenate((mean_x[1:], [x[-1]]))
+    cy = np.concatenate((mean_y[1:], [y[-1]]))
+
+    bucket = np.repeat(np.arange(len(starts)), sizes)
+    px, py = x[1:n - 1], y[1:n - 1]
+    area = np.abs((ax[bucket] - cx[bucket]) * (py - ay[bucket]) - (ax[bucket] - px) * (cy[bucket] - ay[bucket]))
+
+    # First index of each bucket's maximum area
+    best = np.maximum.reduceat(area, starts - 1)
+    hits = np.flatnonzero(area == best[bucket])
+    _, first = np.unique(bucket[hits], return_index=True)
+    return np.concatenate(([0], hits[first] + 1, [n - 1]))
+
+
+def resample_history(
+    df: pd.DataFrame,
+    bucket: Optional[str] = None,
+    agg: str = 'mean',
+    fill: str = 'linear',
+    max_points: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Bucket, gap-fill and/or downsample a ds/y history.
+
+    Args:
+        df: DataFrame with 'ds' and 'y' columns (any order, may contain NaN)
+        bucket: Bucket width as a pandas Timedelta string (e.g. '15min', '1h');
+            None skips bucketing. Buckets are aligned to the Unix epoch and
+            stamped with their start time.
+        agg: Per-bucket aggregation: 'mean', 'max' or 'last'
+        fill: Empty buckets: 'linear' (interpolate), 'ffill' or 'none' (drop)
+        max_points: Cap on rows returned, applied with LTTB after bucketing
+
+    Returns:
+        New ds/y DataFrame sorted by ds
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {agg!r}; expected one of {list(AGGREGATIONS)}.")
+    if fill not in FILL_METHODS:
+        raise ValueError(f"Unknown fill method {fill!r}; expected one of {list(FILL_METHODS)}.")
+
+    stamps = pd.to_datetime(df['ds']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+    values = df['y'].to_numpy(dtype=np.float64)
+    keep = ~np.isnan(values)
+    stamps, values = stamps[keep], values[keep]
+    order = np.argsort(stamps, kind='stable')
+    stamps, values = stamps[order], values[order]
+
+    if bucket is not None and stamps.size:
+        width = pd.Timedelta(bucket).value
+        if width <= 0:
+            raise ValueError(f"Bucket width must be positive; got {bucket!r}.")
+        ids = stamps // width
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(ids)) + 1))
+        if agg == 'mean':
+            values = np.add.reduceat(values, starts) / np.diff(np.append(starts, len(ids)))
+        elif agg == 'max':
+            values = np.maximum.reduceat(values, starts)
+        else:
+            values = values[np.append(starts[1:], len(ids)) - 1]
+        ids = ids[starts]
+
+        if fill != 'none':
+            span = int(ids[-1] - ids[0]) + 1
+            if span > _MAX_BUCKETS:
+                raise ValueError(
+                    f"Bucket {bucket!r} spans {span} buckets (limit {_MAX_BUCKETS}); use a wider bucket."
+                )
+            full = np.arange(ids[0], ids[-1] + 1)
+            if fill == 'linear':
+                values = np.interp(full, ids, values)
+            else:
+                values = values[np.searchsorted(ids, full, side='right') - 1]
+            ids = full
+        stamps = ids * width
+
+    if max_points is not None and len(stamps) > max_points:
+        picked = lttb((stamps - stamps[0]) / 1e9, values, max_points)
+        stamps, values = stamps[picked], values[picked]
+
+    return pd.DataFrame({'ds': stamps.view('datetime64[ns]'), 'y': values}, copy=False)
+
+
+def prepare_history(
+    df: pd.DataFrame,
+    resample: Optional[ResampleSpec],
+    method: Optional[str],
+) -> pd.DataFrame:
+    """
+    Apply a caller's resample spec, or the default row cap for Prophet fits.
+
+    Args:
+        df: ds/y history
+        resample: Bucket string (e.g. '1h') or resample_history keyword dict
+        method: Forecast backend being fitted (None for stored models); only
+            Prophet gets the implicit ECOS_FORECAST_MAX_ROWS cap, since
+            online/LSTM cost is linear in rows and they need even spacing
+
+    Returns:
+        History to fit on
+    """
+    if resample is not None:
+        spec = {'bucket': resample} if isinstance(resample, str) else dict(resample)
+        return resample_history(df, **spec)
+    max_rows = int(os.environ.get('ECOS_FORECAST_MAX_ROWS', '20000'))
+    if method == 'prophet' and 0 < max_rows < len(df):
+        return resample_history(df, max_points=max_rows)
+    return df
+
+
+__all__ = ['AGGREGATIONS', 'FILL_METHODS', 'lttb', 'resample_history', 'prepare_history']
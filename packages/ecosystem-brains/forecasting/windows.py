@@ -0,0 +1,121 @@
+"""
+Contiguous run-window extraction for AWG humidity forecasts
+Every above-threshold run in a forecast horizon becomes a window with its
+span, mean humidity and expected water yield, found by run-length encoding
+a boolean mask (one pass for a whole fleet of horizons).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Same production model as solvers.optimize_awg_schedule: liters/hour = humidity % * 0.1
+LITERS_PER_HUMIDITY_HOUR = 0.1
+
+
+def extract_run_windows_batch(
+    yhat: np.ndarray,
+    threshold: Union[float, np.ndarray] = 70.0,
+    min_duration: int = 1,
+    step_hours: float = 1.0,
+    liters_per_humidity_hour: float = LITERS_PER_HUMIDITY_HOUR,
+) -> Dict[str, np.ndarray]:
+    """
+    Find contiguous above-threshold runs in many forecast horizons at once.
+
+    Args:
+        yhat: (n_series, horizon) humidity forecasts (1-D is one series)
+        threshold: Humidity % a step must exceed; scalar or one per series
+        min_duration: Minimum run length in steps
+        step_hours: Hours per forecast step
+        liters_per_humidity_hour: Water yield per humidity % per running hour
+
+    Returns:
+        Flat arrays, one entry per window, ordered by series then start:
+        'series', 'start_index', 'end_index' (exclusive), 'mean_humidity',
+        'expected_liters'
+    """
+    yhat = np.atleast_2d(np.asarray(yhat, dtype=np.float64))
+    if min_duration < 1:
+        raise ValueError(f"min_duration must be at least 1; received {min_duration}.")
+    threshold = np.asarray(threshold, dtype=np.float64)
+    if threshold.ndim == 1:
+        threshold = threshold[:, None]
+    above = yhat > threshold
+
+    # Run edges: +1 where a run starts, -1 one past where it ends
+    padded = np.zeros((above.shape[0], above.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = above
+    edges = np.diff(padded, axis=1)
+    series, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+
+    keep = ends - starts >= min_duration
+    series, starts, ends = series[keep], starts[keep], ends[keep]
+
+    cumulative = np.zeros((yhat.shape[0], yhat.shape[1] + 1))
+    np.cumsum(yhat, axis=1, out=cumulative[:, 1:])
+    totals = cumulative[series, ends] - cumulative[series, starts]
+    return {
+        'series': series,
+        'start_index': starts,
+        'end_index': ends,
+        'mean_humidity': totals / (ends - starts),
+        'expected_liters': totals * step_hours * liters_per_humidity_hour,
+    }
+
+
+def extract_run_windows(
+    ds: np.ndarray,
+    yhat: np.ndarray,
+    threshold: float = 70.0,
+    min_duration: int = 1,
+    step: Optional[pd.Timedelta] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Contiguous above-threshold windows of one humidity forecast.
+
+    Args:
+        ds: Forecast timestamps (evenly spaced)
+        yhat: Forecast humidity %
+        threshold: Humidity % a step must exceed
+        min_duration: Minimum window length in steps
+        step: Step length (default: spacing of ds, else one hour)
+
+    Returns:
+        Windows with ISO 'start'/'end' (end exclusive), 'start_index'/
+        'end_index' into the horizon, 'hours', 'mean_humidity' and
+        'expected_liters'; the indices feed optimize_awg_schedule(run_windows=...)
+    """
+    ds = np.asarray(ds, dtype='datetime64[ns]')
+    if step is None:
+        step = pd.Timedelta(ds[1] - ds[0]) if len(ds) > 1 else pd.Timedelta(hours=1)
+    step_hours = pd.Timedelta(step) / pd.Timedelta(hours=1)
+    found = extract_run_windows_batch(yhat, threshold, min_duration, step_hours)
+
+    starts, ends = found['start_index'], found['end_index']
+    start_times = pd.DatetimeIndex(ds[starts])
+    end_times = pd.DatetimeIndex(ds[ends - 1]) + pd.Timedelta(step)
+    return [
+        {
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'start_index': int(i),
+            'end_index': int(j),
+            'hours': float((j - i) * step_hours),
+            'mean_humidity': float(mean),
+            'expected_liters': float(liters),
+        }
+        for start, end, i, j, mean, liters in zip(
+            start_times, end_times, starts, ends, found['mean_humidity'], found['expected_liters']
+        )
+    ]
+
+
+__all__ = ['LITERS_PER_HUMIDITY_HOUR', 'extract_run_windows', 'extract_run_windows_batch']
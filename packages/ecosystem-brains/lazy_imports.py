@@ -0,0 +1,94 @@
+"""
+Lazy Imports Module - Deferred loading of heavy ML/solver dependencies
+Keeps `import forecasting, solvers` cheap so services can come up before
+pandas / prophet / torch / ortools / pulp are paid for.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Third-party modules the brains import on first use, in preload order
+HEAVY_MODULES = (
+    'pandas',
+    'prophet',
+    'ortools.linear_solver.pywraplp',
+    'pulp',
+    'torch',
+)
+
+
+class LazyModule:
+    """
+    Proxy that imports the named module on first attribute access.
+    """
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self) -> ModuleType:
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<LazyModule {self.__dict__['_name']!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for module `name` that is imported on first use"""
+    return LazyModule(name)
+
+
+def loaded_modules(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, bool]:
+    """Which heavy dependencies are already imported in this process"""
+    return {name: name in sys.modules for name in modules}
+
+
+def preload(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, Optional[float]]:
+    """
+    Import heavy dependencies now.
+
+    Returns:
+        Import seconds per module (None when the module is not installed)
+    """
+    timings: Dict[str, Optional[float]] = {}
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            logger.warning("Preload skipped %s: not installed", name)
+            timings[name] = None
+            continue
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def preload_in_background(modules: Iterable[str] = HEAVY_MODULES) -> threading.Thread:
+    """Preload heavy dependencies on a daemon thread (e.g. after server start-up)"""
+    modules = tuple(modules)
+
+    def _run():
+        timings = preload(modules)
+        logger.info("Preloaded brain dependencies: %s", {k: round(v, 3) for k, v in timings.items() if v is not None})
+
+    thread = threading.Thread(target=_run, name='brains-preload', daemon=True)
+    thread.start()
+    return thread
+
+
+__all__ = ['HEAVY_MODULES', 'LazyModule', 'lazy_import', 'loaded_modules', 'preload', 'preload_in_background']
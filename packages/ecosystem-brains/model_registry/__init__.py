@@ -0,0 +1,9 @@
+"""
+Model Registry Module - Persistent, versioned forecaster artifacts
+Fitted Prophet/LSTM/online models outlive the process that trained them, so
+restarts and new workers serve predictions without refitting.
+"""
+
+from .store import BUCKET, ModelNotFound, ModelRef, ModelRegistry, default_registry
+
+__all__ = ['BUCKET', 'ModelNotFound', 'ModelRef', 'ModelRegistry', 'default_registry']
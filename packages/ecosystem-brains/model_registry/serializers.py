@@ -0,0 +1,116 @@
+"""
+Per-backend (de)serialization of fitted forecasters into registry artifacts.
+
+Each dumper returns (metadata, blobs, arrays): JSON-safe metadata for the
+manifest, opaque files, and NumPy arrays written as .npy so they can be
+memory-mapped on load.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+Artifacts = Tuple[Dict[str, Any], Dict[str, bytes], Dict[str, np.ndarray]]
+
+
+def model_type_of(model: Any) -> str:
+    """Registry model type ('prophet' | 'lstm' | 'online') for a fitted forecaster"""
+    name = type(model).__name__
+    types = {'ProphetForecaster': 'prophet', 'LSTMPipeline': 'lstm', 'OnlineForecaster': 'online'}
+    if name not in types:
+        raise TypeError(f"Cannot register a {name}; expected one of {sorted(types)}.")
+    if not getattr(model, 'fitted', False):
+        raise ValueError("Model must be fitted before it is registered")
+    return types[name]
+
+
+def _dump_prophet(forecaster: Any) -> Artifacts:
+    from prophet.serialize import model_to_json
+
+    metadata = {'seasonality_mode': forecaster.model.seasonality_mode}
+    return metadata, {'model.json': model_to_json(forecaster.model).encode()}, {}
+
+
+def _load_prophet(metadata: Dict[str, Any], read_blob: Callable[[str], bytes], arrays: Dict[str, np.ndarray]) -> Any:
+    from prophet.serialize import model_from_json
+    from forecasting import ProphetForecaster
+
+    forecaster = ProphetForecaster.__new__(ProphetForecaster)
+    forecaster.model = model_from_json(read_blob('model.json').decode())
+    forecaster.fitted = True
+    forecaster._origin = None
+    return forecaster
+
+
+def _dump_lstm(pipeline: Any) -> Artifacts:
+    arrays = {
+        f'weights/{name}': tensor.detach().cpu().numpy()
+        for name, tensor in pipeline.model.state_dict().items()
+    }
+    arrays['residual_std'] = np.asarray(pipeline.residual_std, dtype=np.float64)
+    metadata = {'config': pipeline.config(), 'loss_history': list(pipeline.loss_history)}
+    return metadata, {}, arrays
+
+
+def _load_lstm(metadata: Dict[str, Any], read_blob: Callable[[str], bytes], arrays: Dict[str, np.ndarray]) -> Any:
+    import torch
+    from forecasting.lstm import LSTMPipeline
+
+    pipeline = LSTMPipeline(**metadata['config'])
+    pipeline.model = pipeline._build_model()
+    # assign=True keeps the mmap-backed tensors instead of copying into fresh parameters
+    state_dict = {
+        name[len('weights/'):]: torch.from_numpy(array)
+        for name, array in arrays.items() if name.startswith('weights/')
+    }
+    pipeline.model.load_state_dict(state_dict, assign=True)
+    pipeline.model.eval()
+    pipeline.residual_std = np.asarray(arrays['residual_std'])
+    pipeline.loss_history = list(metadata.get('loss_history', []))
+    pipeline.fitted = True
+    return pipeline
+
+
+def _dump_online(forecaster: Any) -> Artifacts:
+    state = forecaster.state.to_dict()
+    seasonal = np.asarray(state.pop('seasonal'), dtype=np.float64)
+    return {'state': state}, {}, {'seasonal': seasonal}
+
+
+def _load_online(metadata: Dict[str, Any], read_blob: Callable[[str], bytes], arrays: Dict[str, np.ndarray]) -> Any:
+    from forecasting.online import HoltWintersState, OnlineForecaster
+
+    # Online state is mutated by updates, so it is copied out of the mapping
+    state = HoltWintersState.from_dict({**metadata['state'], 'seasonal': np.array(arrays['seasonal']).tolist()})
+    return OnlineForecaster.from_state(state)
+
+
+DUMPERS: Dict[str, Callable[[Any], Artifacts]] = {
+    'prophet': _dump_prophet,
+    'lstm': _dump_lstm,
+    'online': _dump_online,
+}
+
+LOADERS: Dict[str, Callable[..., Any]] = {
+    'prophet': _load_prophet,
+    'lstm': _load_lstm,
+    'online': _load_online,
+}
+
+
+def history_end(model: Any) -> Any:
+    """Last training timestamp as an ISO string, when the backend records one"""
+    history = getattr(getattr(model, 'model', None), 'history', None)
+    if history is None:
+        history = getattr(model, '_history', None)
+    if history is not None and len(history):
+        return history['ds'].iloc[-1].isoformat()
+    state = getattr(model, 'state', None)
+    if state is not None and state.last_ds is not None:
+        return np.datetime64(state.last_ds, 'ns').astype(str)
+    return None
+
+
+__all__ = ['DUMPERS', 'LOADERS', 'model_type_of', 'history_end']
@@ -0,0 +1,276 @@
+"""
+Versioned, file-backed store of fitted forecasters.
+
+Directory layout mirrors the `ecos-ml-models` MinIO bucket
+(config/minio/data-lake.yml), so a registry root can be mirrored to or from
+the bucket with `mc mirror` unchanged:
+
+    <root>/project=<project>/device=<device>/model=<type>/v<N>/
+        manifest.json       # metadata + file inventory (written last)
+        model.json          # opaque blobs (Prophet)
+        seasonal.npy        # arrays, memory-mapped on load
+        weights/*.npy
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from caching import LRUTTLCache
+from .serializers import DUMPERS, LOADERS, history_end, model_type_of
+
+BUCKET = 'ecos-ml-models'
+MANIFEST = 'manifest.json'
+MANIFEST_FORMAT = 1
+
+_VERSION_DIR = re.compile(r'^v(\d+)$')
+_SAFE_SEGMENT = re.compile(r'^[A-Za-z0-9_.\-]+$')
+
+
+class ModelNotFound(KeyError):
+    """No committed version matches the requested ref"""
+
+
+@dataclass(frozen=True)
+class ModelRef:
+    """Address of a stored model; version=None means the latest version"""
+    project: str
+    device: str
+    model_type: str
+    version: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _segment(value: str, name: str) -> str:
+    if not _SAFE_SEGMENT.match(value) or value in ('.', '..'):
+        raise ValueError(f"Invalid {name} {value!r}: use letters, digits, '_', '-' or '.'")
+    return value
+
+
+class ModelRegistry:
+    """
+    Save/load fitted Prophet, LSTM and online forecasters by
+    (project, device, model type) with immutable integer versions.
+    """
+
+    def __init__(self, root: str, cache_entries: int = 256):
+        self.root = os.path.abspath(root)
+        # Versions are immutable, so loaded models are cached by resolved ref
+        self._loaded = LRUTTLCache(max_entries=cache_entries, ttl_seconds=None)
+
+    def object_key(self, ref: ModelRef, filename: str = '') -> str:
+        """Bucket object key (relative path) for a file of a resolved ref"""
+        if ref.version is None:
+            raise ValueError("object_key needs a resolved ref (version set)")
+        parts = [
+            f"project={_segment(ref.project, 'project')}",
+            f"device={_segment(ref.device, 'device')}",
+            f"model={_segment(ref.model_type, 'model_type')}",
+            f'v{ref.version}',
+        ]
+        return '/'.join(parts + ([filename] if filename else []))
+
+    def _model_dir(self, project: str, device: str, model_type: str) -> str:
+        return os.path.join(
+            self.root,
+            f"project={_segment(project, 'project')}",
+            f"device={_segment(device, 'device')}",
+            f"model={_segment(model_type, 'model_type')}",
+        )
+
+    def _path(self, ref: ModelRef) -> str:
+        return os.path.join(self.root, *self.object_key(ref).split('/'))
+
+    def versions(self, project: str, device: str, model_type: str) -> List[int]:
+        """Committed versions (those with a manifest), oldest first"""
+        directory = self._model_dir(project, device, model_type)
+        if not os.path.isdir(directory):
+            return []
+        found = []
+        for name in os.listdir(directory):
+            match = _VERSION_DIR.match(name)
+            if match and os.path.exists(os.path.join(directory, name, MANIFEST)):
+                found.append(int(match.group(1)))
+        return sorted(found)
+
+    def resolve(self, ref: ModelRef) -> ModelRef:
+        """Pin version=None to the latest committed version"""
+        if ref.version is not None:
+            if not os.path.exists(os.path.join(self._path(ref), MANIFEST)):
+                raise ModelNotFound(f"No stored model {self.object_key(ref)}")
+            return ref
+        versions = self.versions(ref.project, ref.device, ref.model_type)
+        if not versions:
+            raise ModelNotFound(f"No stored {ref.model_type} model for project={ref.project} device={ref.device}")
+        return ModelRef(ref.project, ref.device, ref.model_type, versions[-1])
+
+    def list_models(self, project: Optional[str] = None) -> List[ModelRef]:
+        """Latest ref of every stored (project, device, model type)"""
+        refs = []
+        if project is not None:
+            projects = [f"project={_segment(project, 'project')}"]
+        else:
+            projects = sorted(os.listdir(self.root)) if os.path.isdir(self.root) else []
+        for project_dir in projects:
+            project_path = os.path.join(self.root, project_dir)
+            if not project_dir.startswith('project=') or not os.path.isdir(project_path):
+                continue
+            for device_dir in sorted(os.listdir(project_path)):
+                device_path = os.path.join(project_path, device_dir)
+                if not device_dir.startswith('device=') or not os.path.isdir(device_path):
+                    continue
+                for model_dir in sorted(os.listdir(device_path)):
+                    if not model_dir.startswith('model='):
+                        continue
+                    p, d, m = project_dir[8:], device_dir[7:], model_dir[6:]
+                    versions = self.versions(p, d, m)
+                    if versions:
+                        refs.append(ModelRef(p, d, m, versions[-1]))
+        return refs
+
+    def save(
+        self,
+        project: str,
+        device: str,
+        model: Any,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> ModelRef:
+        """
+        Store a fitted forecaster as the next version.
+
+        Files are written to a staging directory and renamed into place, so
+        readers never observe a partially written version.
+
+        Args:
+            project: Project code, e.g. 'P13'
+            device: Device/series id
+            model: Fitted ProphetForecaster, LSTMPipeline or OnlineForecaster
+            metadata: Extra JSON-safe fields recorded in the manifest
+
+        Returns:
+            Resolved ref of the new version
+        """
+        model_type = model_type_of(model)
+        model_meta, blobs, arrays = DUMPERS[model_type](model)
+        directory = self._model_dir(project, device, model_type)
+        os.makedirs(directory, exist_ok=True)
+
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=directory)
+        try:
+            files = {}
+            for name, payload in blobs.items():
+                self._write(staging, name, payload)
+                files[name] = {'kind': 'blob', 'bytes': len(payload)}
+            for name, array in arrays.items():
+                path = os.path.join(staging, *f'{name}.npy'.split('/'))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                np.save(path, np.ascontiguousarray(array), allow_pickle=False)
+                files[f'{name}.npy'] = {'kind': 'array', 'dtype': str(array.dtype), 'shape': list(array.shape)}
+
+            while True:
+                taken = [int(m.group(1)) for m in map(_VERSION_DIR.match, os.listdir(directory)) if m]
+                ref = ModelRef(project, device, model_type, max(taken, default=0) + 1)
+                manifest = {
+                    'format': MANIFEST_FORMAT,
+                    **ref.to_dict(),
+                    'created_at': datetime.now(timezone.utc).isoformat(),
+                    'history_end': history_end(model),
+                    'model': model_meta,
+                    'metadata': metadata or {},
+                    'files': files,
+                }
+                self._write(staging, MANIFEST, json.dumps(manifest, indent=2).encode())
+                try:
+                    os.rename(staging, self._path(ref))
+                except OSError:
+                    # Another writer took this version number; try the next one
+                    if os.path.exists(self._path(ref)):
+                        continue
+                    raise
+                return ref
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _write(directory: str, name: str, payload: bytes):
+        path = os.path.join(directory, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as handle:
+            handle.write(payload)
+
+    def manifest(self, ref: ModelRef) -> Dict[str, Any]:
+        ref = self.resolve(ref)
+        with open(os.path.join(self._path(ref), MANIFEST)) as handle:
+            return json.load(handle)
+
+    def load(self, ref: ModelRef, use_cache: bool = True) -> Any:
+        """
+        Load a stored forecaster without refitting.
+
+        Arrays are memory-mapped copy-on-write, so processes loading the same
+        version share one page-cache copy of the weights.
+        """
+        ref = self.resolve(ref)
+        if use_cache:
+            cached = self._loaded.get(ref)
+            if cached is not None:
+                return cached
+
+        path = self._path(ref)
+        manifest = self.manifest(ref)
+        if manifest.get('format') != MANIFEST_FORMAT:
+            raise ValueError(f"Unsupported manifest format in {self.object_key(ref)}")
+        arrays = {
+            name[:-len('.npy')]: np.load(os.path.join(path, *name.split('/')), mmap_mode='c', allow_pickle=False)
+            for name, info in manifest['files'].items() if info['kind'] == 'array'
+        }
+
+        def read_blob(name: str) -> bytes:
+            with open(os.path.join(path, *name.split('/')), 'rb') as handle:
+                return handle.read()
+
+        model = LOADERS[ref.model_type](manifest['model'], read_blob, arrays)
+        if use_cache:
+            self._loaded.put(ref, model)
+        return model
+
+    def delete(self, ref: ModelRef):
+        """Remove one stored version"""
+        ref = self.resolve(ref)
+        shutil.rmtree(self._path(ref))
+        self._loaded.pop(ref)
+
+    def prune(self, project: str, device: str, model_type: str, keep: int = 3) -> List[int]:
+        """Delete all but the newest `keep` versions; returns the deleted versions"""
+        versions = self.versions(project, device, model_type)
+        doomed = versions[:-keep] if keep > 0 else versions
+        for version in doomed:
+            self.delete(ModelRef(project, device, model_type, version))
+        return doomed
+
+
+_default_registry: Optional[ModelRegistry] = None
+
+
+def default_registry() -> ModelRegistry:
+    """Process-wide registry rooted at ECOS_MODEL_REGISTRY_DIR (default ./ecos-ml-models)"""
+    global _default_registry
+    root = os.path.abspath(os.environ.get('ECOS_MODEL_REGISTRY_DIR', BUCKET))
+    if _default_registry is None or _default_registry.root != root:
+        _default_registry = ModelRegistry(root)
+    return _default_registry
+
+
+__all__ = ['BUCKET', 'ModelNotFound', 'ModelRef', 'ModelRegistry', 'default_registry']
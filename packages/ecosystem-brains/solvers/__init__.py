@@ -1,17 +1,36 @@
 """
 Solvers Module - Shared optimization logic for ECOS projects
 Supports: OR-Tools, Linear Programming, Graph Theory
+
+OR-Tools and PuLP are imported on first solve to keep module import cheap.
+Every solver takes time_limit_s (MILPs also gap_limit); see solvers.limits.
 """
 
 from typing import Dict, List, Optional, Any
 import numpy as np
-from ortools.linear_solver import pywraplp
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpStatus
 
+from lazy_imports import lazy_import
+from .memo import memoize_solver, get_solver_cache_stats, clear_solver_cache
+from .limits import Deadline, pooled_solver, resolve_limits, time_limit_result
+from .timing import timed_solver, get_solver_timing_stats, reset_solver_timing_stats
+from .awg_fleet import optimize_awg_fleet_schedule
+from .fungal import FEATURES as FUNGAL_FEATURES, optimize_fungal_match_batch
+from .geothermal import optimize_geothermal_network
+from .nutrients import optimize_nutrient_cycle_batch
+from .transport import optimize_nutrient_transport
+
+pywraplp = lazy_import('ortools.linear_solver.pywraplp')
+
+# 'exact': in-process covering-knapsack branch-and-bound; 'pulp': PuLP MILP via the CBC binary
+AWG_SOLVERS = ('exact', 'pulp')
 
+
+@memoize_solver()
+@timed_solver
 def optimize_nutrient_cycle(
     waste_inputs: Dict[str, float],
-    crop_demands: Dict[str, float]
+    crop_demands: Dict[str, float],
+    time_limit_s: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Nutrient cycle optimization for Closed-Loop Farm (#3)
@@ -20,15 +39,24 @@ def optimize_nutrient_cycle(
     Args:
         waste_inputs: Available nutrients from waste {N, P, K} in kg
         crop_demands: Required nutrients for crops {N, P, K} in kg
+        time_limit_s: LP wall-clock limit (default ECOS_SOLVER_TIME_LIMIT_S)
         
     Returns:
         Optimization solution with allocation plan
     """
-    solver = pywraplp.Solver.CreateSolver('GLOP')
-    
-    if not solver:
-        return {'status': 'error', 'message': 'Solver not available'}
-    
+    time_limit_s, _ = resolve_limits(time_limit_s)
+    with pooled_solver('GLOP') as solver:
+        if not solver:
+            return {'status': 'error', 'message': 'Solver not available'}
+        return _nutrient_cycle_lp(solver, waste_inputs, crop_demands, Deadline(time_limit_s))
+
+
+def _nutrient_cycle_lp(
+    solver: Any,
+    waste_inputs: Dict[str, float],
+    crop_demands: Dict[str, float],
+    deadline: Deadline,
+) -> Dict[str, Any]:
     # Variables: how much of each nutrient to allocate
     n_alloc = solver.NumVar(0, waste_inputs['N'], 'n_alloc')
     p_alloc = solver.NumVar(0, waste_inputs['P'], 'p_alloc')
@@ -46,6 +74,7 @@ def optimize_nutrient_cycle(
     objective.SetCoefficient(k_alloc, 1)
     objective.SetMinimization()
     
+    solver.SetTimeLimit(deadline.remaining_ms())
     status = solver.Solve()
     
     if status == pywraplp.Solver.OPTIMAL:
@@ -63,14 +92,27 @@ def optimize_nutrient_cycle(
             },
             'objective_value': solver.Objective().Value(),
         }
+    elif deadline.expired:
+        return time_limit_result(deadline.seconds)
     else:
         return {'status': 'infeasible', 'message': 'No solution found'}
 
 
+# Rolling mode reads and updates the device's stored plan, so it always runs
+@memoize_solver(bypass=lambda args: args['device_id'] is not None)
+@timed_solver
 def optimize_awg_schedule(
     humidity_forecast: List[float],
     energy_prices: List[float],
-    target_liters: float
+    target_liters: float,
+    run_windows: Optional[List[Dict[str, Any]]] = None,
+    solver: str = 'exact',
+    device_id: Optional[str] = None,
+    start_hour: Optional[int] = None,
+    current_hour: Optional[int] = None,
+    time_limit_s: Optional[float] = None,
+    gap_limit: Optional[float] = None,
+    previous_plan: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     AWG run schedule optimization (#9)
@@ -80,10 +122,44 @@ def optimize_awg_schedule(
         humidity_forecast: Predicted humidity for next N hours
         energy_prices: Energy prices for next N hours ($/kWh)
         target_liters: Required water production (liters)
+        run_windows: Optional windows from forecast_humidity / extract_run_windows;
+            the unit only runs in hours inside a window's [start_index, end_index)
+        solver: One of AWG_SOLVERS; both solve to gap_limit and return the same result shape
+        device_id: Rolling-horizon mode: keep this device's plan between calls and
+            warm-start from it (always solved in-process, see solvers.rolling)
+        start_hour: Absolute index of the forecast's first hour (rolling mode)
+        current_hour: First hour not yet executed; earlier hours stay as planned (rolling mode)
+        time_limit_s: Search wall-clock limit (default ECOS_SOLVER_TIME_LIMIT_S);
+            the best schedule found by then is returned with status 'feasible'
+        gap_limit: Relative optimality gap at which the search stops
+            (default ECOS_SOLVER_GAP_LIMIT; 0 = exact)
+        previous_plan: Rolling mode: the device's last {'start_hour', 'schedule'},
+            for callers whose replans may land on another worker process
         
     Returns:
-        Optimal run schedule
+        Run schedule, status ('optimal' within gap_limit, or 'feasible' when
+        the time limit was hit) and the optimality gap bound where known
     """
+    time_limit_s, gap_limit = resolve_limits(time_limit_s, gap_limit)
+    if device_id is not None:
+        if start_hour is None:
+            raise ValueError("Rolling-horizon mode (device_id) requires start_hour.")
+        from .rolling import rolling_awg_schedule
+        return rolling_awg_schedule(
+            device_id, humidity_forecast, energy_prices, target_liters, start_hour, current_hour, run_windows,
+            time_limit_s=time_limit_s, gap_limit=gap_limit, previous_plan=previous_plan,
+        )
+    if solver == 'exact':
+        return _awg_schedule_exact(
+            humidity_forecast, energy_prices, target_liters, run_windows, time_limit_s, gap_limit
+        )
+    if solver != 'pulp':
+        raise ValueError(f"Unknown AWG solver {solver!r}; expected one of {list(AWG_SOLVERS)}.")
+
+    from pulp import (
+        LpProblem, LpMinimize, LpVariable, lpSum, LpSolutionOptimal, LpSolutionIntegerFeasible, PULP_CBC_CMD
+    )
+
     hours = len(humidity_forecast)
     
     # Create LP problem
@@ -96,6 +172,14 @@ def optimize_awg_schedule(
     # Simplified model: production = humidity * 0.1
     production_rate = [h * 0.1 for h in humidity_forecast]
     
+    # Constraint: stay off outside the forecast's run windows
+    if run_windows is not None:
+        allowed = np.zeros(hours, dtype=bool)
+        for window in run_windows:
+            allowed[window['start_index']:window['end_index']] = True
+        for i in np.flatnonzero(~allowed):
+            prob += run[i] == 0
+    
     # Constraint: meet production target
     prob += lpSum([run[i] * production_rate[i] for i in range(hours)]) >= target_liters
     
@@ -104,29 +188,80 @@ def optimize_awg_schedule(
     energy_per_hour = 2.0
     prob += lpSum([run[i] * energy_prices[i] * energy_per_hour for i in range(hours)])
     
-    # Solve
-    prob.solve()
+    # Solve; CBC keeps its best integer solution when the time limit cuts the search
+    deadline = Deadline(time_limit_s)
+    prob.solve(PULP_CBC_CMD(timeLimit=time_limit_s, gapRel=gap_limit))
     
-    if LpStatus[prob.status] == 'Optimal':
+    if prob.sol_status in (LpSolutionOptimal, LpSolutionIntegerFeasible):
+        optimal = prob.sol_status == LpSolutionOptimal
         schedule = [int(run[i].varValue) for i in range(hours)]
         total_production = sum([schedule[i] * production_rate[i] for i in range(hours)])
         total_cost = sum([schedule[i] * energy_prices[i] * energy_per_hour for i in range(hours)])
         
         return {
-            'status': 'optimal',
+            'status': 'optimal' if optimal else 'feasible',
+            # CBC reports no bound for a time-limited solve
+            'optimality_gap': gap_limit if optimal else None,
             'schedule': schedule,
             'total_production_liters': total_production,
             'total_cost_usd': total_cost,
             'cost_per_liter': total_cost / total_production if total_production > 0 else 0,
         }
+    elif deadline.expired:
+        return time_limit_result(time_limit_s)
     else:
         return {'status': 'infeasible', 'message': 'No solution found'}
 
 
+def _awg_schedule_exact(
+    humidity_forecast: List[float],
+    energy_prices: List[float],
+    target_liters: float,
+    run_windows: Optional[List[Dict[str, Any]]] = None,
+    time_limit_s: Optional[float] = None,
+    gap_limit: float = 0.0,
+) -> Dict[str, Any]:
+    """optimize_awg_schedule as a min-cost covering knapsack, solved in-process"""
+    from .knapsack import solve_cover
+
+    hours = len(humidity_forecast)
+    production_rate = np.asarray(humidity_forecast, dtype=np.float64) * 0.1
+    hourly_cost = np.asarray(energy_prices, dtype=np.float64)[:hours] * 2.0
+
+    allowed = np.ones(hours, dtype=bool)
+    if run_windows is not None:
+        allowed[:] = False
+        for window in run_windows:
+            allowed[window['start_index']:window['end_index']] = True
+
+    selected = np.zeros(hours, dtype=bool)
+    cover = solve_cover(
+        hourly_cost[allowed], production_rate[allowed], target_liters, time_limit_s=time_limit_s, gap_limit=gap_limit
+    )
+    if cover.selection is None:
+        return {'status': 'infeasible', 'message': 'No solution found'}
+    selected[np.flatnonzero(allowed)[cover.selection]] = True
+
+    total_production = float(production_rate[selected].sum())
+    total_cost = float(hourly_cost[selected].sum())
+    return {
+        'status': cover.status,
+        'optimality_gap': cover.gap,
+        'schedule': selected.astype(int).tolist(),
+        'total_production_liters': total_production,
+        'total_cost_usd': total_cost,
+        'cost_per_liter': total_cost / total_production if total_production > 0 else 0,
+    }
+
+
+@memoize_solver()
+@timed_solver
 def optimize_geothermal_flow(
     building_loads: Dict[str, float],
     ground_temp: float,
-    available_capacity: float
+    available_capacity: float,
+    network: Optional[Dict[str, Any]] = None,
+    time_limit_s: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Geothermal network flow optimization (#10)
@@ -136,15 +271,31 @@ def optimize_geothermal_flow(
         building_loads: Required heat for each building {building_id: kW}
         ground_temp: Current ground loop temperature (celsius)
         available_capacity: Total system capacity (kW)
+        network: Borehole / pipe / building graph; when given, solved as a
+            network flow instead (see solvers.geothermal) and the flat
+            building_loads / available_capacity are ignored
+        time_limit_s: LP wall-clock limit (default ECOS_SOLVER_TIME_LIMIT_S),
+            also for lossy networks; a lossless network's min-cost flow has none
         
     Returns:
         Flow allocation for each building
     """
-    solver = pywraplp.Solver.CreateSolver('GLOP')
-    
-    if not solver:
-        return {'status': 'error', 'message': 'Solver not available'}
-    
+    time_limit_s, _ = resolve_limits(time_limit_s)
+    if network is not None:
+        return optimize_geothermal_network(network, ground_temp, time_limit_s)
+
+    with pooled_solver('GLOP') as solver:
+        if not solver:
+            return {'status': 'error', 'message': 'Solver not available'}
+        return _geothermal_flow_lp(solver, building_loads, available_capacity, Deadline(time_limit_s))
+
+
+def _geothermal_flow_lp(
+    solver: Any,
+    building_loads: Dict[str, float],
+    available_capacity: float,
+    deadline: Deadline,
+) -> Dict[str, Any]:
     buildings = list(building_loads.keys())
     
     # Variables: heat allocation to each building
@@ -161,14 +312,16 @@ def optimize_geothermal_flow(
         objective.SetCoefficient(allocations[building], 1)
     objective.SetMaximization()
     
+    solver.SetTimeLimit(deadline.remaining_ms())
     status = solver.Solve()
     
     if status == pywraplp.Solver.OPTIMAL:
+        total_allocated = sum([allocations[b].solution_value() for b in buildings])
         result = {
             'status': 'optimal',
             'allocations': {b: allocations[b].solution_value() for b in buildings},
-            'total_allocated': sum([allocations[b].solution_value() for b in buildings]),
-            'capacity_utilization': sum([allocations[b].solution_value() for b in buildings]) / available_capacity,
+            'total_allocated': total_allocated,
+            'capacity_utilization': total_allocated / available_capacity if available_capacity > 0 else 0.0,
         }
         
         # Calculate unmet demand
@@ -176,6 +329,8 @@ def optimize_geothermal_flow(
         result['unmet_demand'] = unmet
         
         return result
+    elif deadline.expired:
+        return time_limit_result(deadline.seconds)
     else:
         return {'status': 'infeasible', 'message': 'No solution found'}
 
@@ -183,7 +338,8 @@ def optimize_geothermal_flow(
 def optimize_fungal_match(soil_data: Dict[str, float]) -> Dict[str, Any]:
     """
     Fungal strain recommendation for Symbiosis (#2)
-    Simple ML-based matching (placeholder for scikit-learn model)
+    Scores the strain profiles in solvers.fungal (placeholder for scikit-learn model);
+    use optimize_fungal_match_batch for survey grids
     
     Args:
         soil_data: Soil characteristics {pH, moisture, NPK, temp}
@@ -191,38 +347,31 @@ def optimize_fungal_match(soil_data: Dict[str, float]) -> Dict[str, Any]:
     Returns:
         Recommended fungal strain and expected yield increase
     """
-    # Simplified rule-based system (in production, use trained ML model)
-    ph = soil_data.get('pH', 7.0)
-    moisture = soil_data.get('moisture', 50.0)
-    
-    if ph < 6.0:
-        strain = "Acidophilus_Strain_A"
-        yield_increase = 0.25
-    elif ph > 7.5:
-        strain = "Alkalophilus_Strain_B"
-        yield_increase = 0.20
-    else:
-        strain = "Neutral_Strain_C"
-        yield_increase = 0.30
-    
-    # Adjust for moisture
-    if moisture < 40:
-        yield_increase *= 0.8
-    elif moisture > 70:
-        yield_increase *= 0.9
-    
+    match = optimize_fungal_match_batch(
+        {feature: [soil_data.get(feature, np.nan)] for feature in FUNGAL_FEATURES}, top_k=1
+    )
     return {
-        'recommended_strain': strain,
-        'expected_yield_increase': yield_increase,
-        'confidence': 0.85,
-        'soil_compatibility': 'high' if 6.0 <= ph <= 7.5 else 'medium',
+        'recommended_strain': match['recommended_strain'][0],
+        'expected_yield_increase': match['expected_yield_increase'][0],
+        'confidence': match['confidence'],
+        'soil_compatibility': match['soil_compatibility'][0],
     }
 
 
 # Export main solver functions
 __all__ = [
+    'AWG_SOLVERS',
+    'get_solver_cache_stats',
+    'clear_solver_cache',
+    'get_solver_timing_stats',
+    'reset_solver_timing_stats',
     'optimize_nutrient_cycle',
+    'optimize_nutrient_cycle_batch',
+    'optimize_nutrient_transport',
     'optimize_awg_schedule',
+    'optimize_awg_fleet_schedule',
     'optimize_geothermal_flow',
+    'optimize_geothermal_network',
     'optimize_fungal_match',
+    'optimize_fungal_match_batch',
 ]
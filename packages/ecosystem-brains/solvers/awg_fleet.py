@@ -0,0 +1,287 @@
+"""
+Fleet-level AWG scheduling
+Co-optimizes the run schedules of many AWG units behind one grid connection
+(and optionally one solar array): every unit meets its own water target,
+the fleet's grid draw stays under a per-hour power cap, and grid energy
+cost is minimized. A greedy schedule seeds the MILP and is returned as the
+incumbent when the time limit is reached before the MILP finds anything better.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from .limits import mip_parameters, pooled_solver, resolve_limits, time_limit_result
+from .memo import memoize_solver
+from .timing import timed_solver
+
+pywraplp = lazy_import('ortools.linear_solver.pywraplp')
+
+# Single-unit model of optimize_awg_schedule: 0.1 L/h per % humidity, 2 kW while running
+DEFAULT_EFFICIENCY_CURVE = ((0.0, 0.0), (100.0, 10.0))
+DEFAULT_UNIT_POWER_KW = 2.0
+
+_EPS = 1e-9
+
+
+def _per_hour(value: Union[float, Sequence[float], None], hours: int, name: str) -> np.ndarray:
+    if value is None:
+        return np.zeros(hours)
+    array = np.asarray(value, dtype=np.float64)
+    if array.ndim == 0:
+        return np.full(hours, float(array))
+    if array.shape != (hours,):
+        raise ValueError(f"{name} must have one value per hour ({hours}); received {array.shape[0]}.")
+    return array
+
+
+def production_rates(units: List[Dict[str, Any]], hours: int) -> np.ndarray:
+    """
+    Liters per hour of every unit in every hour, read off each unit's
+    efficiency curve ([humidity %, liters/hour] points, linearly interpolated).
+
+    Returns:
+        (n_units, hours) array
+    """
+    rates = np.zeros((len(units), hours))
+    for i, unit in enumerate(units):
+        humidity = np.asarray(unit['humidity_forecast'], dtype=np.float64)
+        if humidity.shape != (hours,):
+            raise ValueError(
+                f"Unit {unit.get('unit_id', i)!r} humidity_forecast must have {hours} hours; received {humidity.shape[0]}."
+            )
+        curve = np.asarray(unit.get('efficiency_curve') or DEFAULT_EFFICIENCY_CURVE, dtype=np.float64)
+        order = np.argsort(curve[:, 0])
+        rates[i] = np.interp(humidity, curve[order, 0], curve[order, 1])
+    return rates
+
+
+def greedy_fleet_schedule(
+    rates: np.ndarray,
+    power_kw: np.ndarray,
+    targets: np.ndarray,
+    prices: np.ndarray,
+    capacity_kw: np.ndarray,
+) -> Optional[np.ndarray]:
+    """
+    Cheapest-liter-first heuristic: walk every (unit, hour) slot in order of
+    energy price per liter and run it while its unit is short of target and
+    the hour still has power headroom.
+
+    Returns:
+        (n_units, hours) boolean schedule, or None if some target is missed
+    """
+    n_units, hours = rates.shape
+    with np.errstate(divide='ignore'):
+        cost_per_liter = np.where(rates > 0, prices[None, :] * power_kw[:, None] / rates, np.inf)
+    order = np.argsort(cost_per_liter, axis=None, kind='stable')
+    order = order[np.isfinite(cost_per_liter.ravel()[order])]
+
+    schedule = np.zeros((n_units, hours), dtype=bool)
+    remaining = targets.astype(np.float64).copy()
+    headroom = capacity_kw.astype(np.float64).copy()
+    for flat in order.tolist():
+        unit, hour = divmod(flat, hours)
+        if remaining[unit] <= _EPS or headroom[hour] < power_kw[unit] - _EPS:
+            continue
+        schedule[unit, hour] = True
+        remaining[unit] -= rates[unit, hour]
+        headroom[hour] -= power_kw[unit]
+    return schedule if np.all(remaining <= _EPS) else None
+
+
+def _summarize(
+    units: List[Dict[str, Any]],
+    schedule: np.ndarray,
+    rates: np.ndarray,
+    power_kw: np.ndarray,
+    prices: np.ndarray,
+    solar_kw: np.ndarray,
+) -> Dict[str, Any]:
+    load = power_kw @ schedule
+    grid = np.maximum(load - solar_kw, 0.0)
+    production = (rates * schedule).sum(axis=1)
+    return {
+        'units': {
+            str(unit.get('unit_id', i)): {
+                'schedule': schedule[i].astype(int).tolist(),
+                'production_liters': float(production[i]),
+                'target_liters': float(unit['target_liters']),
+            }
+            for i, unit in enumerate(units)
+        },
+        'hourly_load_kw': load.tolist(),
+        'grid_import_kw': grid.tolist(),
+        'total_production_liters': float(production.sum()),
+        'total_cost_usd': float(prices @ grid),
+    }
+
+
+def _infeasible_cause(
+    units: List[Dict[str, Any]],
+    rates: np.ndarray,
+    power_kw: np.ndarray,
+    targets: np.ndarray,
+    capacity_kw: np.ndarray,
+) -> str:
+    """Why no schedule meets every target: the first unit that cannot reach its own, else the shared cap"""
+    for i, unit in enumerate(units):
+        unit_id = unit.get('unit_id', i)
+        most = float(rates[i].sum())
+        if most < targets[i] - _EPS:
+            return (
+                f"Unit {unit_id!r} makes at most {most:g} L at its forecast humidity, "
+                f"short of its {targets[i]:g} L target"
+            )
+        powered = float(rates[i][capacity_kw >= power_kw[i] - _EPS].sum())
+        if powered < targets[i] - _EPS:
+            return (
+                f"Unit {unit_id!r} draws {power_kw[i]:g} kW, more than the power cap and solar allow "
+                f"in the hours it needs; it can make at most {powered:g} of its {targets[i]:g} L target"
+            )
+    return "Every unit can reach its target alone, but not together under the shared power cap"
+
+
+def _solve_fleet_milp(
+    solver: Any,
+    rates: np.ndarray,
+    power: np.ndarray,
+    targets: np.ndarray,
+    prices: np.ndarray,
+    cap: np.ndarray,
+    solar: np.ndarray,
+    incumbent: Optional[np.ndarray],
+    time_limit_s: float,
+    gap_limit: float,
+) -> Dict[str, Any]:
+    """
+    Build and solve the fleet MILP on a pooled SCIP instance, seeded with the greedy incumbent.
+
+    Returns:
+        MPSolver status, and the schedule, grid cost and relative gap of the
+        best MILP solution (None when it found none)
+    """
+    n_units, hours = rates.shape
+    solver.SetTimeLimit(max(1, int(time_limit_s * 1000)))
+
+    # Variables only for slots that produce water; grid import per hour
+    slots = [np.flatnonzero(rates[i] > 0) for i in range(n_units)]
+    run = {(i, t): solver.BoolVar(f"run_{i}_{t}") for i in range(n_units) for t in slots[i].tolist()}
+    grid = [solver.NumVar(0.0, float(cap[t]), f"grid_{t}") for t in range(hours)]
+
+    for i in range(n_units):
+        solver.Add(solver.Sum([float(rates[i, t]) * run[i, t] for t in slots[i].tolist()]) >= float(targets[i]))
+    by_hour: Dict[int, List[Any]] = {t: [] for t in range(hours)}
+    for (i, t), var in run.items():
+        by_hour[t].append(float(power[i]) * var)
+    for t in range(hours):
+        solver.Add(solver.Sum(by_hour[t]) - float(solar[t]) <= grid[t])
+    solver.Minimize(solver.Sum([float(prices[t]) * grid[t] for t in range(hours)]))
+
+    if incumbent is not None:
+        hint_vars = list(run.values())
+        solver.SetHint(hint_vars, [float(incumbent[i, t]) for i, t in run])
+
+    status = solver.Solve(mip_parameters(gap_limit))
+    if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+        return {'status': status, 'schedule': None, 'cost': None, 'gap': None}
+    schedule = np.zeros_like(rates, dtype=bool)
+    for (i, t), var in run.items():
+        schedule[i, t] = var.solution_value() > 0.5
+    objective = solver.Objective().Value()
+    bound = solver.Objective().BestBound()
+    return {
+        'status': status,
+        'schedule': schedule,
+        'cost': objective,
+        'gap': abs(objective - bound) / max(abs(objective), _EPS),
+    }
+
+
+@memoize_solver()
+@timed_solver
+def optimize_awg_fleet_schedule(
+    units: List[Dict[str, Any]],
+    energy_prices: List[float],
+    power_cap_kw: Union[float, List[float]],
+    solar_kw: Optional[Union[float, List[float]]] = None,
+    time_limit_s: Optional[float] = None,
+    gap_limit: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Joint run schedule for a fleet of AWG units (#9)
+
+    Args:
+        units: One dict per unit with 'unit_id', 'humidity_forecast' (one
+            value per hour), 'target_liters', and optionally 'power_kw'
+            (default 2.0) and 'efficiency_curve' ([humidity %, liters/hour]
+            points; default 0.1 L/h per % humidity)
+        energy_prices: Grid price per hour ($/kWh)
+        power_cap_kw: Grid import limit, one value or one per hour
+        solar_kw: Solar output available per hour (free, used first)
+        time_limit_s: MILP wall-clock limit (default ECOS_SOLVER_TIME_LIMIT_S);
+            the best schedule found by then is returned
+        gap_limit: Relative optimality gap at which the MILP stops (default
+            ECOS_SOLVER_GAP_LIMIT)
+
+    Returns:
+        Per-unit schedules and production, hourly load and grid import,
+        total cost, and how the schedule was obtained ('optimal', or
+        'feasible' with the remaining optimality gap when the limit was hit)
+    """
+    started = time.perf_counter()
+    time_limit_s, gap_limit = resolve_limits(time_limit_s, gap_limit)
+    prices = np.asarray(energy_prices, dtype=np.float64)
+    hours = len(prices)
+    if not units:
+        raise ValueError("units must list at least one AWG unit.")
+    cap = _per_hour(power_cap_kw, hours, 'power_cap_kw')
+    solar = _per_hour(solar_kw, hours, 'solar_kw')
+    rates = production_rates(units, hours)
+    power = np.array([float(unit.get('power_kw', DEFAULT_UNIT_POWER_KW)) for unit in units])
+    targets = np.array([float(unit['target_liters']) for unit in units])
+
+    incumbent = greedy_fleet_schedule(rates, power, targets, prices, cap + solar)
+    incumbent_cost = None
+    if incumbent is not None:
+        incumbent_cost = float(prices @ np.maximum(power @ incumbent - solar, 0.0))
+
+    with pooled_solver('SCIP') as solver:
+        if not solver:
+            return {'status': 'error', 'message': 'Solver not available'}
+        # Greedy seeding and model building count against the limit
+        remaining_s = time_limit_s - (time.perf_counter() - started)
+        solved = _solve_fleet_milp(solver, rates, power, targets, prices, cap, solar, incumbent, remaining_s, gap_limit)
+    status, schedule, source, gap = solved['status'], None, 'greedy', None
+    if solved['schedule'] is not None and (incumbent_cost is None or solved['cost'] <= incumbent_cost + _EPS):
+        schedule, source, gap = solved['schedule'], 'milp', solved['gap']
+    if schedule is None:
+        if incumbent is None:
+            if status == pywraplp.Solver.INFEASIBLE:
+                result = {'status': 'infeasible', 'message': _infeasible_cause(units, rates, power, targets, cap + solar)}
+            else:
+                result = time_limit_result(time_limit_s)
+            result['solve_time_s'] = time.perf_counter() - started
+            return result
+        schedule = incumbent
+
+    result = _summarize(units, schedule, rates, power, prices, solar)
+    result.update({
+        'status': 'optimal' if source == 'milp' and status == pywraplp.Solver.OPTIMAL else 'feasible',
+        'source': source,
+        'optimality_gap': gap,
+        'solve_time_s': time.perf_counter() - started,
+    })
+    return result
+
+
+__all__ = [
+    'DEFAULT_EFFICIENCY_CURVE',
+    'production_rates',
+    'greedy_fleet_schedule',
+    'optimize_awg_fleet_schedule',
+]
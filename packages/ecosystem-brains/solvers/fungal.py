@@ -0,0 +1,192 @@
+"""
+Fungal strain matching for Symbiosis (#2) soil surveys
+Each strain has a profile: the soil range it suits per feature and the yield
+increase it brings there. Profiles are turned into (strains x features)
+range matrices once per process, and a survey's columnar soil arrays are
+scored against every strain at once by broadcasting, one feature at a time.
+
+Inside all of its ranges a strain scores its base yield increase; outside,
+the score falls off with the distance to the range. The built-in profiles
+reproduce the original pH rules: the neutral strain wins on [6.0, 7.5], the
+acid / alkaline strains below and above it.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Soil columns, in matrix order
+FEATURES = ('pH', 'moisture', 'N', 'P', 'K', 'temp')
+
+# Used for a missing column or a NaN reading; other features are then unconstrained
+FEATURE_DEFAULTS = {'pH': 7.0, 'moisture': 50.0}
+
+# Distance outside a range (in the feature's units) over which the fit falls by e
+FEATURE_TOLERANCE = {'pH': 0.5, 'moisture': 10.0, 'N': 10.0, 'P': 5.0, 'K': 10.0, 'temp': 3.0}
+
+# Scale on any out-of-range fit; with base yields within 2x of each other, a
+# strain whose ranges hold the sample always outranks one whose ranges do not
+OFF_RANGE_FACTOR = 0.5
+
+# Survey-wide moisture adjustment applied to every strain: (below, factor), (above, factor)
+DRY_MOISTURE, DRY_FACTOR = 40.0, 0.8
+WET_MOISTURE, WET_FACTOR = 70.0, 0.9
+
+# Soil in this pH range is rated 'high' compatibility, otherwise 'medium'
+NEUTRAL_PH = (6.0, 7.5)
+
+MATCH_CONFIDENCE = 0.85
+
+# Built-in profiles; ranges are [low, high] with None for unbounded
+STRAIN_PROFILES = (
+    {'strain': 'Acidophilus_Strain_A', 'base_yield_increase': 0.25, 'ranges': {'pH': [None, 6.0]}},
+    {'strain': 'Alkalophilus_Strain_B', 'base_yield_increase': 0.20, 'ranges': {'pH': [7.5, None]}},
+    {'strain': 'Neutral_Strain_C', 'base_yield_increase': 0.30, 'ranges': {'pH': [6.0, 7.5]}},
+)
+
+
+def _build_profile_matrix(profiles: Sequence[Mapping[str, Any]]) -> Dict[str, np.ndarray]:
+    """(strains x features) low / high bounds and base yields for the given profiles"""
+    if not profiles:
+        raise ValueError("At least one strain profile is required.")
+    low = np.full((len(profiles), len(FEATURES)), -np.inf)
+    high = np.full((len(profiles), len(FEATURES)), np.inf)
+    for s, profile in enumerate(profiles):
+        unknown = sorted(set(profile.get('ranges', {})) - set(FEATURES))
+        if unknown:
+            raise ValueError(f"Strain {profile['strain']!r} has ranges for unknown features {unknown}.")
+        for feature, (lo, hi) in profile.get('ranges', {}).items():
+            f = FEATURES.index(feature)
+            low[s, f] = -np.inf if lo is None else float(lo)
+            high[s, f] = np.inf if hi is None else float(hi)
+    return {
+        'strains': np.array([str(profile['strain']) for profile in profiles]),
+        'low': low,
+        'high': high,
+        'base_yield': np.array([float(profile['base_yield_increase']) for profile in profiles]),
+        'tolerance': np.array([FEATURE_TOLERANCE[feature] for feature in FEATURES]),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def strain_profile_matrix() -> Dict[str, np.ndarray]:
+    """
+    The strain-profile matrices, built once per process from
+    ECOS_FUNGAL_STRAIN_PROFILES (a JSON list shaped like STRAIN_PROFILES)
+    when set, else from the built-in profiles.
+    """
+    path = os.environ.get('ECOS_FUNGAL_STRAIN_PROFILES')
+    if path:
+        with open(path) as handle:
+            return _build_profile_matrix(json.load(handle))
+    return _build_profile_matrix(STRAIN_PROFILES)
+
+
+def _soil_columns(soil: Mapping[str, Sequence[float]]) -> Tuple[np.ndarray, int]:
+    """(samples x features) soil matrix; NaN where a feature is unknown"""
+    lengths = {len(soil[feature]) for feature in FEATURES if feature in soil}
+    if not lengths:
+        raise ValueError(f"soil needs at least one of the columns {list(FEATURES)}.")
+    if len(lengths) > 1:
+        raise ValueError(f"Every soil column needs one value per sample; received lengths {sorted(lengths)}.")
+    n_samples = lengths.pop()
+    columns = np.full((n_samples, len(FEATURES)), np.nan)
+    for f, feature in enumerate(FEATURES):
+        if feature in soil:
+            columns[:, f] = np.asarray(soil[feature], dtype=np.float64)
+        if feature in FEATURE_DEFAULTS:
+            column = columns[:, f]
+            column[np.isnan(column)] = FEATURE_DEFAULTS[feature]
+    return columns, n_samples
+
+
+def score_strains(columns: np.ndarray, profiles: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Expected yield increase of every strain on every sample.
+
+    Args:
+        columns: (samples x features) soil values, NaN where unknown
+        profiles: strain_profile_matrix()
+
+    Returns:
+        (samples x strains) scores
+    """
+    fit = np.ones((columns.shape[0], len(profiles['strains'])))
+    # One feature at a time keeps the broadcast at samples x strains
+    for f in range(len(FEATURES)):
+        x = columns[:, f, None]
+        outside = np.maximum(profiles['low'][None, :, f] - x, 0.0) + np.maximum(x - profiles['high'][None, :, f], 0.0)
+        outside = np.nan_to_num(outside, nan=0.0)
+        fit *= np.where(outside > 0, OFF_RANGE_FACTOR * np.exp(-outside / profiles['tolerance'][f]), 1.0)
+
+    moisture = columns[:, FEATURES.index('moisture')]
+    adjustment = np.select([moisture < DRY_MOISTURE, moisture > WET_MOISTURE], [DRY_FACTOR, WET_FACTOR], 1.0)
+    return profiles['base_yield'][None, :] * adjustment[:, None] * fit
+
+
+def _top_k_per_row(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of each row's k largest scores, largest first"""
+    if k >= scores.shape[1]:
+        return np.argsort(-scores, axis=1, kind='stable')
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def optimize_fungal_match_batch(
+    soil: Mapping[str, Sequence[float]],
+    top_k: int = 3,
+    sample_ids: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Fungal strain recommendations for a grid of soil samples (#2)
+
+    Args:
+        soil: Columnar soil arrays {pH, moisture, N, P, K, temp}, one value
+            per sample; missing columns or NaN readings fall back to
+            FEATURE_DEFAULTS or leave the feature unconstrained
+        top_k: Strains ranked per sample
+        sample_ids: Sample names (default: '0', '1', ...)
+
+    Returns:
+        Per sample: the recommended strain, its expected yield increase and
+        the soil compatibility; the top_k strains and their scores; and
+        the match confidence
+    """
+    if top_k < 1:
+        raise ValueError(f"top_k must be at least 1; received {top_k}.")
+    columns, n_samples = _soil_columns(soil)
+    if sample_ids is None:
+        sample_ids = [str(i) for i in range(n_samples)]
+    elif len(sample_ids) != n_samples:
+        raise ValueError(f"sample_ids must have one entry per sample ({n_samples}).")
+
+    profiles = strain_profile_matrix()
+    scores = score_strains(columns, profiles)
+    ranked = _top_k_per_row(scores, top_k)
+    ranked_scores = np.take_along_axis(scores, ranked, axis=1)
+    ph = columns[:, FEATURES.index('pH')]
+    neutral = (ph >= NEUTRAL_PH[0]) & (ph <= NEUTRAL_PH[1])
+    return {
+        'sample_ids': sample_ids,
+        'recommended_strain': profiles['strains'][ranked[:, 0]].tolist(),
+        'expected_yield_increase': ranked_scores[:, 0].tolist(),
+        'soil_compatibility': np.where(neutral, 'high', 'medium').tolist(),
+        'top_strains': profiles['strains'][ranked].tolist(),
+        'top_scores': ranked_scores.tolist(),
+        'confidence': MATCH_CONFIDENCE,
+    }
+
+
+__all__ = [
+    'FEATURES',
+    'STRAIN_PROFILES',
+    'strain_profile_matrix',
+    'score_strains',
+    'optimize_fungal_match_batch',
+]
@@ -0,0 +1,266 @@
+"""
+Exact in-process solver for the min-cost covering knapsack
+    minimize  sum(c_i * x_i)  s.t.  sum(w_i * x_i) >= target,  x_i in {0, 1}
+which is the AWG scheduling problem (one binary per hour, one production
+constraint). Solved by LP-bound reduction plus depth-first branch-and-bound,
+with an in-process MILP fallback when the search exceeds its node budget.
+Both stop at a time limit or relative gap and keep the best selection found.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from .limits import Deadline, mip_parameters, pooled_solver
+
+pywraplp = lazy_import('ortools.linear_solver.pywraplp')
+
+# Feasibility tolerance on the covered amount, and pruning tolerance on cost
+_EPS = 1e-9
+
+# Branch-and-bound nodes explored before handing the reduced core to a MILP solver
+DEFAULT_NODE_LIMIT = 200_000
+
+# Branch-and-bound nodes between clock checks
+_CLOCK_INTERVAL = 4096
+
+
+class CoverSolution(NamedTuple):
+    """selection is None only when the target cannot be reached"""
+    selection: Optional[np.ndarray]
+    # 'optimal' (within the gap limit), 'feasible' (time limit hit; best found) or 'infeasible'
+    status: str
+    # Upper bound on the relative gap to the optimum
+    gap: float
+
+
+def _milp_cover(
+    costs: np.ndarray,
+    weights: np.ndarray,
+    target: float,
+    gap_limit: float,
+    deadline: Optional[Deadline],
+) -> Tuple[Optional[np.ndarray], float, bool]:
+    """
+    Solve the cover with OR-Tools' in-process MILP backend (no CBC subprocess)
+
+    Returns:
+        (best selection or None, lower bound on its cost, True if no
+        selection beats the result by more than gap_limit)
+    """
+    with pooled_solver('SCIP', 'CBC') as solver:
+        if solver is None:
+            return None, 0.0, False
+        x = [solver.BoolVar(f"x{i}") for i in range(len(costs))]
+        solver.Add(solver.Sum([float(w) * v for w, v in zip(weights, x)]) >= float(target))
+        solver.Minimize(solver.Sum([float(c) * v for c, v in zip(costs, x)]))
+        solver.SetTimeLimit(deadline.remaining_ms() if deadline is not None else 0)
+        status = solver.Solve(mip_parameters(gap_limit))
+        if status == pywraplp.Solver.INFEASIBLE:
+            # Nothing in the core covers the need; the caller's incumbent stands
+            return None, 0.0, True
+        if status not in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE):
+            return None, 0.0, False
+        return (
+            np.array([v.solution_value() > 0.5 for v in x]),
+            solver.Objective().BestBound(),
+            status == pywraplp.Solver.OPTIMAL,
+        )
+
+
+def _branch_and_bound(
+    costs: np.ndarray,
+    weights: np.ndarray,
+    target: float,
+    incumbent_cost: float,
+    node_limit: int,
+    gap_limit: float = 0.0,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[Optional[np.ndarray], Optional[str]]:
+    """
+    Depth-first search over items sorted by cost per unit covered.
+    The bound at a node is its cost plus the LP (fractional greedy) cost of
+    covering the remaining need with the undecided items; nodes that cannot
+    improve on the best cost by more than gap_limit are pruned.
+
+    Returns:
+        (best selection strictly cheaper than incumbent_cost or None, and
+        None if the search finished or 'nodes' / 'time' if a limit stopped it)
+    """
+    n = len(costs)
+    c, w = costs.tolist(), weights.tolist()
+    ratio = (costs / weights).tolist()
+    wsum = np.concatenate(([0.0], np.cumsum(weights))).tolist()
+    csum = np.concatenate(([0.0], np.cumsum(costs))).tolist()
+
+    def bound(j: int, need: float) -> float:
+        if wsum[n] - wsum[j] < need - _EPS:
+            return float('inf')
+        # Item k is the first one that completes the need when taking j, j+1, ...
+        k = min(bisect_left(wsum, wsum[j] + need - _EPS, lo=j + 1) - 1, n - 1)
+        return csum[k] - csum[j] + max(0.0, need - (wsum[k] - wsum[j])) * ratio[k]
+
+    best_cost, best = incumbent_cost, None
+    cutoff = best_cost - max(_EPS, gap_limit * abs(best_cost))
+    # (next item, remaining need, cost so far, chosen items as a linked list)
+    stack = [(0, target, 0.0, None)]
+    nodes, stopped = 0, None
+    while stack:
+        j, need, cost, chosen = stack.pop()
+        nodes += 1
+        if nodes > node_limit:
+            stopped = 'nodes'
+            break
+        if deadline is not None and nodes % _CLOCK_INTERVAL == 0 and deadline.expired:
+            stopped = 'time'
+            break
+        if j >= n or cost + bound(j, need) >= cutoff:
+            continue
+        # Skip branch first on the stack so the take branch is explored first
+        stack.append((j + 1, need, cost, chosen))
+        taken = (j, chosen)
+        if need - w[j] <= _EPS:
+            if cost + c[j] < best_cost - _EPS:
+                best_cost, best = cost + c[j], taken
+                cutoff = best_cost - max(_EPS, gap_limit * abs(best_cost))
+        else:
+            stack.append((j + 1, need - w[j], cost + c[j], taken))
+
+    if best is None:
+        return None, stopped
+    selected = np.zeros(n, dtype=bool)
+    while best is not None:
+        selected[best[0]] = True
+        best = best[1]
+    return selected, stopped
+
+
+def solve_cover(
+    costs: np.ndarray,
+    weights: np.ndarray,
+    target: float,
+    node_limit: int = DEFAULT_NODE_LIMIT,
+    incumbent: Optional[np.ndarray] = None,
+    time_limit_s: Optional[float] = None,
+    gap_limit: float = 0.0,
+) -> CoverSolution:
+    """
+    Minimum-cost selection with total weight >= target.
+
+    Items that cost nothing are always taken; items that cover nothing are
+    never taken. Items whose reduced cost (against the LP break ratio)
+    exceeds the gap to a greedy incumbent are fixed in or out, and only the
+    remaining core is searched.
+
+    Args:
+        costs: Cost per item
+        weights: Amount each item covers
+        target: Amount to cover
+        node_limit: Branch-and-bound node budget before the MILP fallback
+        incumbent: Optional known selection (e.g. the previous plan); used
+            as the starting upper bound when it is feasible and cheaper
+            than the greedy one
+        time_limit_s: Wall-clock budget (None = unlimited); when it runs out
+            the best selection found so far is returned as 'feasible'
+        gap_limit: Stop once the selection is within this relative gap of
+            the optimum (0 = exact)
+
+    Returns:
+        CoverSolution(selection, status, gap)
+    """
+    deadline = Deadline(time_limit_s) if time_limit_s is not None else None
+    costs = np.asarray(costs, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    selected = (costs <= 0) & (weights >= 0)
+    need = target - float(weights[selected].sum())
+    if need <= _EPS:
+        return CoverSolution(selected, 'optimal', 0.0)
+
+    candidates = np.flatnonzero(~selected & (weights > 0))
+    order = candidates[np.lexsort((-weights[candidates], costs[candidates] / weights[candidates]))]
+    c, w = costs[order], weights[order]
+    wcum = np.cumsum(w)
+    if not len(w) or wcum[-1] < need - _EPS:
+        return CoverSolution(None, 'infeasible', 0.0)
+
+    # LP relaxation: take items up to the break item b, then a fraction of it
+    b = int(np.searchsorted(wcum, need - _EPS))
+    before_w = wcum[b - 1] if b else 0.0
+    before_c = float(c[:b].sum())
+    break_ratio = c[b] / w[b]
+    lp_cost = before_c + (need - before_w) * break_ratio
+
+    # Greedy incumbent: the items before b plus the cheapest single item that completes the need
+    completes = np.flatnonzero(w[b:] >= need - before_w - _EPS) + b
+    completion = completes[np.argmin(c[completes])]
+    best = np.zeros(len(w), dtype=bool)
+    best[:b] = True
+    best[completion] = True
+    best_cost = before_c + float(c[completion])
+    if incumbent is not None:
+        seed = np.asarray(incumbent, dtype=bool)[order]
+        if w[seed].sum() >= need - _EPS and c[seed].sum() < best_cost:
+            best, best_cost = seed, float(c[seed].sum())
+
+    # Reduced-cost fixing: forcing item i against its LP value raises the bound by |d_i|
+    reduced = np.abs(c - break_ratio * w)
+    fixed = lp_cost + reduced > best_cost + _EPS
+    fixed_in = fixed & (np.arange(len(w)) < b)
+    core = np.flatnonzero(~fixed)
+    fixed_cost = float(c[fixed_in].sum())
+    core_need = need - float(w[fixed_in].sum())
+    core_incumbent_cost = best_cost - fixed_cost
+
+    chosen = fixed_in.copy()
+    lower, stopped = lp_cost, None
+    if core_need > _EPS:
+        core_c, core_w = c[core], w[core]
+        found, stopped = _branch_and_bound(
+            core_c, core_w, core_need, core_incumbent_cost, node_limit, gap_limit, deadline
+        )
+        if stopped == 'nodes':
+            stopped = 'time'
+            if deadline is None or not deadline.expired:
+                milp, milp_bound, proven = _milp_cover(core_c, core_w, core_need, gap_limit, deadline)
+                found_cost = core_incumbent_cost if found is None else float(core_c[found].sum())
+                if milp is not None:
+                    lower = max(lower, fixed_cost + milp_bound)
+                    if float(core_c[milp].sum()) < found_cost - _EPS:
+                        found = milp
+                if proven:
+                    stopped = None
+        if found is None:
+            # Nothing in the core beats the incumbent
+            chosen = best
+        else:
+            chosen[core[found]] = True
+
+    selected[order[chosen]] = True
+    total = float(c[chosen].sum())
+    gap = max(0.0, total - lower) / max(total, _EPS)
+    if stopped is None:
+        return CoverSolution(selected, 'optimal', min(gap, gap_limit))
+    return CoverSolution(selected, 'feasible', gap)
+
+
+def min_cost_cover(
+    costs: np.ndarray,
+    weights: np.ndarray,
+    target: float,
+    node_limit: int = DEFAULT_NODE_LIMIT,
+    incumbent: Optional[np.ndarray] = None,
+) -> Optional[np.ndarray]:
+    """
+    Exact minimum-cost selection with total weight >= target (see solve_cover).
+
+    Returns:
+        Boolean selection mask, or None if the target cannot be reached
+    """
+    return solve_cover(costs, weights, target, node_limit, incumbent).selection
+
+
+__all__ = ['DEFAULT_NODE_LIMIT', 'CoverSolution', 'solve_cover', 'min_cost_cover']
@@ -0,0 +1,140 @@
+"""
+Solver time / gap limits and backend reuse
+Every solve runs under a wall-clock limit (so a pathological MILP cannot hold
+a worker forever) and MILPs stop at a relative optimality gap. A solve cut
+short by its time limit returns its best incumbent with status 'feasible',
+or status 'time_limit' when it had none.
+
+OR-Tools MPSolver instances are pooled per thread and Clear()ed between
+solves instead of being rebuilt; SCIP in particular pays several
+milliseconds of plugin setup per instance.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+
+pywraplp = lazy_import('ortools.linear_solver.pywraplp')
+
+# Applied when a call does not pass time_limit_s / gap_limit
+DEFAULT_TIME_LIMIT_S = float(os.environ.get('ECOS_SOLVER_TIME_LIMIT_S', '10'))
+# OR-Tools' own default relative MIP gap
+DEFAULT_GAP_LIMIT = float(os.environ.get('ECOS_SOLVER_GAP_LIMIT', '1e-4'))
+
+_local = threading.local()
+_backend_counts: Dict[str, Dict[str, int]] = {}
+_backend_lock = threading.Lock()
+
+
+def resolve_limits(time_limit_s: Optional[float], gap_limit: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Apply the defaults and validate a call's limits.
+
+    Returns:
+        (time_limit_s, gap_limit)
+    """
+    time_limit_s = DEFAULT_TIME_LIMIT_S if time_limit_s is None else float(time_limit_s)
+    gap_limit = DEFAULT_GAP_LIMIT if gap_limit is None else float(gap_limit)
+    if time_limit_s <= 0:
+        raise ValueError(f"time_limit_s must be positive; received {time_limit_s}.")
+    if not 0 <= gap_limit < 1:
+        raise ValueError(f"gap_limit must be in [0, 1); received {gap_limit}.")
+    return time_limit_s, gap_limit
+
+
+class Deadline:
+    """Wall-clock budget shared by the solves of one call"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.perf_counter() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.perf_counter())
+
+    @property
+    def expired(self) -> bool:
+        return time.perf_counter() >= self.expires_at
+
+    def remaining_ms(self) -> int:
+        """For MPSolver.SetTimeLimit, which treats 0 as no limit"""
+        return max(1, int(self.remaining() * 1000))
+
+
+def time_limit_result(time_limit_s: float) -> Dict[str, Any]:
+    """Result of a solve whose time limit ran out before it found any solution"""
+    return {'status': 'time_limit', 'message': f"No solution found within the {time_limit_s:g} s time limit"}
+
+
+def mip_parameters(gap_limit: float) -> Any:
+    """MPSolverParameters stopping a MILP once within gap_limit of its bound"""
+    parameters = pywraplp.MPSolverParameters()
+    parameters.SetDoubleParam(parameters.RELATIVE_MIP_GAP, gap_limit)
+    return parameters
+
+
+def _count(backend: str, outcome: str):
+    with _backend_lock:
+        counts = _backend_counts.setdefault(backend, {'created': 0, 'reused': 0})
+        counts[outcome] += 1
+
+
+@contextmanager
+def pooled_solver(*backends: str) -> Iterator[Optional[Any]]:
+    """
+    Borrow an empty MPSolver for the first available backend.
+
+    Instances are kept per thread (MPSolver is not thread-safe) and cleared
+    on return, so read solution values inside the with block. Clear() keeps
+    the time limit, so every solve must set its own.
+
+    Args:
+        backends: Backend names in order of preference, e.g. 'SCIP', 'CBC'
+
+    Yields:
+        The solver, or None if no backend is available
+    """
+    pool: Dict[str, List[Any]] = getattr(_local, 'pool', None)
+    if pool is None:
+        pool = _local.pool = {}
+    for backend in backends:
+        free = pool.setdefault(backend, [])
+        if free:
+            solver = free.pop()
+            _count(backend, 'reused')
+        else:
+            solver = pywraplp.Solver.CreateSolver(backend)
+            if solver is None:
+                continue
+            _count(backend, 'created')
+        try:
+            yield solver
+        finally:
+            solver.Clear()
+            free.append(solver)
+        return
+    yield None
+
+
+def get_backend_pool_stats() -> Dict[str, Dict[str, int]]:
+    """Solver instances created vs reused per backend in this process"""
+    with _backend_lock:
+        return {backend: dict(counts) for backend, counts in _backend_counts.items()}
+
+
+__all__ = [
+    'DEFAULT_TIME_LIMIT_S',
+    'DEFAULT_GAP_LIMIT',
+    'resolve_limits',
+    'Deadline',
+    'time_limit_result',
+    'mip_parameters',
+    'pooled_solver',
+    'get_backend_pool_stats',
+]
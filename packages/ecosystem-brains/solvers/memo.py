@@ -0,0 +1,186 @@
+"""
+Solver result memoization
+Identical optimization inputs (the nightly AWG run over an unchanged price
+curve, geothermal loads that have not moved) return the stored result
+instead of re-solving. Inputs are canonicalized before hashing: arguments
+are bound to parameter names with defaults applied, mapping keys are sorted
+and floats are rounded to a tolerance, so positional vs keyword calls, key
+order and float noise below the tolerance all hit the same entry.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from caching import LRUTTLCache
+
+# Floats closer than this (absolute) canonicalize to the same key
+DEFAULT_TOLERANCE = float(os.environ.get('ECOS_SOLVER_CACHE_TOLERANCE', '1e-6'))
+
+# Results are stored pickled, so hits hand back an independent copy
+solver_result_cache = LRUTTLCache(
+    max_entries=int(os.environ.get('ECOS_SOLVER_CACHE_ENTRIES', '1024')),
+    ttl_seconds=float(os.environ.get('ECOS_SOLVER_CACHE_TTL_SECONDS', '900')),
+    max_bytes=int(float(os.environ.get('ECOS_SOLVER_CACHE_MAX_MB', '64')) * 1024 * 1024),
+)
+
+_counters: Dict[str, Dict[str, int]] = {}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str, outcome: str):
+    with _counters_lock:
+        counts = _counters.setdefault(name, {'hit': 0, 'miss': 0, 'bypass': 0})
+        counts[outcome] += 1
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+def _feed_numbers(digest: Any, values: np.ndarray, tolerance: float):
+    # Snap to the tolerance grid; + 0.0 folds -0.0 into 0.0
+    snapped = np.round(np.asarray(values, dtype=np.float64) / tolerance) + 0.0
+    digest.update(b'A%d;' % snapped.size)
+    digest.update(np.ascontiguousarray(snapped).tobytes())
+
+
+def _feed(digest: Any, value: Any, tolerance: float):
+    """Write a type-tagged canonical form of value into digest"""
+    if value is None:
+        digest.update(b'N')
+    elif isinstance(value, (bool, np.bool_)):
+        digest.update(b'T' if value else b'F')
+    elif _is_number(value):
+        _feed_numbers(digest, np.array([value]), tolerance)
+    elif isinstance(value, str):
+        encoded = value.encode()
+        digest.update(b'S%d;' % len(encoded))
+        digest.update(encoded)
+    elif isinstance(value, Mapping):
+        digest.update(b'D%d;' % len(value))
+        for key in sorted(value, key=str):
+            _feed(digest, str(key), tolerance)
+            _feed(digest, value[key], tolerance)
+    elif isinstance(value, np.ndarray) and value.dtype.kind in 'biuf':
+        digest.update(b'%d;' % value.ndim + str(value.shape).encode())
+        _feed_numbers(digest, value.ravel(), tolerance)
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        if len(value) and all(_is_number(v) for v in value):
+            _feed_numbers(digest, np.asarray(value, dtype=np.float64), tolerance)
+        else:
+            digest.update(b'L%d;' % len(value))
+            for item in value:
+                _feed(digest, item, tolerance)
+    else:
+        raise TypeError(f"Cannot canonicalize {type(value).__name__} for the solver cache.")
+
+
+def input_fingerprint(name: str, arguments: Mapping, tolerance: float = DEFAULT_TOLERANCE) -> str:
+    """
+    Stable hash of a solver call.
+
+    Args:
+        name: Solver identity (module-qualified function name)
+        arguments: Parameter name -> value, defaults applied
+        tolerance: Absolute rounding grid for floats
+
+    Returns:
+        Hex digest identifying the call
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _feed(digest, name, tolerance)
+    _feed(digest, arguments, tolerance)
+    return digest.hexdigest()
+
+
+def memoize_solver(
+    tolerance: Optional[float] = None,
+    bypass: Optional[Callable[[Mapping], bool]] = None,
+) -> Callable[[Callable[..., Dict[str, Any]]], Callable[..., Dict[str, Any]]]:
+    """
+    Cache a solver's dict results in solver_result_cache.
+
+    The wrapped solver takes an extra keyword, use_cache (default True);
+    use_cache=False skips both lookup and store. Results gain a 'cache'
+    entry: {'status': 'hit' | 'miss' | 'bypass', 'key', 'age_s'}.
+    Results with status 'error' or 'time_limit' (no solution) are not stored.
+
+    Args:
+        tolerance: Float rounding grid (default ECOS_SOLVER_CACHE_TOLERANCE)
+        bypass: Given the bound arguments, True for calls that must always
+            run (e.g. ones that read or update per-device state)
+    """
+    def decorate(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+        grid = tolerance or DEFAULT_TOLERANCE
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, use_cache: bool = True, **kwargs: Any) -> Dict[str, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = None
+            if use_cache and not (bypass and bypass(bound.arguments)):
+                try:
+                    key = input_fingerprint(name, bound.arguments, grid)
+                except TypeError:
+                    key = None
+            if key is None:
+                _count(name, 'bypass')
+                result = func(*args, **kwargs)
+                if isinstance(result, dict):
+                    result['cache'] = {'status': 'bypass'}
+                return result
+
+            cached = solver_result_cache.get(key)
+            if cached is not None:
+                stored_at, payload = cached
+                _count(name, 'hit')
+                result = pickle.loads(payload)
+                result['cache'] = {'status': 'hit', 'key': key, 'age_s': time.time() - stored_at}
+                return result
+
+            _count(name, 'miss')
+            result = func(*args, **kwargs)
+            if isinstance(result, dict):
+                if result.get('status') not in ('error', 'time_limit'):
+                    payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+                    solver_result_cache.put(key, (time.time(), payload), nbytes=len(payload))
+                result['cache'] = {'status': 'miss', 'key': key, 'age_s': 0.0}
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def get_solver_cache_stats() -> Dict[str, Any]:
+    """Counters of this process's solver result cache, overall and per solver"""
+    with _counters_lock:
+        per_solver = {name: dict(counts) for name, counts in _counters.items()}
+    return {'pid': os.getpid(), **solver_result_cache.stats(), 'solvers': per_solver}
+
+
+def clear_solver_cache():
+    solver_result_cache.clear()
+
+
+__all__ = [
+    'DEFAULT_TOLERANCE',
+    'solver_result_cache',
+    'input_fingerprint',
+    'memoize_solver',
+    'get_solver_cache_stats',
+    'clear_solver_cache',
+]
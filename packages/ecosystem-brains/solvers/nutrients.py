@@ -0,0 +1,201 @@
+"""
+Batch nutrient-cycle optimization for Closed-Loop Farm (#3) sites
+When every plot has its own waste stream the problem separates per plot
+and per nutrient, and the optimum is closed-form (allocate exactly the
+demand when the stream covers it), computed for all plots at once with
+NumPy. Only shared sources feeding many plots (a transport problem) go to
+an LP, one per nutrient.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from .limits import Deadline, pooled_solver, resolve_limits, time_limit_result
+from .memo import memoize_solver
+from .timing import timed_solver
+
+pywraplp = lazy_import('ortools.linear_solver.pywraplp')
+
+_EPS = 1e-9
+
+
+def _nutrient_arrays(
+    waste_inputs: Dict[str, Sequence[float]],
+    crop_demands: Dict[str, Sequence[float]],
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """(supply, demand) arrays per nutrient"""
+    missing = sorted(set(crop_demands) - set(waste_inputs))
+    if missing:
+        raise ValueError(f"waste_inputs has no entry for nutrients {missing}.")
+    return {
+        nutrient: (
+            np.asarray(waste_inputs[nutrient], dtype=np.float64),
+            np.asarray(demand, dtype=np.float64),
+        )
+        for nutrient, demand in crop_demands.items()
+    }
+
+
+def _plot_report(
+    plot_ids: List[str],
+    allocation: Dict[str, np.ndarray],
+    shortfall: Dict[str, np.ndarray],
+) -> Dict[str, Any]:
+    nutrients = list(shortfall)
+    short = np.zeros((len(nutrients), len(plot_ids)), dtype=bool)
+    for i, nutrient in enumerate(nutrients):
+        short[i] = shortfall[nutrient] > _EPS
+    feasible = ~short.any(axis=0)
+    return {
+        'status': 'optimal' if feasible.all() else 'partial',
+        'plot_ids': plot_ids,
+        'feasible': feasible.tolist(),
+        'infeasible_count': int((~feasible).sum()),
+        'allocation': {n: a.tolist() for n, a in allocation.items()},
+        'shortfall': {n: s.tolist() for n, s in shortfall.items()},
+        'infeasible_nutrients': {
+            plot_ids[j]: [nutrients[i] for i in np.flatnonzero(short[:, j])] for j in np.flatnonzero(~feasible)
+        },
+    }
+
+
+def _separable(arrays: Dict[str, Any], plot_ids: List[str]) -> Dict[str, Any]:
+    """Each plot draws only on its own waste: allocation = demand, capped by supply"""
+    allocation, shortfall, waste = {}, {}, {}
+    for nutrient, (supply, demand) in arrays.items():
+        if supply.shape != demand.shape:
+            raise ValueError(f"{nutrient}: waste_inputs and crop_demands need one value per plot.")
+        need = np.maximum(demand, 0.0)
+        allocation[nutrient] = np.minimum(need, supply)
+        shortfall[nutrient] = need - allocation[nutrient]
+        waste[nutrient] = supply - allocation[nutrient]
+    result = _plot_report(plot_ids, allocation, shortfall)
+    result['waste'] = {n: w.tolist() for n, w in waste.items()}
+    result['objective_value'] = float(sum(a.sum() for a in allocation.values()))
+    result['method'] = 'closed_form'
+    return result
+
+
+def _transport_lp(
+    solver: Any, supply: np.ndarray, demand: np.ndarray, costs: np.ndarray, deadline: Deadline
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Ship one nutrient from sources to plots at minimum cost. Unmet demand is
+    a slack priced above every route, so the LP is always feasible and
+    shortfalls show up per plot. Non-finite costs mark missing routes.
+
+    Returns:
+        Flows and unmet demand, or None if the time limit ran out first
+    """
+    n_sources, n_plots = costs.shape
+    finite = np.isfinite(costs)
+    penalty = 2.0 * float(costs[finite].max(initial=0.0)) + 1.0
+    routes = np.argwhere(finite)
+    flow = [solver.NumVar(0.0, solver.infinity(), '') for _ in range(len(routes))]
+    unmet = [solver.NumVar(0.0, max(float(d), 0.0), '') for d in demand]
+
+    by_source: List[List[Any]] = [[] for _ in range(n_sources)]
+    by_plot: List[List[Any]] = [[] for _ in range(n_plots)]
+    for var, (i, j) in zip(flow, routes.tolist()):
+        by_source[i].append(var)
+        by_plot[j].append(var)
+    for i in range(n_sources):
+        solver.Add(solver.Sum(by_source[i]) <= float(supply[i]))
+    for j in range(n_plots):
+        solver.Add(solver.Sum(by_plot[j]) + unmet[j] == max(float(demand[j]), 0.0))
+    objective = solver.Objective()
+    for var, (i, j) in zip(flow, routes.tolist()):
+        objective.SetCoefficient(var, float(costs[i, j]))
+    for var in unmet:
+        objective.SetCoefficient(var, penalty)
+    objective.SetMinimization()
+
+    solver.SetTimeLimit(deadline.remaining_ms())
+    if solver.Solve() != pywraplp.Solver.OPTIMAL:
+        if deadline.expired:
+            return None
+        raise RuntimeError("Transport LP did not reach optimality.")
+    shipped = np.zeros((n_sources, n_plots))
+    shipped[routes[:, 0], routes[:, 1]] = [var.solution_value() for var in flow]
+    return {'flows': shipped, 'unmet': np.array([var.solution_value() for var in unmet])}
+
+
+def _transport(
+    arrays: Dict[str, Any], plot_ids: List[str], costs: np.ndarray, time_limit_s: float
+) -> Dict[str, Any]:
+    for nutrient, (supply, demand) in arrays.items():
+        if costs.shape != (len(supply), len(demand)):
+            raise ValueError(
+                f"{nutrient}: transport_costs must be (sources x plots) = ({len(supply)} x {len(demand)})."
+            )
+    allocation, shortfall, waste, flows = {}, {}, {}, {}
+    total_cost = 0.0
+    # One budget for all nutrients' LPs; GLOP instances are reused between them
+    deadline = Deadline(time_limit_s)
+    for nutrient, (supply, demand) in arrays.items():
+        with pooled_solver('GLOP') as solver:
+            solved = _transport_lp(solver, supply, demand, costs, deadline)
+        if solved is None:
+            return time_limit_result(time_limit_s)
+        shipped = solved['flows']
+        allocation[nutrient] = shipped.sum(axis=0)
+        shortfall[nutrient] = solved['unmet']
+        waste[nutrient] = supply - shipped.sum(axis=1)
+        sources, plots = np.nonzero(shipped > _EPS)
+        flows[nutrient] = [[int(i), plot_ids[j], float(shipped[i, j])] for i, j in zip(sources, plots)]
+        total_cost += float((np.where(np.isfinite(costs), costs, 0.0) * shipped).sum())
+    result = _plot_report(plot_ids, allocation, shortfall)
+    result['waste'] = {n: w.tolist() for n, w in waste.items()}
+    result['flows'] = flows
+    result['objective_value'] = total_cost
+    result['method'] = 'lp'
+    return result
+
+
+@memoize_solver()
+@timed_solver
+def optimize_nutrient_cycle_batch(
+    waste_inputs: Dict[str, Sequence[float]],
+    crop_demands: Dict[str, Sequence[float]],
+    plot_ids: Optional[List[str]] = None,
+    transport_costs: Optional[Sequence[Sequence[Optional[float]]]] = None,
+    time_limit_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Nutrient allocation for many plots at once (#3)
+
+    Args:
+        waste_inputs: {nutrient: kg available}, one value per plot, or one
+            per shared source when transport_costs is given
+        crop_demands: {nutrient: kg required}, one value per plot
+        plot_ids: Plot names (default: '0', '1', ...)
+        transport_costs: Optional (sources x plots) cost per kg; None / inf
+            marks a source that cannot supply a plot. Makes the problem a
+            coupled transport LP instead of the closed-form per-plot case
+        time_limit_s: Wall-clock limit shared by the transport LPs (default
+            ECOS_SOLVER_TIME_LIMIT_S); status 'time_limit' if it runs out
+
+    Returns:
+        Per-plot allocation and shortfall per nutrient, feasibility flags,
+        leftover waste per source (and shipped flows in transport mode)
+    """
+    time_limit_s, _ = resolve_limits(time_limit_s)
+    arrays = _nutrient_arrays(waste_inputs, crop_demands)
+    n_plots = len(next(iter(arrays.values()))[1]) if arrays else 0
+    if plot_ids is None:
+        plot_ids = [str(j) for j in range(n_plots)]
+    elif len(plot_ids) != n_plots:
+        raise ValueError(f"plot_ids must have one entry per plot ({n_plots}).")
+    if transport_costs is None:
+        return _separable(arrays, plot_ids)
+    costs = np.array(
+        [[np.inf if c is None else c for c in row] for row in transport_costs], dtype=np.float64
+    )
+    return _transport(arrays, plot_ids, costs, time_limit_s)
+
+
+__all__ = ['optimize_nutrient_cycle_batch']
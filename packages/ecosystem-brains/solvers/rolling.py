@@ -0,0 +1,147 @@
+"""
+Rolling-horizon AWG re-optimization
+Keeps each device's last plan between calls so an hourly replan only
+re-solves what changed: hours already executed are locked to what ran,
+their water counts towards the target, and the previous plan (shifted onto
+the new horizon and repaired to meet the target) seeds the exact solver as
+its incumbent.
+
+awg_plan_cache lives in one worker process. Callers that spread a device's
+replans over several workers (the gateway's brain pool) keep the plan
+themselves and pass it back as previous_plan.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from caching import LRUTTLCache
+from .knapsack import solve_cover
+
+# Last plan per device: {'start_hour', 'schedule'} (per worker process)
+awg_plan_cache = LRUTTLCache(
+    max_entries=int(os.environ.get('ECOS_AWG_PLAN_ENTRIES', '10000')),
+    ttl_seconds=float(os.environ.get('ECOS_AWG_PLAN_TTL_SECONDS', '604800')),
+)
+
+
+def _previous_plan(state: Optional[Dict[str, Any]], start_hour: int, hours: int) -> Optional[np.ndarray]:
+    """A stored plan shifted onto [start_hour, start_hour + hours); -1 where it had no decision"""
+    if state is None:
+        return None
+    shifted = np.full(hours, -1, dtype=np.int8)
+    offset = state['start_hour'] - start_hour
+    previous = np.asarray(state['schedule'], dtype=np.int8)
+    lo, hi = max(0, offset), min(hours, offset + len(previous))
+    if lo >= hi:
+        return None
+    shifted[lo:hi] = previous[lo - offset:hi - offset]
+    return shifted
+
+
+def _repair(seed: np.ndarray, costs: np.ndarray, weights: np.ndarray, target: float) -> np.ndarray:
+    """Add the cheapest-per-liter hours to a shifted plan until it meets the target"""
+    seed = seed.copy()
+    short = target - float(weights[seed].sum())
+    if short > 0:
+        free = np.flatnonzero(~seed & (weights > 0))
+        free = free[np.argsort(costs[free] / weights[free], kind='stable')]
+        needed = np.searchsorted(np.cumsum(weights[free]), short) + 1
+        seed[free[:needed]] = True
+    return seed
+
+
+def rolling_awg_schedule(
+    device_id: str,
+    humidity_forecast: List[float],
+    energy_prices: List[float],
+    target_liters: float,
+    start_hour: int,
+    current_hour: Optional[int] = None,
+    run_windows: Optional[List[Dict[str, Any]]] = None,
+    time_limit_s: Optional[float] = None,
+    gap_limit: float = 0.0,
+    previous_plan: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Re-plan a device's AWG schedule over a shifted horizon.
+
+    Args:
+        device_id: Key of the stored plan
+        humidity_forecast: Humidity for hours start_hour, start_hour + 1, ...
+            (observed values for executed hours)
+        energy_prices: Prices for the same hours ($/kWh)
+        target_liters: Production target over the whole horizon
+        start_hour: Absolute index of the first hour (e.g. hours since epoch)
+        current_hour: First hour not yet executed (default: start_hour);
+            earlier hours are locked to the stored plan
+        run_windows: As for optimize_awg_schedule, relative to start_hour
+        time_limit_s: Search budget (None = unlimited); the best plan found
+            by then is stored and returned as 'feasible'
+        gap_limit: Relative optimality gap at which the search stops
+        previous_plan: The device's last plan, {'start_hour', 'schedule'}
+            as returned by the previous call; default: this process's
+            awg_plan_cache entry
+
+    Returns:
+        optimize_awg_schedule's result plus 'locked_hours' and 'warm_start';
+        status 'error' when hours are locked but no plan covers them
+    """
+    hours = len(humidity_forecast)
+    production_rate = np.asarray(humidity_forecast, dtype=np.float64) * 0.1
+    hourly_cost = np.asarray(energy_prices, dtype=np.float64)[:hours] * 2.0
+    locked = int(np.clip((start_hour if current_hour is None else current_hour) - start_hour, 0, hours))
+
+    if previous_plan is None:
+        previous_plan = awg_plan_cache.get(device_id)
+    previous = _previous_plan(previous_plan, start_hour, hours)
+    if locked and previous is None:
+        # Without the plan there is no telling which executed hours ran
+        return {
+            'status': 'error',
+            'message': f"No stored plan for device {device_id!r} covers the {locked} executed hours.",
+            'locked_hours': locked,
+        }
+    schedule = np.zeros(hours, dtype=bool)
+    if previous is not None:
+        # Executed hours ran as planned; hours the old plan never covered did not run
+        schedule[:locked] = previous[:locked] == 1
+
+    allowed = np.ones(hours, dtype=bool)
+    if run_windows is not None:
+        allowed[:] = False
+        for window in run_windows:
+            allowed[window['start_index']:window['end_index']] = True
+    allowed[:locked] = False
+
+    free = np.flatnonzero(allowed)
+    costs, weights = hourly_cost[free], production_rate[free]
+    remaining = target_liters - float(production_rate[schedule].sum())
+
+    seed = None
+    if previous is not None:
+        seed = _repair(previous[free] == 1, costs, weights, remaining)
+    cover = solve_cover(costs, weights, remaining, incumbent=seed, time_limit_s=time_limit_s, gap_limit=gap_limit)
+    if cover.selection is None:
+        return {'status': 'infeasible', 'message': 'No solution found', 'locked_hours': locked}
+    schedule[free[cover.selection]] = True
+    awg_plan_cache.put(device_id, {'start_hour': start_hour, 'schedule': schedule.astype(np.int8)})
+
+    total_production = float(production_rate[schedule].sum())
+    total_cost = float(hourly_cost[schedule].sum())
+    return {
+        'status': cover.status,
+        'optimality_gap': cover.gap,
+        'schedule': schedule.astype(int).tolist(),
+        'total_production_liters': total_production,
+        'total_cost_usd': total_cost,
+        'cost_per_liter': total_cost / total_production if total_production > 0 else 0,
+        'locked_hours': locked,
+        'warm_start': seed is not None,
+    }
+
+
+__all__ = ['awg_plan_cache', 'rolling_awg_schedule']
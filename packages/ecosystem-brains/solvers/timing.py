@@ -0,0 +1,102 @@
+"""
+Solve-time histograms
+Each solver function records the wall time of every solve it actually runs
+(memoized hits are not solves) into fixed buckets, with totals and a count
+per result status, so slow or limit-bound solvers show up in the stats.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from .limits import get_backend_pool_stats
+
+# Bucket upper bounds (seconds); the last bucket counts everything slower
+SOLVE_TIME_BUCKETS_S = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
+
+_histograms: Dict[str, Dict[str, Any]] = {}
+_histograms_lock = threading.Lock()
+
+
+def record_solve_time(name: str, seconds: float, status: str = 'unknown'):
+    bucket = int(np.searchsorted(SOLVE_TIME_BUCKETS_S, seconds))
+    with _histograms_lock:
+        entry = _histograms.get(name)
+        if entry is None:
+            entry = _histograms[name] = {
+                'count': 0,
+                'total_s': 0.0,
+                'max_s': 0.0,
+                'buckets': [0] * (len(SOLVE_TIME_BUCKETS_S) + 1),
+                'statuses': {},
+            }
+        entry['count'] += 1
+        entry['total_s'] += seconds
+        entry['max_s'] = max(entry['max_s'], seconds)
+        entry['buckets'][bucket] += 1
+        entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+
+
+def timed_solver(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+    """Record each call's wall time and result status under the solver's qualified name"""
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+        started = time.perf_counter()
+        status = 'exception'
+        try:
+            result = func(*args, **kwargs)
+            status = str(result.get('status', 'unknown')) if isinstance(result, dict) else 'unknown'
+            return result
+        finally:
+            record_solve_time(name, time.perf_counter() - started, status)
+
+    return wrapper
+
+
+def get_solver_timing_stats() -> Dict[str, Any]:
+    """
+    Solve-time histograms of this process, per solver function.
+
+    Returns:
+        'buckets_s' (upper bounds; a final open-ended bucket follows), and
+        per solver: count, total / mean / max seconds, per-bucket counts and
+        counts per result status; plus solver instances created vs reused
+    """
+    with _histograms_lock:
+        solvers = {
+            name: {
+                **entry,
+                'mean_s': entry['total_s'] / entry['count'],
+                'buckets': list(entry['buckets']),
+                'statuses': dict(entry['statuses']),
+            }
+            for name, entry in _histograms.items()
+        }
+    return {
+        'pid': os.getpid(),
+        'buckets_s': list(SOLVE_TIME_BUCKETS_S),
+        'solvers': solvers,
+        'backends': get_backend_pool_stats(),
+    }
+
+
+def reset_solver_timing_stats():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+__all__ = [
+    'SOLVE_TIME_BUCKETS_S',
+    'record_solve_time',
+    'timed_solver',
+    'get_solver_timing_stats',
+    'reset_solver_timing_stats',
+]
@@ -0,0 +1,336 @@
+"""
+Multi-source nutrient transport for Closed-Loop Farm (#3) sites
+Compost and digestate are hauled from several sources to many fields. Each
+source material carries its own N/P/K content per tonne, so one shipment
+feeds every nutrient at once: the model is sources x sinks (tonnes hauled
+per route) x nutrients (demand rows), solved as one GLOP LP. The LP starts
+from each field's nearest sources only and grows by pricing: after each
+solve, routes left out whose reduced cost (from the LP duals) is negative
+are added and the LP re-solved, until the duals certify the plan is within
+a gap tolerance of the optimum over every route. Each LP's constraint
+matrix is handed to OR-Tools as one CSR matrix built with NumPy rather than
+coefficient by coefficient.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from lazy_imports import lazy_import
+from .limits import Deadline, resolve_limits, time_limit_result
+from .memo import memoize_solver
+from .timing import timed_solver
+
+model_builder_helper = lazy_import('ortools.linear_solver.python.model_builder_helper')
+sparse = lazy_import('scipy.sparse')
+
+EARTH_RADIUS_KM = 6371.0
+DEFAULT_HAUL_COST_PER_T_KM = 0.15
+
+# Routes per sink in the first LP; the rest enter only when pricing says they pay off
+DEFAULT_NEAREST_SOURCES = 10
+
+# Pricing stops once the plan is certified within this relative gap
+DEFAULT_GAP_TOLERANCE = 1e-3
+
+# Dual simplex is several times faster than primal on these transport LPs
+GLOP_PARAMETERS = 'use_dual_simplex: true'
+
+_EPS = 1e-9
+_PRICING_TOL = 1e-7
+
+
+def haversine_km(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """Great-circle distance (km); broadcasts like NumPy arithmetic"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_routes(distance_km: np.ndarray, eligible: np.ndarray, k: int) -> np.ndarray:
+    """Boolean (sources x sinks) mask of each sink's k closest eligible sources"""
+    if k >= distance_km.shape[0]:
+        return eligible.copy()
+    ranked = np.where(eligible, distance_km, np.inf)
+    nearest = np.argpartition(ranked, k - 1, axis=0)[:k]
+    mask = np.zeros_like(eligible)
+    np.put_along_axis(mask, nearest, True, axis=0)
+    return mask & eligible
+
+
+def _solve_routes(
+    src: np.ndarray,
+    dst: np.ndarray,
+    route_cost: np.ndarray,
+    content: np.ndarray,
+    supply_t: np.ndarray,
+    demand: np.ndarray,
+    max_application: np.ndarray,
+    route_capacity_t: Optional[float],
+    penalty: float,
+    time_limit_s: float,
+) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Build the LP over the given routes as one CSR matrix and solve it with GLOP.
+
+    Columns: tonnes per route, then unmet kg per (sink, nutrient) with demand.
+    Rows: source supply, sink demand per nutrient, field application limit.
+
+    Returns:
+        Route tonnes, unmet kg (sinks x nutrients) and the row duals split by
+        row block, or None if GLOP did not reach optimality within time_limit_s
+    """
+    n_sources, n_routes = len(supply_t), len(src)
+    n_sinks, n_nutrients = demand.shape
+    slack_sink, slack_nutrient = np.nonzero(demand > 0)
+    capped = np.flatnonzero(np.isfinite(max_application))
+    application_row = np.full(n_sinks, -1)
+    application_row[capped] = np.arange(len(capped))
+
+    demand_base = n_sources
+    application_base = demand_base + n_sinks * n_nutrients
+    route_cols = np.arange(n_routes)
+    feeds = content[src] > 0
+    feed_route, feed_nutrient = np.nonzero(feeds)
+    limited = application_row[dst] >= 0
+    rows = np.concatenate([
+        src,
+        demand_base + dst[feed_route] * n_nutrients + feed_nutrient,
+        application_base + application_row[dst[limited]],
+        demand_base + slack_sink * n_nutrients + slack_nutrient,
+    ])
+    cols = np.concatenate([route_cols, feed_route, route_cols[limited], n_routes + np.arange(len(slack_sink))])
+    values = np.concatenate([
+        np.ones(n_routes),
+        content[src][feeds],
+        np.ones(int(limited.sum())),
+        np.ones(len(slack_sink)),
+    ])
+    n_cols = n_routes + len(slack_sink)
+    matrix = sparse.csr_matrix((values, (rows, cols)), shape=(application_base + len(capped), n_cols))
+
+    model = model_builder_helper.ModelBuilderHelper()
+    model.fill_model_from_sparse_data(
+        np.zeros(n_cols),
+        np.concatenate([
+            np.full(n_routes, np.inf if route_capacity_t is None else float(route_capacity_t)),
+            demand[slack_sink, slack_nutrient],
+        ]),
+        np.concatenate([route_cost, np.full(len(slack_sink), penalty)]),
+        np.concatenate([np.full(n_sources, -np.inf), demand.ravel(), np.full(len(capped), -np.inf)]),
+        np.concatenate([supply_t, np.full(demand.size, np.inf), max_application[capped]]),
+        matrix,
+    )
+
+    solver = model_builder_helper.ModelSolverHelper('glop')
+    solver.set_solver_specific_parameters(GLOP_PARAMETERS)
+    solver.set_time_limit_in_seconds(time_limit_s)
+    solver.solve(model)
+    if solver.status() != model_builder_helper.SolveStatus.OPTIMAL:
+        return None
+
+    solution = np.asarray(solver.variable_values())
+    duals = np.asarray(solver.dual_values())
+    shortfall = np.zeros(demand.shape)
+    shortfall[slack_sink, slack_nutrient] = solution[n_routes:]
+    application_dual = np.zeros(n_sinks)
+    application_dual[capped] = duals[application_base:]
+    return {
+        'tonnes': solution[:n_routes],
+        'shortfall': shortfall,
+        'supply_dual': duals[:n_sources],
+        'demand_dual': duals[demand_base:application_base].reshape(n_sinks, n_nutrients),
+        'application_dual': application_dual,
+    }
+
+
+@memoize_solver()
+@timed_solver
+def optimize_nutrient_transport(
+    sources: List[Dict[str, Any]],
+    sinks: List[Dict[str, Any]],
+    nutrients: Sequence[str] = ('N', 'P', 'K'),
+    distance_km: Optional[Sequence[Sequence[Optional[float]]]] = None,
+    haul_cost_per_t_km: float = DEFAULT_HAUL_COST_PER_T_KM,
+    max_haul_km: Optional[float] = None,
+    nearest_sources: Optional[int] = DEFAULT_NEAREST_SOURCES,
+    route_capacity_t: Optional[float] = None,
+    gap_tolerance: float = DEFAULT_GAP_TOLERANCE,
+    max_pricing_rounds: Optional[int] = None,
+    time_limit_s: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Minimum-cost hauling plan from compost / digestate sources to fields (#3)
+
+    Args:
+        sources: [{'id', 'supply_t' (tonnes available), 'composition'
+            ({nutrient: kg per tonne}), 'lat', 'lon', optional
+            'cost_per_t' (loading / material cost)}]
+        sinks: [{'id', 'demand' ({nutrient: kg}), 'lat', 'lon', optional
+            'max_application_t' (tonnes the field may receive)}]
+        nutrients: Nutrients to balance
+        distance_km: Optional (sources x sinks) haul distances replacing the
+            great-circle distance from lat / lon; None marks no route
+        haul_cost_per_t_km: Trucking cost per tonne-kilometre
+        max_haul_km: Routes longer than this are never used
+        nearest_sources: Start from each sink's k closest sources and add
+            further routes only when their reduced cost shows they pay off
+            (None models every route up front)
+        route_capacity_t: Tonnes any single route may carry
+        gap_tolerance: Stop adding routes once the plan is provably within
+            this relative gap of the optimum over every route (0 = exact)
+        max_pricing_rounds: Cap on LP solves; 1 solves the nearest-source
+            model only. The remaining gap is reported either way, and a
+            plan stopped above gap_tolerance is 'feasible', not 'optimal'
+        time_limit_s: Wall-clock limit over all pricing rounds (default
+            ECOS_SOLVER_TIME_LIMIT_S). When it runs out after the first LP,
+            the last solved plan is returned as 'feasible' with its
+            certified gap; before it, status is 'time_limit'
+
+    Returns:
+        Hauled tonnes per route, delivered and unmet nutrients per sink
+        (unmet demand is priced above any delivery, so a short district is
+        'partial' rather than infeasible), leftover supply per source, haul
+        and material cost, the certified optimality gap, model size and timings
+    """
+    started = time.perf_counter()
+    time_limit_s, _ = resolve_limits(time_limit_s)
+    deadline = Deadline(time_limit_s)
+    if not sources or not sinks:
+        raise ValueError("sources and sinks must each list at least one site.")
+    if nearest_sources is not None and nearest_sources < 1:
+        raise ValueError(f"nearest_sources must be at least 1; received {nearest_sources}.")
+    nutrients = list(nutrients)
+
+    supply_t = np.array([float(s['supply_t']) for s in sources])
+    material_cost = np.array([float(s.get('cost_per_t', 0.0)) for s in sources])
+    content = np.array([[float(s['composition'].get(n, 0.0)) for n in nutrients] for s in sources])
+    demand = np.array([[float(k['demand'].get(n, 0.0)) for n in nutrients] for k in sinks])
+    max_application = np.array([float(k.get('max_application_t', np.inf)) for k in sinks])
+
+    if distance_km is None:
+        distance = haversine_km(
+            np.array([float(s['lat']) for s in sources])[:, None],
+            np.array([float(s['lon']) for s in sources])[:, None],
+            np.array([float(k['lat']) for k in sinks])[None, :],
+            np.array([float(k['lon']) for k in sinks])[None, :],
+        )
+    else:
+        distance = np.array([[np.inf if d is None else d for d in row] for row in distance_km], dtype=np.float64)
+        if distance.shape != (len(sources), len(sinks)):
+            raise ValueError(f"distance_km must be (sources x sinks) = ({len(sources)} x {len(sinks)}).")
+
+    eligible = np.isfinite(distance) & (supply_t > 0)[:, None]
+    if max_haul_km is not None:
+        eligible &= distance <= max_haul_km
+    cost = np.where(eligible, distance * haul_cost_per_t_km + material_cost[:, None], np.inf)
+    active = eligible if nearest_sources is None else nearest_routes(distance, eligible, nearest_sources)
+
+    # One kg of unmet nutrient must cost more than delivering it over any usable route
+    positive = content[content > 0]
+    penalty = 2.0 * float(cost[eligible].max(initial=0.0)) / float(positive.min(initial=1.0)) + 1.0
+
+    # Most any route can carry; bounds the gain from a route not yet modelled
+    route_cap = np.minimum(supply_t[:, None], max_application[None, :])
+    if route_capacity_t is not None:
+        route_cap = np.minimum(route_cap, float(route_capacity_t))
+
+    rounds, gap, solve_s, plan, limit_hit = 0, 0.0, 0.0, None, False
+    while True:
+        if plan is not None and deadline.expired:
+            limit_hit = True
+            break
+        src, dst = np.nonzero(active)
+        solve_started = time.perf_counter()
+        solved = _solve_routes(
+            src, dst, cost[src, dst], content, supply_t, demand, max_application, route_capacity_t, penalty,
+            deadline.remaining(),
+        )
+        solve_s += time.perf_counter() - solve_started
+        if solved is None:
+            if not deadline.expired:
+                return {'status': 'infeasible', 'message': 'GLOP did not reach optimality'}
+            if plan is None:
+                return time_limit_result(time_limit_s)
+            # The previous round's plan and gap stand
+            limit_hit = True
+            break
+        rounds += 1
+        plan = (solved, src, dst)
+        if active is eligible:
+            break
+        # Price the routes left out: a negative reduced cost means hauling on them lowers the optimum
+        reduced = (
+            cost
+            - solved['supply_dual'][:, None]
+            - content @ solved['demand_dual'].T
+            - solved['application_dual'][None, :]
+        )
+        entering = eligible & ~active & (reduced < -_PRICING_TOL)
+        if not entering.any():
+            gap = 0.0
+            break
+        # Lagrangian bound: no plan over all routes beats the current one by more than this
+        objective = float(cost[src, dst] @ solved['tonnes']) + penalty * float(solved['shortfall'].sum())
+        improvement = -float(reduced[entering] @ route_cap[entering])
+        gap = improvement / max(abs(objective), _EPS)
+        if gap <= gap_tolerance or (max_pricing_rounds is not None and rounds >= max_pricing_rounds):
+            break
+        active = active | entering
+
+    solved, src, dst = plan
+    tonnes, shortfall = solved['tonnes'], solved['shortfall']
+    delivered = np.zeros(demand.shape)
+    np.add.at(delivered, dst, tonnes[:, None] * content[src])
+    used = np.bincount(src, weights=tonnes, minlength=len(sources))
+    hauled_km = distance[src, dst]
+    short = shortfall > _EPS
+    shipped = np.flatnonzero(tonnes > _EPS)
+
+    if short.any():
+        status = 'partial'
+    elif limit_hit or gap > gap_tolerance:
+        # Stopped by the time limit or the round cap before pricing proved the plan
+        status = 'feasible'
+    else:
+        status = 'optimal'
+    return {
+        'status': status,
+        'shipments': [
+            {
+                'source': sources[src[r]]['id'],
+                'sink': sinks[dst[r]]['id'],
+                'tonnes': float(tonnes[r]),
+                'distance_km': float(hauled_km[r]),
+            }
+            for r in shipped.tolist()
+        ],
+        'delivered': {k['id']: dict(zip(nutrients, row)) for k, row in zip(sinks, delivered.tolist())},
+        'unmet': {
+            sinks[j]['id']: {nutrients[k]: float(shortfall[j, k]) for k in np.flatnonzero(short[j])}
+            for j in np.flatnonzero(short.any(axis=1))
+        },
+        'remaining_supply_t': {s['id']: float(left) for s, left in zip(sources, supply_t - used)},
+        'haul_cost_usd': float(tonnes @ hauled_km) * haul_cost_per_t_km,
+        'material_cost_usd': float(used @ material_cost),
+        'tonne_km': float(tonnes @ hauled_km),
+        'routes_eligible': int(eligible.sum()),
+        'routes_modelled': int(len(src)),
+        'pricing_rounds': rounds,
+        'optimality_gap': gap,
+        'time_limit_reached': limit_hit,
+        'solve_time_s': solve_s,
+        'total_time_s': time.perf_counter() - started,
+    }
+
+
+__all__ = [
+    'DEFAULT_NEAREST_SOURCES',
+    'DEFAULT_GAP_TOLERANCE',
+    'haversine_km',
+    'nearest_routes',
+    'optimize_nutrient_transport',
+]
@@ -0,0 +1,85 @@
+"""
+Unit tests for rolling-origin forecast backtesting
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from forecasting import backtest, summarize_backtest
+from forecasting.backtest import backtest_series, rolling_origins
+
+
+def _history(n: int, phase: float = 0.0) -> dict:
+    ds = pd.date_range('2024-01-01', periods=n, freq='h')
+    y = 70.0 + 8.0 * np.sin(np.arange(n) * 2 * np.pi / 24 + phase)
+    return {'timestamp': [t.isoformat() for t in ds], 'humidity': y.tolist()}
+
+
+def test_rolling_origins():
+    """Cutoffs end one horizon before the series end and respect the minimum history"""
+    assert list(rolling_origins(100, 10, n_folds=3)) == [70, 80, 90]
+    assert list(rolling_origins(100, 10, n_folds=3, step=5)) == [80, 85, 90]
+    assert list(rolling_origins(40, 10, n_folds=5)) == [20, 30]
+    try:
+        rolling_origins(15, 10)
+        assert False, "Expected ValueError for a series shorter than one fold"
+    except ValueError:
+        pass
+    print("✓ Rolling origins cover the most recent folds")
+
+
+def test_backtest_scores_fallback_models():
+    """Seasonal-naive is exact on a purely daily series and beats flat smoothing"""
+    history = _history(24 * 6)
+    frame = pd.DataFrame({'ds': pd.to_datetime(history['timestamp']), 'y': history['humidity']})
+    rows = backtest_series(frame, 'seasonal_naive', horizon=24, n_folds=2)
+    assert [row['train_rows'] for row in rows] == [96, 120]
+    assert all(row['mae'] < 1e-9 and row['error'] == '' for row in rows)
+
+    results = backtest(
+        {'a': history, 'b': _history(24 * 6, phase=1.0), 'short': _history(30)},
+        value_column='humidity', backends=['seasonal_naive', 'exp_smoothing'], n_folds=2, max_workers=1,
+    )
+    assert len(results) == 2 * 2 * 2 + 2
+    assert results[results['series_id'] == 'short']['error'].str.startswith('ValueError').all()
+
+    summary = summarize_backtest(results)
+    best = summary.groupby('series_id').first()['backend']
+    assert (best == 'seasonal_naive').all()
+    assert (summary['folds'] == 2).all()
+    print("✓ Backtest scores fallback models per series")
+
+
+def test_backtest_model_backends_write_csv():
+    """Model backends run in worker processes and the table round-trips through CSV"""
+    series = {'a': _history(24 * 5), 'b': _history(24 * 5, phase=0.5)}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'backtest.csv')
+        results = backtest(
+            series, value_column='humidity', backends=['online', 'lstm'], n_folds=2, max_workers=2,
+            lstm_options={'window': 24, 'epochs': 2}, output_path=path,
+        )
+        written = pd.read_csv(path, keep_default_na=False)
+    assert len(written) == len(results) == 2 * 2 * 2
+    assert (results['error'] == '').all()
+    assert np.isfinite(results['mae']).all() and (results['fit_s'] > 0).all()
+    try:
+        from forecasting import write_backtest
+        import pyarrow  # noqa: F401
+    except ImportError:
+        try:
+            write_backtest(results, os.path.join(tempfile.gettempdir(), 'backtest.parquet'))
+            assert False, "Expected ValueError without a Parquet engine"
+        except ValueError:
+            pass
+    print("✓ Model backends backtest in parallel and write CSV")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Forecast Backtest Tests ===\n")
+    test_rolling_origins()
+    test_backtest_scores_fallback_models()
+    test_backtest_model_backends_write_csv()
+    print("\n✓ All forecast backtest tests passed!\n")
@@ -0,0 +1,66 @@
+"""
+Unit tests for the shared LRU/TTL cache
+"""
+
+from caching import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_order():
+    """Least-recently-used entry is evicted first"""
+    cache = LRUTTLCache(max_entries=2, ttl_seconds=None)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.put('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+    print("✓ LRU eviction order")
+
+
+def test_ttl_expiry():
+    """Entries expire after their TTL and count as misses"""
+    clock = FakeClock()
+    cache = LRUTTLCache(max_entries=10, ttl_seconds=60.0, clock=clock)
+    cache.put('a', 1)
+    clock.now = 59.0
+    assert cache.get('a') == 1
+    clock.now = 61.0
+    assert cache.get('a') is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['expirations'] == 1
+    print("✓ TTL expiry")
+
+
+def test_memory_budget():
+    """Byte budget evicts old entries and rejects oversized values"""
+    cache = LRUTTLCache(max_entries=10, ttl_seconds=None, max_bytes=100)
+    cache.put('a', 'x', nbytes=60)
+    cache.put('b', 'y', nbytes=60)
+    assert 'a' not in cache
+    assert cache.stats()['bytes'] == 60
+
+    assert cache.put('huge', 'z', nbytes=500) is False
+    assert cache.stats()['rejections'] == 1
+    print("✓ Memory budget enforced")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Caching Tests ===\n")
+    test_lru_eviction_order()
+    test_ttl_expiry()
+    test_memory_budget()
+    print("\n✓ All caching tests passed!\n")
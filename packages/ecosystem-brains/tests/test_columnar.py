@@ -0,0 +1,76 @@
+"""
+Unit tests for the binary columnar history encoding
+"""
+
+import numpy as np
+from forecasting import (
+    COLUMNAR_CONTENT_TYPE,
+    encode_columns,
+    decode_history,
+    forecast_stream_flow,
+)
+
+
+def _columns(n: int = 48):
+    timestamps = np.datetime64('2024-01-01T00:00', 'ns') + np.arange(n) * np.timedelta64(1, 'h')
+    return {
+        'timestamp': timestamps,
+        'flow': 5.0 + 0.1 * np.arange(n),
+        'cycles': np.arange(n, dtype=np.int32),
+    }
+
+
+def test_columnar_round_trip_is_zero_copy():
+    """Decoded columns are typed views over the payload"""
+    payload = encode_columns(_columns())
+    columns = decode_history(payload, COLUMNAR_CONTENT_TYPE)
+
+    assert list(columns) == ['timestamp', 'flow', 'cycles']
+    assert columns['timestamp'].dtype == np.dtype('datetime64[ns]')
+    assert columns['cycles'].dtype == np.dtype('int64')
+    assert np.array_equal(columns['flow'], _columns()['flow'])
+    assert np.shares_memory(columns['flow'], np.frombuffer(payload, dtype=np.uint8))
+    print(f"✓ Columnar round trip ({len(payload)} bytes)")
+
+
+def test_columnar_rejects_malformed_payloads():
+    """Truncated or foreign payloads raise ValueError"""
+    payload = encode_columns(_columns())
+    for bad in (b'', payload[:-8], b'JSON' + payload[4:]):
+        try:
+            decode_history(bad, COLUMNAR_CONTENT_TYPE)
+            assert False, "malformed payload was accepted"
+        except ValueError:
+            pass
+    try:
+        encode_columns({'a': np.zeros(3), 'b': np.zeros(4)})
+        assert False, "ragged columns were accepted"
+    except ValueError:
+        pass
+    print("✓ Malformed columnar payloads rejected")
+
+
+def test_forecast_accepts_decoded_columns():
+    """Helpers take decoded NumPy columns like JSON lists"""
+    columns = _columns()
+    from_binary = forecast_stream_flow(
+        decode_history(encode_columns(columns), COLUMNAR_CONTENT_TYPE), hours_ahead=6, method='online'
+    )
+    from_json = forecast_stream_flow(
+        {
+            'timestamp': [str(t) for t in columns['timestamp']],
+            'flow': columns['flow'].tolist(),
+        },
+        hours_ahead=6,
+        method='online',
+    )
+    assert from_binary == from_json
+    print("✓ Forecast accepts binary columns")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Columnar Encoding Tests ===\n")
+    test_columnar_round_trip_is_zero_copy()
+    test_columnar_rejects_malformed_payloads()
+    test_forecast_accepts_decoded_columns()
+    print("\n✓ All columnar encoding tests passed!\n")
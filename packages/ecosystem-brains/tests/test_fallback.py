@@ -0,0 +1,135 @@
+"""
+Unit tests for deadline-bounded forecasting and fallback models
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from forecasting import fallback as fallback_module
+from forecasting import forecast_humidity
+from forecasting.fallback import (
+    exponential_smoothing_forecast,
+    forecast_with_deadline,
+    seasonal_naive_forecast,
+)
+from forecasting.horizon import HorizonForecast
+
+
+def _hourly_frame(n: int) -> pd.DataFrame:
+    ds = pd.Timestamp('2024-01-01') + pd.Timedelta(hours=1) * np.arange(n)
+    y = 70.0 + 8.0 * np.sin(np.arange(n) * 2 * np.pi / 24) + 0.01 * np.arange(n)
+    return pd.DataFrame({'ds': ds, 'y': y})
+
+
+def test_fallback_models():
+    """Seasonal-naive repeats the last day; SES matches the recursive level"""
+    df = _hourly_frame(24 * 7)
+    naive = seasonal_naive_forecast(df, periods=30)
+    assert np.allclose(naive.yhat[:24], df['y'].to_numpy()[-24:])
+    assert np.allclose(naive.yhat[24:], df['y'].to_numpy()[-24:-18])
+    assert np.all(naive.yhat_upper[24:] - naive.yhat[24:] > naive.yhat_upper[0] - naive.yhat[0])
+    assert naive.ds[0] == df['ds'].iloc[-1] + pd.Timedelta(hours=1)
+
+    alpha = 0.3
+    level = df['y'].iloc[0]
+    for value in df['y'].iloc[1:]:
+        level = alpha * value + (1 - alpha) * level
+    smoothed = exponential_smoothing_forecast(df, periods=6, alpha=alpha)
+    assert np.allclose(smoothed.yhat, level, atol=1e-4)
+    assert np.all(np.diff(smoothed.yhat_upper) >= 0)
+    print("✓ Fallback models match their definitions")
+
+
+def test_deadline_returns_fallback_for_slow_primary():
+    """A primary that overruns the deadline is replaced by the fallback"""
+    def slow():
+        time.sleep(0.5)
+        return HorizonForecast(ds=np.array([], dtype='datetime64[ns]'), yhat=np.array([1.0]))
+
+    def quick():
+        return HorizonForecast(ds=np.array([], dtype='datetime64[ns]'), yhat=np.array([2.0]))
+
+    started = time.perf_counter()
+    forecast, on_time = forecast_with_deadline(slow, quick, deadline_ms=50)
+    assert not on_time and forecast.yhat[0] == 2.0
+    assert time.perf_counter() - started < 0.4
+
+    forecast, on_time = forecast_with_deadline(quick, slow, deadline_ms=5000)
+    assert on_time and forecast.yhat[0] == 2.0
+    print("✓ Deadline falls back for a slow primary")
+
+
+def test_deadline_bounds_primaries_in_flight():
+    """A queued primary is cancelled at the deadline; a saturated executor skips the primary"""
+    release = threading.Event()
+    ran = []
+
+    def primary(name):
+        def run():
+            if name == 'blocking':
+                release.wait(5)
+            ran.append(name)
+            return HorizonForecast(ds=np.array([], dtype='datetime64[ns]'), yhat=np.array([1.0]))
+        return run
+
+    def quick():
+        return HorizonForecast(ds=np.array([], dtype='datetime64[ns]'), yhat=np.array([2.0]))
+
+    saved = fallback_module._executor, fallback_module._pending
+    saved_env = {name: os.environ.get(name) for name in ('ECOS_FORECAST_DEADLINE_THREADS', 'ECOS_FORECAST_DEADLINE_PENDING')}
+    os.environ['ECOS_FORECAST_DEADLINE_THREADS'] = '1'
+    os.environ['ECOS_FORECAST_DEADLINE_PENDING'] = '2'
+    fallback_module._executor = fallback_module._pending = None
+    try:
+        # Occupies the only thread; the next primary queues behind it and is cancelled
+        assert not forecast_with_deadline(primary('blocking'), quick, deadline_ms=20)[1]
+        assert not forecast_with_deadline(primary('cancelled'), quick, deadline_ms=20)[1]
+
+        # Fill the second slot from another caller, then a third call skips its primary
+        waiting = threading.Thread(target=forecast_with_deadline, args=(primary('queued'), quick, 5000))
+        waiting.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        forecast, on_time = forecast_with_deadline(primary('skipped'), quick, deadline_ms=5000)
+        assert not on_time and forecast.yhat[0] == 2.0
+        assert time.perf_counter() - started < 1.0
+
+        release.set()
+        waiting.join()
+        executor = fallback_module._executor
+        executor.shutdown(wait=True)
+        assert ran == ['blocking', 'queued']
+    finally:
+        release.set()
+        fallback_module._executor, fallback_module._pending = saved
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    print("✓ Deadline primaries are bounded and cancelled while queued")
+
+
+def test_forecast_helper_marks_model():
+    """Helpers report which model produced the forecast"""
+    df = _hourly_frame(24 * 5)
+    history = {'timestamp': [t.isoformat() for t in df['ds']], 'humidity': df['y'].tolist()}
+
+    primary = forecast_humidity(history, method='online', deadline_ms=10_000)
+    assert primary['model'] == 'online'
+    fallback = forecast_humidity(history, use_cache=False, deadline_ms=1, fallback='exp_smoothing')
+    assert fallback['model'] == 'exp_smoothing'
+    assert 'windows' in fallback
+    print("✓ Forecast response marks the model used")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Forecast Deadline Tests ===\n")
+    test_fallback_models()
+    test_deadline_returns_fallback_for_slow_primary()
+    test_deadline_bounds_primaries_in_flight()
+    test_forecast_helper_marks_model()
+    print("\n✓ All forecast deadline tests passed!\n")
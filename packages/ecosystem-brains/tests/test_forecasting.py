@@ -4,13 +4,20 @@ Validates Level 1 completion criteria
 """
 
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+from forecasting import batch
 from forecasting import (
     forecast_stream_flow,
     forecast_solar_irradiance,
     forecast_humidity,
+    forecast_stream_flow_batch,
     predict_bulb_failure,
+    predict_bulb_failure_batch,
+    top_k_indices,
     ProphetForecaster,
+    get_forecast_cache_stats,
+    clear_forecast_cache,
 )
 
 
@@ -70,6 +77,52 @@ def test_forecast_humidity():
     print(f"✓ AWG (#9) forecast: {result['predicted_humidity']:.2f}% humidity")
 
 
+def test_forecast_batch_isolates_errors():
+    """Batch forecasting returns per-series results and per-series errors"""
+    timestamps = [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(48)]
+    good = {
+        'timestamp': [t.isoformat() for t in timestamps],
+        'flow': [5.0 + i * 0.1 for i in range(48)],
+    }
+    series = {
+        'turbine-1': good,
+        'turbine-2': {**good, 'flow': [4.0 + i * 0.05 for i in range(48)]},
+        'turbine-bad': {'timestamp': good['timestamp'][:1], 'flow': [5.0]},
+    }
+
+    result = forecast_stream_flow_batch(series, hours_ahead=6, max_workers=2)
+
+    assert list(result['results']) == ['turbine-1', 'turbine-2']
+    assert 'turbine-bad' in result['errors']
+    assert result['failed_count'] == 1
+    assert result['results']['turbine-1']['predicted_flow'] > 0
+    print(f"✓ Batch forecast: {len(result['results'])} ok, {result['failed_count']} failed")
+
+
+def test_forecast_batch_reuses_pool():
+    """Batches share one worker pool, and a chunk failing in the pool only fails its own series"""
+    timestamps = [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(48)]
+    good = {
+        'timestamp': [t.isoformat() for t in timestamps],
+        'flow': [5.0 + i * 0.1 for i in range(48)],
+    }
+    series = {'turbine-1': good, 'turbine-2': good, 'turbine-3': good}
+
+    forecast_stream_flow_batch(series, hours_ahead=6, max_workers=2)
+    pool = batch._pool
+    result = forecast_stream_flow_batch(series, hours_ahead=6, max_workers=2)
+    assert batch._pool is pool
+    assert result['failed_count'] == 0
+
+    # A value that cannot be sent to a worker fails its chunk (turbine-1 and -3) at the pool level
+    series['turbine-3'] = {**good, 'flow': (value for value in good['flow'])}
+    result = forecast_stream_flow_batch(series, hours_ahead=6, max_workers=2)
+    assert list(result['results']) == ['turbine-2']
+    assert list(result['errors']) == ['turbine-1', 'turbine-3']
+    assert batch._pool is pool
+    print(f"✓ Batch forecast reuses its pool; {result['failed_count']} series of a failed chunk reported")
+
+
 def test_predict_bulb_failure():
     """Test Centennial Bulb (#8) failure prediction"""
     telemetry = {
@@ -88,6 +141,27 @@ def test_predict_bulb_failure():
     print(f"✓ Bulb (#8) prediction: {result['failure_probability']:.2%} failure probability")
 
 
+def test_predict_bulb_failure_batch():
+    """Vectorized bulb scoring matches the scalar model and ranks the fleet"""
+    voltage = np.array([12.0, 12.5, 13.5, 14.0, 11.0])
+    thermal_cycles = np.array([100, 5000, 9000, 20000, 0])
+    uptime = np.array([1000.0, 43800.0, 60000.0, 90000.0, 10.0])
+    
+    result = predict_bulb_failure_batch(voltage, thermal_cycles, uptime, top_k=2)
+    
+    for i in range(len(voltage)):
+        scalar = predict_bulb_failure({
+            'voltage': voltage[i],
+            'thermal_cycles': thermal_cycles[i],
+            'uptime': uptime[i],
+        })
+        for key, value in scalar.items():
+            assert np.isclose(result[key][i], value)
+    assert result['most_at_risk'].tolist() == [3, 2]
+    assert top_k_indices(np.array([0.1, 0.9, 0.5]), 5).tolist() == [1, 2, 0]
+    print(f"✓ Bulb (#8) fleet prediction: top risk index {result['most_at_risk'][0]}")
+
+
 def test_prophet_forecaster():
     """Test Prophet wrapper functionality"""
     # Create sample data
@@ -106,11 +180,97 @@ def test_prophet_forecaster():
     print(f"✓ Prophet forecaster: {len(forecast)} predictions generated")
 
 
+def test_prophet_predict_horizon():
+    """Horizon-only prediction returns just the future rows"""
+    dates = pd.date_range(start='2024-01-01', periods=72, freq='60min')
+    df = pd.DataFrame({'ds': dates, 'y': [10 + (i % 24) * 0.5 for i in range(72)]})
+
+    forecaster = ProphetForecaster()
+    forecaster.fit(df)
+    horizon = forecaster.predict_horizon(periods=12)
+    point = forecaster.predict_horizon(periods=12, include_uncertainty=False)
+
+    assert len(horizon) == 12
+    assert horizon.ds[0] == dates[-1] + pd.Timedelta(hours=1)
+    assert horizon.yhat_lower is not None and point.yhat_lower is None
+    assert abs(horizon.yhat - point.yhat).max() < 1e-9
+    print(f"✓ Horizon-only forecast: {len(horizon)} future rows")
+
+
+def test_forecast_returns_trajectory():
+    """Helpers can return the whole horizon trajectory"""
+    timestamps = [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(48)]
+    historical_data = {
+        'timestamp': [t.isoformat() for t in timestamps],
+        'humidity': [60.0 + i * 0.5 for i in range(48)],
+    }
+
+    result = forecast_humidity(historical_data, hours_ahead=6, include_trajectory=True)
+
+    assert len(result['trajectory']['yhat']) == 6
+    assert result['trajectory']['yhat'][-1] == result['predicted_humidity']
+    print(f"✓ Trajectory returned: {len(result['trajectory']['ds'])} steps")
+
+
+def test_forecast_model_cache_reuses_fit():
+    """Repeat forecasts over an identical history hit the fitted-model cache"""
+    clear_forecast_cache()
+    timestamps = [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(48)]
+    historical_data = {
+        'timestamp': [t.isoformat() for t in timestamps],
+        'flow': [5.0 + i * 0.1 for i in range(48)],
+    }
+
+    before = get_forecast_cache_stats()
+    forecast_stream_flow(historical_data, hours_ahead=6)
+    forecast_stream_flow(historical_data, hours_ahead=12)
+    after = get_forecast_cache_stats()
+
+    assert after['misses'] - before['misses'] == 1
+    assert after['hits'] - before['hits'] == 1
+    assert after['entries'] == 1
+    print(f"✓ Forecast model cache: {after['hits']} hits, {after['misses']} misses")
+
+
+def test_prophet_warm_start_refit():
+    """Refits start from the previous parameters and land near a cold fit"""
+    clear_forecast_cache()
+    dates = pd.date_range(start='2024-01-01', periods=78, freq='60min')
+    df = pd.DataFrame({'ds': dates, 'y': [10 + (i % 24) * 0.5 + i * 0.01 for i in range(78)]})
+
+    previous = ProphetForecaster()
+    previous.fit(df.iloc[:72])
+    params = previous.warm_start_params()
+    assert set(params) == {'k', 'm', 'delta', 'beta', 'sigma_obs'}
+
+    warm = previous.refit(df)
+    cold = ProphetForecaster()
+    cold.fit(df)
+    warm_yhat = warm.predict_horizon(periods=6, include_uncertainty=False).yhat
+    cold_yhat = cold.predict_horizon(periods=6, include_uncertainty=False).yhat
+    assert np.allclose(warm_yhat, cold_yhat, atol=0.05)
+
+    # Helpers keep per-series parameters and reuse them on the next refit
+    history = {'timestamp': [t.isoformat() for t in dates], 'flow': df['y'].tolist()}
+    forecast_stream_flow(history, hours_ahead=6, series_id='turbine-1')
+    history['flow'] = [v + 0.1 for v in history['flow']]
+    forecast_stream_flow(history, hours_ahead=6, series_id='turbine-1', warm_start=True)
+    assert get_forecast_cache_stats()['warm_start']['hits'] == 1
+    print(f"✓ Warm-start refit within {np.abs(warm_yhat - cold_yhat).max():.4f} of a cold fit")
+
+
 if __name__ == '__main__':
     print("\n=== ECOS Forecasting Module Tests ===\n")
     test_forecast_stream_flow()
     test_forecast_solar_irradiance()
     test_forecast_humidity()
+    test_forecast_batch_isolates_errors()
+    test_forecast_batch_reuses_pool()
     test_predict_bulb_failure()
+    test_predict_bulb_failure_batch()
     test_prophet_forecaster()
+    test_prophet_predict_horizon()
+    test_forecast_returns_trajectory()
+    test_forecast_model_cache_reuses_fit()
+    test_prophet_warm_start_refit()
     print("\n✓ All forecasting tests passed!\n")
@@ -0,0 +1,45 @@
+"""
+Unit tests for deferred loading of heavy brain dependencies
+"""
+
+import os
+import subprocess
+import sys
+
+from lazy_imports import lazy_import, loaded_modules
+
+BRAINS_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+
+def test_brains_import_without_heavy_dependencies():
+    """Importing the brains must not pull in pandas/prophet/torch/ortools/pulp"""
+    probe = (
+        "import sys, forecasting, solvers, dispatcher, checklist; "
+        "from lazy_imports import HEAVY_MODULES; "
+        "print(','.join(m for m in HEAVY_MODULES if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, '-c', probe],
+        cwd=BRAINS_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert proc.stdout.strip() == ''
+    print("✓ Brains import without heavy dependencies")
+
+
+def test_lazy_module_loads_on_first_use():
+    """Attribute access on a lazy proxy imports the real module"""
+    json_proxy = lazy_import('json')
+    assert json_proxy.dumps({'a': 1}) == '{"a": 1}'
+    assert '(loaded)' in repr(json_proxy)
+    assert loaded_modules(['json']) == {'json': True}
+    print("✓ Lazy module loads on first use")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Lazy Import Tests ===\n")
+    test_brains_import_without_heavy_dependencies()
+    test_lazy_module_loads_on_first_use()
+    print("\n✓ All lazy import tests passed!\n")
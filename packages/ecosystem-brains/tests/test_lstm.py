@@ -0,0 +1,95 @@
+"""
+Unit tests for the LSTM training and batched inference pipeline
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from forecasting import LSTMPipeline, forecast_humidity_batch
+from forecasting.lstm import WindowDataset, make_windows
+
+
+def _hourly_frame(n: int, amplitude: float = 10.0) -> pd.DataFrame:
+    ds = pd.Timestamp('2024-01-01') + pd.Timedelta(hours=1) * np.arange(n)
+    y = 50.0 + amplitude * np.sin(np.arange(n) * 2 * np.pi / 24)
+    return pd.DataFrame({'ds': ds, 'y': y})
+
+
+def test_make_windows_are_views():
+    """Windows are strided views of the input, not copies"""
+    values = np.arange(10.0)
+    x, y = make_windows(values, window=3, horizon=2)
+    assert x.shape == (6, 3) and y.shape == (6, 2)
+    assert np.shares_memory(x, values)
+    assert x[2].tolist() == [2.0, 3.0, 4.0] and y[2].tolist() == [5.0, 6.0]
+    print("✓ Windows are zero-copy views")
+
+
+def test_window_dataset_respects_series_boundaries():
+    """No training window spans two series"""
+    dataset = WindowDataset([np.arange(6.0), np.arange(100.0, 105.0)], window=3, horizon=1)
+    x, y = dataset.batch(np.arange(len(dataset)))
+    assert len(dataset) == 3 + 2
+    assert y.ravel().tolist() == [3.0, 4.0, 5.0, 103.0, 104.0]
+    assert x.shape == (5, 3, 1)
+    print("✓ Window dataset respects series boundaries")
+
+
+def test_lstm_pipeline_fit_checkpoint_and_compile():
+    """Train on CPU, round-trip a checkpoint, and score with TorchScript"""
+    df = _hourly_frame(24 * 7)
+    pipeline = LSTMPipeline(window=24, horizon=12, hidden_size=16, epochs=5, num_threads=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'lstm.pt')
+        pipeline.fit(df, checkpoint_path=path)
+        assert os.path.exists(path)
+        restored = LSTMPipeline.load(path).with_history(df)
+
+    eager = pipeline.predict_horizon(periods=30)
+    assert len(eager) == 30
+    assert eager.ds[0] == np.datetime64(df['ds'].iloc[-1] + pd.Timedelta(hours=1))
+    assert np.all(eager.yhat_lower <= eager.yhat) and np.all(eager.yhat_upper >= eager.yhat)
+    assert np.allclose(restored.predict_horizon(periods=30).yhat, eager.yhat)
+    assert len(pipeline.loss_history) == 5
+
+    pipeline.compile()
+    assert np.allclose(pipeline.predict_horizon(periods=30).yhat, eager.yhat, atol=1e-4)
+    print("✓ LSTM pipeline trains, checkpoints and compiles")
+
+
+def test_lstm_predict_many_scales_per_series():
+    """One batched pass scores series of different scales"""
+    df = _hourly_frame(24 * 7)
+    pipeline = LSTMPipeline(window=24, horizon=6, hidden_size=16, epochs=5)
+    pipeline.fit(df)
+    histories = [df['y'].to_numpy() * k for k in (1.0, 10.0, 100.0)]
+    yhat, scales = pipeline.predict_many(histories, periods=6)
+    assert yhat.shape == (3, 6)
+    assert np.allclose(yhat[1], yhat[0] * 10.0, rtol=1e-4)
+    assert np.allclose(scales[2], scales[0] * 100.0)
+    print("✓ Batched LSTM inference normalises per series")
+
+
+def test_forecast_batch_lstm_method():
+    """method='lstm' batches share one model and isolate bad series"""
+    df = _hourly_frame(24 * 5, amplitude=15.0)
+    history = {'timestamp': [t.isoformat() for t in df['ds']], 'humidity': (df['y'] + 20.0).tolist()}
+    series = {'awg-1': history, 'awg-2': history, 'bad': {'timestamp': history['timestamp']}}
+    result = forecast_humidity_batch(series, hours_ahead=6, max_workers=1, method='lstm')
+    assert result['series_count'] == 3
+    assert set(result['results']) == {'awg-1', 'awg-2'}
+    assert 'bad' in result['errors']
+    assert result['results']['awg-1'] == result['results']['awg-2']
+    print("✓ Batch forecast with method='lstm'")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS LSTM Pipeline Tests ===\n")
+    test_make_windows_are_views()
+    test_window_dataset_respects_series_boundaries()
+    test_lstm_pipeline_fit_checkpoint_and_compile()
+    test_lstm_predict_many_scales_per_series()
+    test_forecast_batch_lstm_method()
+    print("\n✓ All LSTM pipeline tests passed!\n")
@@ -0,0 +1,100 @@
+"""
+Unit tests for the versioned model registry
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from forecasting import OnlineForecaster, LSTMPipeline, forecast_humidity
+from model_registry import ModelNotFound, ModelRef, ModelRegistry
+
+
+def _hourly_frame(n: int) -> pd.DataFrame:
+    ds = pd.Timestamp('2024-01-01') + pd.Timedelta(hours=1) * np.arange(n)
+    y = 70.0 + 8.0 * np.sin(np.arange(n) * 2 * np.pi / 24)
+    return pd.DataFrame({'ds': ds, 'y': y})
+
+
+def test_registry_versions_and_bucket_layout():
+    """Saves get increasing versions under the ecos-ml-models key layout"""
+    forecaster = OnlineForecaster()
+    forecaster.fit(_hourly_frame(72))
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        first = registry.save('P09', 'awg-7', forecaster)
+        second = registry.save('P09', 'awg-7', forecaster, metadata={'note': 'retrain'})
+
+        assert (first.version, second.version) == (1, 2)
+        assert registry.object_key(second, 'manifest.json') == 'project=P09/device=awg-7/model=online/v2/manifest.json'
+        assert os.path.exists(os.path.join(root, 'project=P09', 'device=awg-7', 'model=online', 'v2', 'seasonal.npy'))
+        assert registry.resolve(ModelRef('P09', 'awg-7', 'online')) == second
+        assert registry.manifest(second)['metadata'] == {'note': 'retrain'}
+        assert registry.list_models() == [second]
+
+        assert registry.prune('P09', 'awg-7', 'online', keep=1) == [1]
+        try:
+            registry.load(ModelRef('P09', 'awg-7', 'online', 1))
+            assert False, "pruned version should be gone"
+        except ModelNotFound:
+            pass
+        try:
+            registry.save('../P09', 'awg-7', forecaster)
+            assert False, "path segments must be validated"
+        except ValueError:
+            pass
+    print("✓ Registry versions follow the bucket layout")
+
+
+def test_registry_round_trips_lstm_with_mmap_weights():
+    """Stored LSTM weights load memory-mapped and predict identically"""
+    df = _hourly_frame(24 * 5)
+    pipeline = LSTMPipeline(window=24, horizon=6, hidden_size=8, epochs=2)
+    pipeline.fit(df)
+    with tempfile.TemporaryDirectory() as root:
+        registry = ModelRegistry(root)
+        ref = registry.save('P12', 'array-1', pipeline)
+        loaded = registry.load(ref)
+
+        assert registry.load(ref) is loaded
+        assert np.allclose(loaded.with_history(df).predict_horizon(12).yhat, pipeline.predict_horizon(12).yhat)
+        weight = np.load(
+            os.path.join(root, *registry.object_key(ref, 'weights/fc.weight.npy').split('/')),
+            mmap_mode='r',
+        )
+        assert np.array_equal(weight, loaded.model.fc.weight.detach().numpy())
+    print("✓ LSTM round-trips through the registry")
+
+
+def test_forecast_helper_serves_stored_model():
+    """Helpers forecast from a stored model without refitting"""
+    df = _hourly_frame(24 * 4)
+    forecaster = OnlineForecaster()
+    forecaster.fit(df)
+    # Post only older rows: a refit would differ, the stored model ignores them
+    older = df.iloc[:48]
+    history = {'timestamp': [t.isoformat() for t in older['ds']], 'humidity': (older['y'] + 5.0).tolist()}
+    previous = os.environ.get('ECOS_MODEL_REGISTRY_DIR')
+    with tempfile.TemporaryDirectory() as root:
+        os.environ['ECOS_MODEL_REGISTRY_DIR'] = root
+        try:
+            ModelRegistry(root).save('P09', 'awg-1', forecaster)
+            ref = {'project': 'P09', 'device': 'awg-1', 'model_type': 'online'}
+            result = forecast_humidity(history, hours_ahead=6, model=ref)
+        finally:
+            if previous is None:
+                os.environ.pop('ECOS_MODEL_REGISTRY_DIR')
+            else:
+                os.environ['ECOS_MODEL_REGISTRY_DIR'] = previous
+    expected = forecaster.predict_horizon(6, include_uncertainty=False).yhat[-1]
+    assert np.isclose(result['predicted_humidity'], expected)
+    print("✓ Forecast helper serves a stored model")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Model Registry Tests ===\n")
+    test_registry_versions_and_bucket_layout()
+    test_registry_round_trips_lstm_with_mmap_weights()
+    test_forecast_helper_serves_stored_model()
+    print("\n✓ All model registry tests passed!\n")
@@ -0,0 +1,97 @@
+"""
+Unit tests for the online (incremental Holt-Winters) forecaster
+"""
+
+import numpy as np
+import pandas as pd
+from forecasting import (
+    OnlineForecaster,
+    HoltWintersState,
+    forecast_stream_flow,
+    forecast_humidity,
+    clear_forecast_cache,
+)
+
+
+def _hourly_frame(n: int, start: str = '2024-01-01') -> pd.DataFrame:
+    ds = pd.Timestamp(start) + pd.Timedelta(hours=1) * np.arange(n)
+    y = 50.0 + 10.0 * np.sin(np.arange(n) * 2 * np.pi / 24)
+    return pd.DataFrame({'ds': ds, 'y': y})
+
+
+def _history(df: pd.DataFrame, column: str) -> dict:
+    return {
+        'timestamp': [t.isoformat() for t in df['ds']],
+        column: df['y'].tolist(),
+    }
+
+
+def test_online_forecaster_tracks_daily_cycle():
+    """Fit on a clean daily cycle and forecast the next day closely"""
+    df = _hourly_frame(24 * 14)
+    forecaster = OnlineForecaster()
+    forecaster.fit(df)
+    forecast = forecaster.predict_horizon(periods=24)
+
+    truth = 50.0 + 10.0 * np.sin(np.arange(24 * 14, 24 * 15) * 2 * np.pi / 24)
+    assert len(forecast) == 24
+    assert forecast.ds[0] == np.datetime64(df['ds'].iloc[-1] + pd.Timedelta(hours=1))
+    assert np.abs(forecast.yhat - truth).mean() < 1.0
+    assert np.all(forecast.yhat_lower <= forecast.yhat)
+    assert np.all(forecast.yhat_upper >= forecast.yhat)
+    print("✓ Online forecaster tracks daily cycle")
+
+
+def test_online_update_matches_refit():
+    """Folding in new rows one at a time gives the same state as fitting on all of them"""
+    df = _hourly_frame(24 * 7)
+    incremental = OnlineForecaster()
+    incremental.fit(df.iloc[:24 * 5])
+    stamps = df['ds'].iloc[24 * 5:].to_numpy(dtype='datetime64[ns]').view(np.int64)
+    for y, ds in zip(df['y'].iloc[24 * 5:], stamps):
+        incremental.update(y, ds)
+
+    replayed = OnlineForecaster()
+    replayed.fit(df.iloc[:24 * 5])
+    replayed.update_many(df['y'].to_numpy(), df['ds'].to_numpy(dtype='datetime64[ns]').view(np.int64))
+
+    assert incremental.state.n_obs == len(df)
+    assert incremental.state == replayed.state
+    print("✓ Online updates skip already-seen rows")
+
+
+def test_online_state_round_trips():
+    """State survives the JSON and binary encodings unchanged"""
+    forecaster = OnlineForecaster()
+    forecaster.fit(_hourly_frame(72))
+    state = forecaster.state
+
+    assert HoltWintersState.from_bytes(state.to_bytes()) == state
+    assert OnlineForecaster.from_json(forecaster.to_json()).state == state
+    assert len(state.to_bytes()) < 512
+    print(f"✓ Online state round-trips ({len(state.to_bytes())} bytes)")
+
+
+def test_forecast_helpers_online_method():
+    """method='online' with a series_id resumes stored state on the next call"""
+    clear_forecast_cache()
+    df = _hourly_frame(24 * 7)
+    first = forecast_stream_flow(_history(df.iloc[:-6], 'flow'), hours_ahead=12, method='online', series_id='turbine-1')
+    second = forecast_stream_flow(_history(df, 'flow'), hours_ahead=12, method='online', series_id='turbine-1')
+    fresh = forecast_stream_flow(_history(df, 'flow'), hours_ahead=12, method='online')
+
+    assert isinstance(first['predicted_flow'], float)
+    assert abs(second['predicted_flow'] - fresh['predicted_flow']) < 1e-9
+
+    humidity = forecast_humidity(_history(df, 'humidity'), hours_ahead=6, method='online')
+    assert 'optimal_windows_count' in humidity
+    print("✓ Forecast helpers accept method='online'")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Online Forecaster Tests ===\n")
+    test_online_forecaster_tracks_daily_cycle()
+    test_online_update_matches_refit()
+    test_online_state_round_trips()
+    test_forecast_helpers_online_method()
+    print("\n✓ All online forecaster tests passed!\n")
@@ -0,0 +1,85 @@
+"""
+Unit tests for pre-fit history resampling
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from forecasting import forecast_humidity, lttb, resample_history
+
+
+def _minute_frame(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    seconds = np.sort(rng.integers(0, n * 60, n))
+    ds = pd.Timestamp('2024-01-01') + pd.to_timedelta(seconds, unit='s')
+    y = 70.0 + 8.0 * np.sin(seconds * 2 * np.pi / 86400) + rng.normal(0, 0.5, n)
+    return pd.DataFrame({'ds': ds, 'y': y})
+
+
+def test_resample_matches_pandas_buckets():
+    """Bucket aggregation and gap filling agree with pandas resample"""
+    df = _minute_frame(5000)
+    # Knock out a two-hour stretch so there are empty buckets to fill
+    df = df[(df['ds'] < '2024-01-02 03:00') | (df['ds'] >= '2024-01-02 05:00')]
+    grouped = df.set_index('ds')['y'].resample('1h')
+
+    for agg in ('mean', 'max', 'last'):
+        result = resample_history(df, '1h', agg=agg)
+        expected = getattr(grouped, agg)().interpolate()
+        assert np.array_equal(result['ds'].to_numpy(), expected.index.to_numpy())
+        assert np.allclose(result['y'].to_numpy(), expected.to_numpy())
+
+    filled = resample_history(df, '1h', fill='ffill')
+    assert np.allclose(filled['y'].to_numpy(), grouped.mean().ffill().to_numpy())
+    dropped = resample_history(df, '1h', fill='none')
+    assert len(dropped) == len(filled) - 2
+    print(f"✓ Resample matches pandas ({len(filled)} hourly buckets)")
+
+
+def test_lttb_keeps_shape_and_endpoints():
+    """LTTB keeps the endpoints and the extremes of a spiky series"""
+    x = np.arange(10000, dtype=np.float64)
+    y = np.sin(x / 500.0)
+    y[1234] = 10.0
+    y[8765] = -10.0
+
+    picked = lttb(x, y, 200)
+    assert len(picked) == 200
+    assert picked[0] == 0 and picked[-1] == len(x) - 1
+    assert np.all(np.diff(picked) > 0)
+    assert 1234 in picked and 8765 in picked
+    assert np.array_equal(lttb(x[:50], y[:50], 200), np.arange(50))
+
+    capped = resample_history(pd.DataFrame({'ds': pd.to_datetime(x, unit='s'), 'y': y}), max_points=200)
+    assert len(capped) == 200 and capped['y'].max() == 10.0
+    print("✓ LTTB preserves endpoints and extremes")
+
+
+def test_forecast_reports_rows_fitted():
+    """Helpers fit the resampled history and report its row count"""
+    df = _minute_frame(24 * 60 * 3)
+    history = {'timestamp': [t.isoformat() for t in df['ds']], 'humidity': df['y'].tolist()}
+
+    hourly = forecast_humidity(history, method='online', resample='1h')
+    assert hourly['rows_fitted'] == 72
+
+    previous = os.environ.get('ECOS_FORECAST_MAX_ROWS')
+    os.environ['ECOS_FORECAST_MAX_ROWS'] = '500'
+    try:
+        capped = forecast_humidity(history, use_cache=False)
+    finally:
+        if previous is None:
+            os.environ.pop('ECOS_FORECAST_MAX_ROWS')
+        else:
+            os.environ['ECOS_FORECAST_MAX_ROWS'] = previous
+    assert capped['rows_fitted'] == 500
+    print("✓ Forecast reports rows fitted")
+
+
+if __name__ == '__main__':
+    print("\n=== ECOS Resampling Tests ===\n")
+    test_resample_matches_pandas_buckets()
+    test_lttb_keeps_shape_and_endpoints()
+    test_forecast_reports_rows_fitted()
+    print("\n✓ All resampling tests passed!\n")
@@ -3,12 +3,26 @@ Unit tests for ecosystem-brains solvers module
 Validates Level 1 completion criteria
 """
 
+import time
+from itertools import product
+
+import numpy as np
+
 from solvers import (
     optimize_nutrient_cycle,
+    optimize_nutrient_cycle_batch,
+    optimize_nutrient_transport,
     optimize_awg_schedule,
+    optimize_awg_fleet_schedule,
     optimize_geothermal_flow,
+    optimize_geothermal_network,
     optimize_fungal_match,
+    optimize_fungal_match_batch,
+    get_solver_cache_stats,
+    clear_solver_cache,
+    get_solver_timing_stats,
 )
+from solvers.knapsack import min_cost_cover, solve_cover
 
 
 def test_optimize_nutrient_cycle():
@@ -26,6 +40,110 @@ def test_optimize_nutrient_cycle():
     print(f"✓ Farm (#3) optimization: N={result['allocation']['N']:.1f}kg allocated")
 
 
+def test_optimize_nutrient_cycle_batch():
+    """Test batch nutrient allocation: closed form per plot and shared-source transport LP"""
+    rng = np.random.default_rng(3)
+    waste = {n: rng.uniform(20, 120, 50) for n in 'NPK'}
+    demand = {n: rng.uniform(10, 100, 50) for n in 'NPK'}
+    result = optimize_nutrient_cycle_batch(waste, demand)
+    assert result['method'] == 'closed_form'
+    for j in [0, 7, 31]:
+        single = optimize_nutrient_cycle({n: waste[n][j] for n in 'NPK'}, {n: demand[n][j] for n in 'NPK'})
+        assert result['feasible'][j] == (single['status'] == 'optimal')
+        if result['feasible'][j]:
+            for n in 'NPK':
+                assert abs(result['allocation'][n][j] - single['allocation'][n]) < 1e-6
+    short = [j for j in range(50) if any(demand[n][j] > waste[n][j] for n in 'NPK')]
+    assert result['infeasible_count'] == len(short)
+    assert sorted(int(p) for p in result['infeasible_nutrients']) == short
+
+    # Two shared sources, three plots; source 1 cannot reach plot 'c'
+    coupled = optimize_nutrient_cycle_batch(
+        {'N': [50.0, 40.0]},
+        {'N': [30.0, 30.0, 40.0]},
+        plot_ids=['a', 'b', 'c'],
+        transport_costs=[[1.0, 2.0, 1.0], [0.5, 0.5, None]],
+    )
+    assert coupled['method'] == 'lp'
+    assert coupled['status'] == 'partial'
+    # Source 0 (50) serves 'c' (40) first; source 1 covers a/b up to 40
+    assert abs(coupled['allocation']['N'][2] - 40.0) < 1e-6
+    assert abs(sum(coupled['shortfall']['N']) - 10.0) < 1e-6
+    assert abs(coupled['objective_value'] - (40.0 + 10.0 * 1.0 + 40.0 * 0.5)) < 1e-6
+    print(f"✓ Farm (#3) batch: {result['infeasible_count']}/50 plots short, transport cost {coupled['objective_value']:.1f}")
+
+
+def test_optimize_nutrient_transport():
+    """Test multi-source compost hauling: hand-checked optimum and balance on a random district"""
+    sources = [
+        {'id': 'A', 'supply_t': 10.0, 'composition': {'N': 10.0}},
+        {'id': 'B', 'supply_t': 100.0, 'composition': {'N': 10.0}},
+    ]
+    sinks = [{'id': 'f1', 'demand': {'N': 50.0}}, {'id': 'f2', 'demand': {'N': 100.0}}]
+    distance = [[1.0, 5.0], [2.0, 2.0]]
+    result = optimize_nutrient_transport(sources, sinks, nutrients=['N'], distance_km=distance, haul_cost_per_t_km=1.0)
+    assert result['status'] == 'optimal'
+    # A is the closer source for f1 only; f2 is cheaper from B
+    assert {(s['source'], s['sink']): round(s['tonnes'], 6) for s in result['shipments']} == {('A', 'f1'): 5.0, ('B', 'f2'): 10.0}
+    assert abs(result['haul_cost_usd'] - 25.0) < 1e-6
+
+    sinks[1]['max_application_t'] = 4.0
+    capped = optimize_nutrient_transport(sources, sinks, nutrients=['N'], distance_km=distance)
+    assert capped['status'] == 'partial'
+    assert abs(capped['unmet']['f2']['N'] - 60.0) < 1e-6
+
+    rng = np.random.default_rng(5)
+    sources = [
+        {'id': f"s{i}", 'supply_t': rng.uniform(20, 80), 'lat': 40 + rng.uniform(0, 0.5), 'lon': -80 + rng.uniform(0, 0.5),
+         'composition': {'N': rng.uniform(5, 20), 'P': rng.uniform(1, 8), 'K': rng.uniform(2, 12)}}
+        for i in range(15)
+    ]
+    sinks = [
+        {'id': f"f{j}", 'lat': 40 + rng.uniform(0, 0.5), 'lon': -80 + rng.uniform(0, 0.5), 'max_application_t': 30.0,
+         'demand': {'N': rng.uniform(50, 300), 'P': rng.uniform(10, 80), 'K': rng.uniform(20, 150)}}
+        for j in range(120)
+    ]
+    dense = optimize_nutrient_transport(sources, sinks, nearest_sources=None)
+    nearest = optimize_nutrient_transport(sources, sinks, nearest_sources=3, max_pricing_rounds=1)
+    priced = optimize_nutrient_transport(sources, sinks, nearest_sources=3, gap_tolerance=0.0)
+    assert nearest['routes_modelled'] == 3 * len(sinks) <= priced['routes_modelled'] < dense['routes_modelled']
+    # Pricing recovers the all-routes optimum from the nearest-source model
+    dense_cost, nearest_cost, priced_cost = (
+        r['haul_cost_usd'] + r['material_cost_usd'] for r in (dense, nearest, priced)
+    )
+    assert priced['optimality_gap'] == 0.0
+    assert abs(priced_cost - dense_cost) < 1e-6 * dense_cost
+    assert dense_cost <= nearest_cost + 1e-6
+    for sink in sinks:
+        for n in 'NPK':
+            unmet = dense['unmet'].get(sink['id'], {}).get(n, 0.0)
+            assert abs(dense['delivered'][sink['id']][n] + unmet - sink['demand'][n]) < 1e-4 or unmet == 0.0
+    assert all(left >= -1e-6 for left in dense['remaining_supply_t'].values())
+    print(f"✓ Farm (#3) transport: {len(dense['shipments'])} shipments, haul cost ${dense['haul_cost_usd']:.2f}")
+
+
+def test_nutrient_transport_round_cap_is_not_optimal():
+    """A plan stopped by max_pricing_rounds above the gap tolerance is reported as feasible"""
+    rng = np.random.default_rng(11)
+    sources = [
+        {'id': f"s{i}", 'supply_t': 500.0, 'lat': 40 + rng.uniform(0, 0.5), 'lon': -80 + rng.uniform(0, 0.5),
+         'cost_per_t': rng.uniform(0, 40), 'composition': {'N': rng.uniform(5, 20)}}
+        for i in range(20)
+    ]
+    sinks = [
+        {'id': f"f{j}", 'lat': 40 + rng.uniform(0, 0.5), 'lon': -80 + rng.uniform(0, 0.5), 'demand': {'N': rng.uniform(50, 300)}}
+        for j in range(10)
+    ]
+    capped = optimize_nutrient_transport(sources, sinks, nutrients=['N'], nearest_sources=1, max_pricing_rounds=1)
+    assert capped['pricing_rounds'] == 1 and not capped['time_limit_reached']
+    assert capped['optimality_gap'] > 1e-3
+    assert capped['status'] == 'feasible'
+
+    priced = optimize_nutrient_transport(sources, sinks, nutrients=['N'], nearest_sources=1)
+    assert priced['status'] == 'optimal' and priced['optimality_gap'] <= 1e-3
+    print(f"✓ Farm (#3) transport: one pricing round leaves gap {capped['optimality_gap']:.1f}, reported feasible")
+
+
 def test_optimize_awg_schedule():
     """Test AWG (#9) schedule optimization"""
     humidity_forecast = [60, 65, 75, 80, 85, 70]  # %
@@ -41,6 +159,121 @@ def test_optimize_awg_schedule():
     print(f"✓ AWG (#9) optimization: ${result['cost_per_liter']:.3f}/liter")
 
 
+def test_min_cost_cover_matches_brute_force():
+    """Exact covering knapsack agrees with enumeration on small instances"""
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        n = int(rng.integers(1, 11))
+        costs = rng.uniform(0.0, 1.0, n)
+        weights = rng.uniform(0.5, 10.0, n)
+        target = float(rng.uniform(0.0, 1.1) * weights.sum())
+
+        best = None
+        for bits in product((False, True), repeat=n):
+            mask = np.array(bits)
+            if weights[mask].sum() >= target and (best is None or costs[mask].sum() < best):
+                best = costs[mask].sum()
+
+        selected = min_cost_cover(costs, weights, target)
+        if best is None:
+            assert selected is None
+        else:
+            assert weights[selected].sum() >= target - 1e-9
+            assert abs(costs[selected].sum() - best) < 1e-9
+    print("✓ Covering knapsack matches brute force")
+
+
+def test_awg_exact_solver_matches_pulp():
+    """In-process AWG solver returns the PuLP path's result, windows included"""
+    rng = np.random.default_rng(3)
+    humidity = rng.uniform(40, 95, 36).tolist()
+    prices = rng.uniform(0.05, 0.3, 36).tolist()
+    target = 0.1 * sum(humidity) * 0.3
+    windows = [{'start_index': 4, 'end_index': 30}]
+
+    exact = optimize_awg_schedule(humidity, prices, target, run_windows=windows)
+    pulp = optimize_awg_schedule(humidity, prices, target, run_windows=windows, solver='pulp')
+    assert exact['status'] == pulp['status'] == 'optimal'
+    assert exact.keys() == pulp.keys()
+    assert abs(exact['total_cost_usd'] - pulp['total_cost_usd']) < 1e-6
+    assert sum(exact['schedule'][:4]) + sum(exact['schedule'][30:]) == 0
+
+    infeasible = optimize_awg_schedule(humidity, prices, 0.1 * sum(humidity) + 1)
+    assert infeasible['status'] == 'infeasible'
+    print(f"✓ AWG exact solver matches PuLP: ${exact['total_cost_usd']:.3f}")
+
+
+def test_awg_rolling_horizon_replan():
+    """Rolling mode locks executed hours and warm-starts from the stored plan"""
+    rng = np.random.default_rng(5)
+    humidity = rng.uniform(50, 95, 48)
+    prices = rng.uniform(0.05, 0.3, 48)
+    target = 0.1 * humidity[:24].sum() * 0.4
+
+    first = optimize_awg_schedule(humidity[:24].tolist(), prices[:24].tolist(), target, device_id='awg-r', start_hour=100)
+    assert first['status'] == 'optimal' and not first['warm_start']
+    assert first['total_cost_usd'] == optimize_awg_schedule(humidity[:24].tolist(), prices[:24].tolist(), target)['total_cost_usd']
+
+    # Two hours later, with the first three hours of the new horizon executed
+    shifted = optimize_awg_schedule(
+        humidity[2:26].tolist(), prices[2:26][::-1].tolist(), target,
+        device_id='awg-r', start_hour=102, current_hour=105,
+    )
+    assert shifted['warm_start'] and shifted['locked_hours'] == 3
+    assert shifted['schedule'][:3] == first['schedule'][2:5]
+    assert shifted['total_production_liters'] >= target
+
+    # A worker without the stored plan uses the one the caller passes back
+    handed = optimize_awg_schedule(
+        humidity[2:26].tolist(), prices[2:26][::-1].tolist(), target,
+        device_id='awg-r-elsewhere', start_hour=102, current_hour=105,
+        previous_plan={'start_hour': 100, 'schedule': first['schedule']},
+    )
+    assert handed['warm_start'] and handed['schedule'] == shifted['schedule']
+
+    # Executed hours with no plan at all are an error, not hours that did not run
+    orphan = optimize_awg_schedule(
+        humidity[2:26].tolist(), prices[2:26].tolist(), target, device_id='awg-r-unknown', start_hour=102, current_hour=105
+    )
+    assert orphan['status'] == 'error' and orphan['locked_hours'] == 3
+    print("✓ AWG rolling horizon keeps executed hours")
+
+
+def test_optimize_awg_fleet_schedule():
+    """Fleet schedule meets every unit's target under the shared power cap"""
+    hours = 12
+    prices = [0.2, 0.2, 0.05, 0.05, 0.05, 0.1, 0.1, 0.3, 0.3, 0.1, 0.05, 0.2]
+    units = [
+        {'unit_id': 'a', 'humidity_forecast': [80.0] * hours, 'target_liters': 30.0},
+        {'unit_id': 'b', 'humidity_forecast': [60.0] * hours, 'target_liters': 20.0, 'power_kw': 3.0},
+        {
+            'unit_id': 'c', 'humidity_forecast': [90.0] * hours, 'target_liters': 25.0,
+            'efficiency_curve': [[40.0, 0.0], [100.0, 12.0]],
+        },
+    ]
+    result = optimize_awg_fleet_schedule(units, prices, power_cap_kw=5.0, time_limit_s=5.0)
+
+    assert result['status'] == 'optimal' and result['optimality_gap'] == 0.0
+    assert max(result['grid_import_kw']) <= 5.0 + 1e-9
+    for unit in result['units'].values():
+        assert unit['production_liters'] >= unit['target_liters']
+    # The cap keeps all three units from sharing the cheapest hours
+    assert any(load < 7.0 for load in result['hourly_load_kw'])
+
+    impossible = optimize_awg_fleet_schedule(units, prices, power_cap_kw=1.0, time_limit_s=5.0)
+    assert impossible['status'] == 'infeasible'
+    assert "Unit 'a' draws 2 kW" in impossible['message']
+
+    # The message names the cause: a unit's humidity, or only the shared cap
+    dry = [*units[:2], {**units[2], 'humidity_forecast': [45.0] * hours}]
+    too_dry = optimize_awg_fleet_schedule(dry, prices, power_cap_kw=10.0, time_limit_s=5.0)
+    assert too_dry['status'] == 'infeasible' and "Unit 'c' makes at most 12 L" in too_dry['message']
+    crowded = [{**units[0], 'target_liters': 40.0}, {**units[1], 'target_liters': 30.0}, units[2]]
+    shared = optimize_awg_fleet_schedule(crowded, prices, power_cap_kw=3.0, time_limit_s=5.0)
+    assert shared['status'] == 'infeasible' and 'shared power cap' in shared['message']
+    print(f"✓ AWG fleet optimization: ${result['total_cost_usd']:.2f} for {len(units)} units")
+
+
 def test_optimize_geothermal_flow():
     """Test Geothermal (#10) flow optimization"""
     building_loads = {
@@ -57,9 +290,148 @@ def test_optimize_geothermal_flow():
     assert 'allocations' in result
     assert result['total_allocated'] <= available_capacity
     assert result['capacity_utilization'] <= 1.0
+
+    # No capacity serves nothing rather than dividing by zero
+    empty = optimize_geothermal_flow({'building_A': 30.0}, ground_temp, 0.0)
+    assert empty['total_allocated'] == 0.0 and empty['capacity_utilization'] == 0.0
     print(f"✓ Geothermal (#10) optimization: {result['capacity_utilization']:.1%} capacity used")
 
 
+def test_optimize_geothermal_network():
+    """Network mode serves critical buildings first and routes around lossy pipes"""
+    network = {
+        'boreholes': [{'id': 'bh1', 'capacity_kw': 100.0}, {'id': 'bh2', 'capacity_kw': 50.0}],
+        'pipes': [
+            {'from': 'bh1', 'to': 'j1', 'capacity_kw': 80.0, 'loss': 0.02},
+            {'from': 'bh2', 'to': 'j1', 'capacity_kw': 50.0, 'loss': 0.01},
+            {'from': 'j1', 'to': 'hospital', 'capacity_kw': 60.0, 'loss': 0.01},
+            {'from': 'j1', 'to': 'school', 'capacity_kw': 60.0, 'loss': 0.01, 'bidirectional': True},
+            {'from': 'bh1', 'to': 'school', 'capacity_kw': 30.0, 'loss': 0.05},
+        ],
+        'buildings': [
+            {'id': 'hospital', 'demand_kw': 60.0, 'priority': 1},
+            {'id': 'school', 'demand_kw': 100.0, 'priority': 2},
+        ],
+    }
+    result = optimize_geothermal_network(network, ground_temp=10.0)
+    assert result['status'] == 'optimal'
+    # The hospital's 60 kW pipe loses 1% on the way; the school gets what the losses leave
+    assert result['allocations']['hospital'] == 59.4
+    assert 80.0 < result['allocations']['school'] < 90.0
+    assert abs(sum(result['borehole_output'].values()) - 150.0) < 1e-6
+
+    # A cold ground loop derates the boreholes; the hospital keeps its full supply
+    cold = optimize_geothermal_flow({}, 0.0, 0.0, network=network)
+    assert cold['allocations']['hospital'] == 59.4
+    assert sum(cold['borehole_output'].values()) < 150.0
+    assert all(pipe['flow_kw'] <= pipe_spec['capacity_kw'] for pipe, pipe_spec in zip(cold['pipe_flows'], network['pipes']))
+    print(f"✓ Geothermal (#10) network: {cold['total_allocated']:.0f} kW served at 0°C")
+
+
+def test_geothermal_network_pipe_losses():
+    """Heat lost in a pipe is not delivered, and lossless networks are unaffected"""
+    network = {
+        'boreholes': [{'id': 'bh', 'capacity_kw': 100.0}],
+        'pipes': [{'from': 'bh', 'to': 'library', 'capacity_kw': 200.0, 'loss': 0.3}],
+        'buildings': [{'id': 'library', 'demand_kw': 100.0}],
+    }
+    result = optimize_geothermal_network(network, ground_temp=10.0)
+    assert result['status'] == 'optimal'
+    assert result['allocations']['library'] == 70.0
+    assert result['unmet_demand']['library'] == 30.0
+    assert result['borehole_output']['bh'] == 100.0
+    assert result['pipe_flows'][0]['loss_kw'] == 30.0
+
+    # Enough supply to cover the loss serves the full demand
+    network['boreholes'][0]['capacity_kw'] = 150.0
+    covered = optimize_geothermal_network(network, ground_temp=10.0)
+    assert covered['allocations']['library'] == 100.0
+    assert abs(covered['borehole_output']['bh'] - 100.0 / 0.7) < 0.01
+
+    network['pipes'][0]['loss'] = 0.0
+    lossless = optimize_geothermal_network(network, ground_temp=10.0)
+    assert lossless['borehole_output']['bh'] == 100.0
+    assert lossless['pipe_flows'][0]['loss_kw'] == 0.0
+
+    try:
+        optimize_geothermal_network({**network, 'pipes': [{'from': 'bh', 'to': 'library', 'capacity_kw': 1.0, 'loss': 1.0}]}, 10.0)
+        assert False, "Expected ValueError for a pipe losing all its heat"
+    except ValueError:
+        pass
+    print(f"✓ Geothermal (#10) pipe losses: {result['allocations']['library']:.0f} of 100 kW delivered over a 30% loss pipe")
+
+
+def test_solver_result_cache():
+    """Test memoized solves: canonicalized keys, opt-out, stateful bypass and stats"""
+    clear_solver_cache()
+    name = 'solvers.optimize_geothermal_flow'
+    before = get_solver_cache_stats()['solvers'].get(name, {'hit': 0, 'miss': 0, 'bypass': 0})
+    loads = {'b1': 30.0, 'b2': 45.0}
+    first = optimize_geothermal_flow(loads, 12.0, 100.0)
+    # Same call with reordered keys, float noise under the tolerance and keyword arguments
+    again = optimize_geothermal_flow(
+        available_capacity=100.0 + 1e-9, ground_temp=12.0, building_loads={'b2': 45.0, 'b1': 30.0}
+    )
+    assert first['cache']['status'] == 'miss'
+    assert again['cache']['status'] == 'hit'
+    assert again['cache']['key'] == first['cache']['key']
+    assert again['allocations'] == first['allocations']
+
+    # Hits are copies; mutating one does not leak into the cache
+    again['allocations']['b1'] = -1.0
+    assert optimize_geothermal_flow(loads, 12.0, 100.0)['allocations']['b1'] == first['allocations']['b1']
+
+    assert optimize_geothermal_flow(loads, 12.0, 100.0, use_cache=False)['cache']['status'] == 'bypass'
+    assert optimize_geothermal_flow(loads, 12.0, 90.0)['cache']['status'] == 'miss'
+    rolling = optimize_awg_schedule([60.0] * 6, [0.1] * 6, 10.0, device_id='awg-cache', start_hour=0)
+    assert rolling['cache']['status'] == 'bypass'
+
+    stats = get_solver_cache_stats()
+    counts = {outcome: n - before[outcome] for outcome, n in stats['solvers'][name].items()}
+    assert counts == {'hit': 2, 'miss': 2, 'bypass': 1}
+    assert stats['entries'] == 2 and stats['bytes'] > 0
+    print(f"✓ Solver cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
+
+
+def test_solver_time_limits():
+    """Test time / gap limits return the incumbent, solvers are reused and solve times recorded"""
+    # Near subset-sum cover: every item costs about its weight, so the LP bound prunes almost nothing
+    rng = np.random.default_rng(3)
+    weights = rng.integers(10**6, 10**7, 60).astype(float) * 2
+    costs = weights * (1 + rng.uniform(0, 1e-3, 60))
+    target = weights.sum() / 2 + 1
+    started = time.perf_counter()
+    cut = solve_cover(costs, weights, target, time_limit_s=0.2)
+    assert time.perf_counter() - started < 2.0
+    assert cut.status == 'feasible' and 0 <= cut.gap < 1e-3
+    assert weights[cut.selection].sum() >= target
+    loose = solve_cover(costs, weights, target, time_limit_s=5.0, gap_limit=1e-3)
+    assert loose.status == 'optimal' and loose.gap <= 1e-3
+
+    try:
+        optimize_nutrient_cycle({'N': 1.0, 'P': 1.0, 'K': 1.0}, {'N': 0.0, 'P': 0.0, 'K': 0.0}, time_limit_s=0)
+        assert False, "Expected ValueError for a non-positive time limit"
+    except ValueError:
+        pass
+
+    name = 'solvers.optimize_nutrient_cycle'
+    before = get_solver_timing_stats()
+    for _ in range(2):
+        result = optimize_nutrient_cycle(
+            {'N': 100.0, 'P': 50.0, 'K': 75.0}, {'N': 80.0, 'P': 40.0, 'K': 60.0}, time_limit_s=1.0, use_cache=False
+        )
+        assert result['status'] == 'optimal'
+    after = get_solver_timing_stats()
+    entry = after['solvers'][name]
+    assert entry['count'] - before['solvers'].get(name, {'count': 0})['count'] == 2
+    assert sum(entry['buckets']) == entry['count'] and len(entry['buckets']) == len(after['buckets_s']) + 1
+    assert entry['statuses']['optimal'] >= 2
+    # The second solve reused the first one's GLOP instance
+    assert after['backends']['GLOP']['reused'] > before['backends'].get('GLOP', {'reused': 0})['reused']
+    print(f"✓ Solver limits: {cut.status} incumbent with gap {cut.gap:.2e} after 0.2 s; "
+          f"{entry['count']} timed nutrient solves, mean {entry['mean_s'] * 1000:.1f} ms")
+
+
 def test_optimize_fungal_match():
     """Test Symbiosis (#2) fungal strain recommendation"""
     soil_data = {
@@ -80,10 +452,53 @@ def test_optimize_fungal_match():
     print(f"✓ Symbiosis (#2) optimization: {result['expected_yield_increase']:.1%} yield increase")
 
 
+def test_optimize_fungal_match_batch():
+    """Test vectorized strain matching over a soil grid agrees with the single-sample matcher"""
+    ph = [4.5, 5.99, 6.0, 7.0, 7.5, 7.51, 9.0, np.nan]
+    moisture = [30.0, 50.0, 75.0, 39.9, 70.0, 70.1, np.nan, 55.0]
+    result = optimize_fungal_match_batch({'pH': ph, 'moisture': moisture, 'N': [20.0] * 8}, top_k=2)
+    for i in range(len(ph)):
+        sample = {'N': 20.0}
+        if not np.isnan(ph[i]):
+            sample['pH'] = ph[i]
+        if not np.isnan(moisture[i]):
+            sample['moisture'] = moisture[i]
+        single = optimize_fungal_match(sample)
+        assert result['recommended_strain'][i] == single['recommended_strain']
+        assert result['expected_yield_increase'][i] == single['expected_yield_increase']
+        assert result['soil_compatibility'][i] == single['soil_compatibility']
+        assert result['top_strains'][i][0] == single['recommended_strain']
+        assert len(result['top_strains'][i]) == 2 and result['top_scores'][i][0] > result['top_scores'][i][1] > 0
+
+    # Runners-up rank by distance to their pH range
+    everything = optimize_fungal_match_batch({'pH': [5.0]}, top_k=10, sample_ids=['plot-1'])
+    assert everything['sample_ids'] == ['plot-1']
+    assert everything['top_strains'][0] == ['Acidophilus_Strain_A', 'Neutral_Strain_C', 'Alkalophilus_Strain_B']
+
+    try:
+        optimize_fungal_match_batch({'pH': [6.5, 7.0], 'moisture': [50.0]})
+        assert False, "Expected ValueError for ragged soil columns"
+    except ValueError:
+        pass
+    print(f"✓ Symbiosis (#2) batch matching: {len(ph)} samples, top-2 strains each")
+
+
 if __name__ == '__main__':
     print("\n=== ECOS Solvers Module Tests ===\n")
     test_optimize_nutrient_cycle()
+    test_optimize_nutrient_cycle_batch()
+    test_optimize_nutrient_transport()
+    test_nutrient_transport_round_cap_is_not_optimal()
     test_optimize_awg_schedule()
+    test_min_cost_cover_matches_brute_force()
+    test_awg_exact_solver_matches_pulp()
+    test_awg_rolling_horizon_replan()
+    test_optimize_awg_fleet_schedule()
     test_optimize_geothermal_flow()
+    test_optimize_geothermal_network()
+    test_geothermal_network_pipe_losses()
+    test_solver_result_cache()
+    test_solver_time_limits()
     test_optimize_fungal_match()
+    test_optimize_fungal_match_batch()
     print("\n✓ All solver tests passed!\n")